@@ -34,5 +34,10 @@ class UserProfile(models.Model):
     working_hours = models.CharField(max_length=50, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["type"], name="userprofile_type_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user.username} ({self.type})"
\ No newline at end of file
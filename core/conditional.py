@@ -0,0 +1,47 @@
+import hashlib
+import json
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+"""
+Conditional GET support (ETag / Last-Modified) for DRF views.
+
+Views compute their validators with a single cheap query and call
+conditional_get(). If the client's If-None-Match / If-Modified-Since
+headers still match, a 304 is returned before anything is serialized.
+"""
+
+
+def make_etag(*parts):
+    """Builds a strong, quoted ETag from arbitrary JSON-serializable parts."""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+
+class ConditionalGetMixin:
+    """
+    Adds ETag / Last-Modified handling to DRF views.
+
+    Usage:
+        return self.conditional_get(request, render, etag=..., last_modified=...)
+
+    - render: callable producing the full response (only called on a miss)
+    - etag: quoted ETag string (see make_etag) or None
+    - last_modified: datetime or None
+    """
+
+    def conditional_get(self, request, render, etag=None, last_modified=None):
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if not_modified is not None:
+            return not_modified
+
+        response = render()
+        if response.status_code == 200:
+            if etag:
+                response["ETag"] = etag
+            if timestamp:
+                response["Last-Modified"] = http_date(timestamp)
+        return response
@@ -0,0 +1,157 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+"""
+Sparse fieldsets for read endpoints (`?fields=` / `?omit=`).
+
+    GET /api/offers/?fields=id,title,image,min_price
+    GET /api/orders/?omit=features,created_at
+
+Unrequested fields are removed from the serializer and from the SQL:
+the queryset only loads the columns behind the remaining fields
+(only()), and select_related / prefetch_related are limited to the
+relations those fields actually read.
+"""
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def parse_field_names(value):
+    """Splits a comma separated list, ignoring blanks."""
+    return [name.strip() for name in (value or "").split(",") if name.strip()]
+
+
+def wants_sparse_fields(request):
+    """True for read requests carrying `?fields=` or `?omit=`."""
+    return (
+        request is not None
+        and request.method in SAFE_METHODS
+        and (FIELDS_PARAM in request.query_params or OMIT_PARAM in request.query_params)
+    )
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin honouring `?fields=` and `?omit=` on read requests.
+
+    Notes:
+    - Unknown field names are rejected with HTTP 400.
+    - Write requests always use the full field set.
+    - `sparse_field_sources` declares the model paths read by fields
+      whose source the mixin cannot derive (SerializerMethodField),
+      e.g. {"user_details": ("user__username",)}.
+    """
+
+    sparse_field_sources = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if not wants_sparse_fields(request):
+            return
+
+        available = list(self.fields)
+        keep = self._requested_fields(request, available)
+        for name in available:
+            if name not in keep:
+                self.fields.pop(name)
+
+    def _requested_fields(self, request, available):
+        requested = parse_field_names(request.query_params.get(FIELDS_PARAM)) or available
+        omitted = parse_field_names(request.query_params.get(OMIT_PARAM))
+
+        unknown = sorted(set(requested + omitted) - set(available))
+        if unknown:
+            raise ValidationError(
+                {FIELDS_PARAM: [f"Unknown field(s): {', '.join(unknown)}."]}
+            )
+        return set(requested) - set(omitted)
+
+    def sparse_model_paths(self):
+        """
+        Model paths ("title", "user__username", "details") read by the
+        remaining fields, or None if a field's source is unknown.
+        """
+        paths = []
+        for name, field in self.fields.items():
+            if name in self.sparse_field_sources:
+                paths.extend(self.sparse_field_sources[name])
+            elif field.source == "*":
+                return None
+            else:
+                paths.append(field.source.replace(".", "__"))
+        return paths
+
+
+def sparse_queryset(queryset, paths, required=()):
+    """
+    Narrows `queryset` to the columns and relations behind `paths`.
+
+    - Concrete columns and forward relations -> only()
+    - Forward relations traversed by a path -> select_related()
+    - Reverse / many-to-many relations -> kept prefetches only
+    """
+    meta = queryset.model._meta
+    columns = {meta.pk.name, *required}
+    joins, prefetches = set(), set()
+
+    for path in paths:
+        root, _, rest = path.partition("__")
+        try:
+            field = meta.get_field(root)
+        except FieldDoesNotExist:
+            return queryset
+
+        if field.one_to_many or field.many_to_many:
+            prefetches.add(root)
+            continue
+
+        columns.add(root)
+        if rest and field.is_relation:
+            joins.add(root)
+            columns.add(path)
+
+    kept = [
+        lookup for lookup in queryset._prefetch_related_lookups
+        if _prefetch_root(lookup) in prefetches
+    ]
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if joins:
+        queryset = queryset.select_related(*joins)
+    if kept:
+        queryset = queryset.prefetch_related(*kept)
+
+    return queryset.only(*columns)
+
+
+def _prefetch_root(lookup):
+    path = lookup.prefetch_through if isinstance(lookup, Prefetch) else lookup
+    return path.split("__")[0]
+
+
+class SparseFieldsetViewMixin:
+    """
+    View mixin applying the serializer's sparse fieldset to the queryset.
+
+    `sparse_required_fields` lists columns that must always be loaded
+    (e.g. the keyset pagination ordering columns).
+    """
+
+    sparse_required_fields = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not wants_sparse_fields(self.request):
+            return queryset
+
+        serializer = self.get_serializer()
+        if not isinstance(serializer, SparseFieldsetMixin):
+            return queryset
+
+        paths = serializer.sparse_model_paths()
+        if paths is None:
+            return queryset
+        return sparse_queryset(queryset, paths, self.sparse_required_fields)
@@ -0,0 +1,71 @@
+from rest_framework.relations import HyperlinkedIdentityField, HyperlinkedRelatedField
+from rest_framework.serializers import HyperlinkedModelSerializer
+
+"""
+Request-scoped hyperlink building.
+
+DRF reverses the URL pattern for every single hyperlink. For list
+responses that means hundreds of reverse() calls per request although
+only the lookup value differs. The fields below reverse each view name
+once per request (with a sentinel lookup value) and build all further
+URLs by plain string concatenation.
+"""
+
+_SENTINEL = 918273645546372819
+_CACHE_ATTR = "_hyperlink_templates"
+
+
+class RequestCachedUrlMixin:
+    """
+    Caches a (prefix, suffix) URL template per request, view name,
+    lookup kwarg and format. Falls back to regular reversing for
+    non-integer lookup values or patterns the sentinel cannot model.
+    """
+
+    def get_url(self, obj, view_name, request, format):
+        if hasattr(obj, "pk") and obj.pk in (None, ""):
+            return None
+
+        lookup_value = getattr(obj, self.lookup_field)
+        template = self._url_template(view_name, request, format)
+        if template is None or not isinstance(lookup_value, int):
+            return super().get_url(obj, view_name, request, format)
+
+        prefix, suffix = template
+        return f"{prefix}{lookup_value}{suffix}"
+
+    def _url_template(self, view_name, request, format):
+        if request is None:
+            return None
+
+        templates = getattr(request, _CACHE_ATTR, None)
+        if templates is None:
+            templates = {}
+            setattr(request, _CACHE_ATTR, templates)
+
+        key = (view_name, self.lookup_url_kwarg, format)
+        if key not in templates:
+            url = self.reverse(
+                view_name,
+                kwargs={self.lookup_url_kwarg: _SENTINEL},
+                request=request,
+                format=format,
+            )
+            parts = url.split(str(_SENTINEL))
+            templates[key] = tuple(parts) if len(parts) == 2 else None
+        return templates[key]
+
+
+class CachedHyperlinkedIdentityField(RequestCachedUrlMixin, HyperlinkedIdentityField):
+    pass
+
+
+class CachedHyperlinkedRelatedField(RequestCachedUrlMixin, HyperlinkedRelatedField):
+    pass
+
+
+class CachedHyperlinkedModelSerializer(HyperlinkedModelSerializer):
+    """HyperlinkedModelSerializer whose url/related fields use request-scoped templates."""
+
+    serializer_url_field = CachedHyperlinkedIdentityField
+    serializer_related_field = CachedHyperlinkedRelatedField
@@ -0,0 +1,139 @@
+from django.contrib.auth.models import User
+from django.db import models
+from rest_framework import serializers
+
+from auth_app.models import UserProfile
+
+"""
+Request-scoped batch loaders (DataLoader style).
+
+Serializers and permission classes ask the loader of the current
+request for users / profiles by id instead of querying one by one.
+All keys collected so far are fetched with a single `IN (...)` query
+on the first load; every further load of a known key is a cache hit.
+
+    loader = get_loader(request, "profiles")
+    loader.prime(user_ids)             # collect keys
+    profile = loader.load(user.pk)     # one query for all primed keys
+"""
+
+_LOADERS_ATTR = "_batch_loaders"
+
+
+def _fetch_users(keys):
+    return User.objects.in_bulk(keys)
+
+
+def _fetch_profiles(user_ids):
+    return {profile.user_id: profile for profile in UserProfile.objects.filter(user_id__in=user_ids)}
+
+
+FETCHERS = {
+    "users": _fetch_users,
+    "profiles": _fetch_profiles,
+}
+
+
+class BatchLoader:
+    """
+    Collects keys and resolves them in batches.
+
+    - fetch: callable(keys) -> {key: object}
+    - Missing keys resolve to None (and are not fetched again).
+    """
+
+    def __init__(self, fetch):
+        self.fetch = fetch
+        self._cache = {}
+        self._pending = set()
+
+    def prime(self, keys):
+        """Queues keys for the next batch."""
+        self._pending.update(key for key in keys if key is not None and key not in self._cache)
+
+    def load(self, key):
+        """Returns the object for `key`, fetching all queued keys at once."""
+        if key not in self._cache:
+            self.prime([key])
+            self.dispatch()
+        return self._cache.get(key)
+
+    def dispatch(self):
+        """Fetches all queued keys with one query."""
+        if not self._pending:
+            return
+        keys, self._pending = self._pending, set()
+        found = self.fetch(keys)
+        for key in keys:
+            self._cache[key] = found.get(key)
+
+
+def get_loader(request, name):
+    """Returns the loader `name` bound to `request` (created on first use)."""
+    if request is None:
+        return BatchLoader(FETCHERS[name])
+
+    loaders = getattr(request, _LOADERS_ATTR, None)
+    if loaders is None:
+        loaders = {}
+        setattr(request, _LOADERS_ATTR, loaders)
+    if name not in loaders:
+        loaders[name] = BatchLoader(FETCHERS[name])
+    return loaders[name]
+
+
+def get_profile(request, user):
+    """UserProfile of `user` through the request's loader (or None)."""
+    return get_loader(request, "profiles").load(user.pk)
+
+
+class BatchLoadingListSerializer(serializers.ListSerializer):
+    """Resolves the child's batch-loaded relations for the whole page first."""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        instances = list(iterable)
+        self.child.attach_batch_loaded(instances)
+        return super().to_representation(instances)
+
+
+class BatchLoadedRelationsMixin:
+    """
+    Serializer mixin resolving forward relations through the request's loaders.
+
+    `batch_loaded_relations` maps a relation to (loader name, fields
+    reading it), e.g. {"user": ("users", ("user_details",))}.
+
+    Notes:
+    - Set `list_serializer_class = BatchLoadingListSerializer` in Meta,
+      so the related objects of a whole page are fetched with one query.
+    - The loaded objects are assigned to the instances, the querysets
+      therefore need no select_related for these relations.
+    """
+
+    batch_loaded_relations = {}
+
+    def to_representation(self, instance):
+        self.attach_batch_loaded([instance])
+        return super().to_representation(instance)
+
+    def attach_batch_loaded(self, instances):
+        if not instances:
+            return
+
+        request = self.context.get("request")
+        for relation, (loader_name, fields) in self.batch_loaded_relations.items():
+            if not any(name in self.fields for name in fields):
+                continue
+
+            field = self.Meta.model._meta.get_field(relation)
+            missing = [instance for instance in instances if not field.is_cached(instance)]
+            if not missing:
+                continue
+
+            loader = get_loader(request, loader_name)
+            loader.prime(getattr(instance, field.attname) for instance in missing)
+            for instance in missing:
+                related = loader.load(getattr(instance, field.attname))
+                if related is not None:
+                    field.set_cached_value(instance, related)
@@ -97,6 +97,43 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# The offer catalog caches (list pages, counts) only rely on the generic
+# cache API. To share them between worker processes, switch to:
+#   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#   'LOCATION': BASE_DIR / 'cache',
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'coderr',
+    }
+}
+
+# Serve offer list filtering/ordering from an in-process NumPy snapshot
+# (offers_app.api.catalog). Requires numpy (pip install -r
+# requirements-optional.txt); without it the setting is ignored and the
+# SQL path is used.
+OFFER_CATALOG_ENGINE = False
+# Full snapshot reloads run in a background thread.
+OFFER_CATALOG_BACKGROUND_RELOAD = True
+# Full rebuilds of the title autocomplete index run in a background thread.
+OFFER_SUGGEST_BACKGROUND_RELOAD = True
+
+# Memory-mapped "similar offers" index, written by
+# `python manage.py build_offer_similarity_index`.
+OFFER_SIMILARITY_INDEX = BASE_DIR / 'offer_similarity.idx'
+
+# Offer view counters are buffered per worker and flushed to
+# OfferPopularity every N seconds or once this many ids are pending.
+OFFER_POPULARITY_FLUSH_INTERVAL = 10
+OFFER_POPULARITY_MAX_PENDING = 1000
+# Due flushes run in a per-process thread instead of the request.
+OFFER_POPULARITY_BACKGROUND_FLUSH = True
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -1,14 +1,18 @@
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
+from django.test import override_settings
 from rest_framework.authtoken.models import Token
 from auth_app.models import UserProfile
 
+from offers_app.api.popularity import popularity_buffer
 from offers_app.models import Offer, OfferDetail
 from orders_app.models import Orders
 from reviews_app.models import Review
 
 
-
+# counters are flushed inline: a flusher thread would write through its
+# own connection, outside the test transaction
+@override_settings(OFFER_POPULARITY_BACKGROUND_FLUSH=False)
 class UnauthenticatedAPITestCase(APITestCase):
     """
     Base test case that builds a consistent test-data environment.
@@ -32,6 +36,10 @@ class UnauthenticatedAPITestCase(APITestCase):
 
     def setUp(self):
         super().setUp()
+        # buffered view counts must not leak into other tests (or the
+        # shutdown flush after the test database is gone)
+        popularity_buffer.clear()
+        self.addCleanup(popularity_buffer.clear)
 
         self.user_business = self._create_user("KimPossible", UserProfile.UserType.BUSINESS)
         self.user_customer = self._create_user("JamesBond", UserProfile.UserType.CUSTOMER)
@@ -0,0 +1,210 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+"""
+Cache helpers for the public offer catalog.
+
+The catalog version is a single integer in the cache which is bumped
+on every Offer / OfferDetail write (see offers_app.api.signals).
+Cache keys embed the version, so a write invalidates all derived
+entries at once without having to know or delete them.
+
+Only the cache API is used (add/get/set/incr), so any Django backend
+works, including local-memory and file-based caches.
+"""
+
+CATALOG_VERSION_KEY = "offers:catalog-version"
+
+
+def get_catalog_version():
+    """Returns the current catalog version (initialised lazily)."""
+    cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+    return cache.get(CATALOG_VERSION_KEY, 1)
+
+
+def bump_catalog_version():
+    """Invalidates every versioned catalog cache entry."""
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, 2, timeout=None)
+        return 2
+
+
+POPULARITY_GENERATION_KEY = "offers:popularity-generation"
+
+
+def get_popularity_generation():
+    """
+    Generation of the popularity counters, bumped on every flush.
+
+    Flushes change neither updated_at nor the catalog version, so list
+    keys and ETags of `?ordering=popularity` pages include this as well.
+    """
+    cache.add(POPULARITY_GENERATION_KEY, 1, timeout=None)
+    return cache.get(POPULARITY_GENERATION_KEY, 1)
+
+
+def bump_popularity_generation():
+    try:
+        return cache.incr(POPULARITY_GENERATION_KEY)
+    except ValueError:
+        cache.set(POPULARITY_GENERATION_KEY, 2, timeout=None)
+        return 2
+
+
+def orders_by_popularity(query_params):
+    """True if `?ordering=popularity` is the primary ordering."""
+    ordering = query_params.get("ordering", "")
+    return ordering.split(",")[0].strip() == "popularity"
+
+
+def list_version(query_params):
+    """Catalog version of a list request (+ popularity generation if sorted by it)."""
+    version = get_catalog_version()
+    if orders_by_popularity(query_params):
+        return f"{version}.{get_popularity_generation()}"
+    return version
+
+
+def normalize_query(query_params, ignore=()):
+    """
+    Builds a stable string from query parameters.
+
+    Parameter order and repeated values are normalized, so
+    `?b=2&a=1` and `?a=1&b=2` map to the same cache key.
+    """
+    items = []
+    for key in sorted(query_params.keys()):
+        if key in ignore:
+            continue
+        for value in sorted(query_params.getlist(key)):
+            items.append(f"{key}={value}")
+    return "&".join(items)
+
+
+class OfferListCache:
+    """
+    Response cache in front of OfferViewSet.list.
+
+    - Key: catalog version + host + normalized query string
+      (filters, ordering, page, page_size, ...).
+    - A catalog write bumps the version, so stale pages are never served;
+      old entries simply expire.
+    - Only successful (200) responses are cached.
+    - Hits and misses are counted and exposed via stats().
+    """
+
+    timeout = 60 * 5
+    key_prefix = "offers:list"
+    hits_key = "offers:list-cache:hits"
+    misses_key = "offers:list-cache:misses"
+
+    def get_or_render(self, request, render):
+        """Returns the cached response for `request` or renders and stores it."""
+        key = self.cache_key(request)
+        data = cache.get(key)
+        if data is not None:
+            self._count(self.hits_key)
+            return self._response(data, "HIT")
+
+        self._count(self.misses_key)
+        response = render()
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, self.timeout)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def cache_key(self, request):
+        # scheme and host: the page contains absolute detail URLs
+        raw = f"{request.scheme}://{request.get_host()}?{normalize_query(request.query_params)}"
+        digest = hashlib.md5(raw.encode()).hexdigest()
+        return f"{self.key_prefix}:{list_version(request.query_params)}:{digest}"
+
+    def stats(self):
+        """Returns hit/miss counters and the current catalog version."""
+        hits = cache.get(self.hits_key, 0)
+        misses = cache.get(self.misses_key, 0)
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 3) if total else None,
+            "catalog_version": get_catalog_version(),
+        }
+
+    def _count(self, key):
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, timeout=None)
+
+    def _response(self, data, cache_status):
+        response = Response(data)
+        response["X-Cache"] = cache_status
+        return response
+
+
+offer_list_cache = OfferListCache()
+
+
+class OfferFragmentCache:
+    """
+    Per-offer list representations, so a page is assembled from
+    fragments and only changed offers are serialized again.
+
+    - Key: offer id + updated_at (every offer or package write bumps it),
+      the owner's version (user_details) and the response variant
+      (scheme/host of the detail URLs, `fields` / `omit` / `expand`).
+    - Writes to one offer therefore only miss that offer's fragment;
+      unlike the page cache, the catalog version is not part of the key.
+    - invalidate() drops all fragments at once (e.g. after aggregates were
+      rebuilt without touching updated_at).
+    """
+
+    timeout = 60 * 60
+    key_prefix = "offers:fragment"
+    generation_key = "offers:fragment-generation"
+    owner_key_prefix = "offers:fragment-owner"
+    variant_params = ("fields", "omit", "expand")
+
+    def keys(self, request, offers, with_owner=True):
+        """Returns {offer id: fragment key} with one cache round trip for the versions."""
+        owner_keys = {offer.user_id: self._owner_key(offer.user_id) for offer in offers} if with_owner else {}
+        versions = cache.get_many([self.generation_key, *owner_keys.values()])
+        prefix = f"{self.key_prefix}:{versions.get(self.generation_key, 0)}:{self._variant(request)}"
+
+        keys = {}
+        for offer in offers:
+            owner = versions.get(owner_keys[offer.user_id], 0) if with_owner else "-"
+            keys[offer.pk] = f"{prefix}:{offer.pk}:{offer.updated_at.timestamp()}:{owner}"
+        return keys
+
+    def get_many(self, keys):
+        return cache.get_many(list(keys))
+
+    def set_many(self, fragments):
+        cache.set_many(fragments, self.timeout)
+
+    def bump_owner(self, user_id):
+        """Invalidates the fragments of one user's offers (user_details changed)."""
+        cache.set(self._owner_key(user_id), time.time_ns(), timeout=None)
+
+    def invalidate(self):
+        cache.set(self.generation_key, time.time_ns(), timeout=None)
+
+    def _owner_key(self, user_id):
+        return f"{self.owner_key_prefix}:{user_id}"
+
+    def _variant(self, request):
+        params = {key: request.query_params.getlist(key) for key in self.variant_params}
+        raw = f"{request.scheme}://{request.get_host()}?{params}"
+        return hashlib.md5(raw.encode()).hexdigest()[:12]
+
+
+offer_fragment_cache = OfferFragmentCache()
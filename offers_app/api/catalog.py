@@ -0,0 +1,275 @@
+from datetime import datetime, timedelta, timezone
+
+from django.conf import settings
+from django.core.cache import cache
+
+from offers_app.api.versioned import VersionedIndex
+from offers_app.models import Offer
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+"""
+In-process columnar snapshot of the offer catalog.
+
+The numeric columns used by list filters and ordering are held in
+compact NumPy arrays (one entry per offer):
+
+    ids, user ids, min_price, min_delivery_time, updated_at
+
+Filters are evaluated vectorized over the presorted rows; only the ids
+of the requested page are handed to the ORM for hydration.
+
+Enabled with `OFFER_CATALOG_ENGINE = True` in the settings and only
+if NumPy is installed; otherwise the regular SQL path is used.
+
+Freshness:
+- Every catalog write bumps the catalog version (offers_app.api.cache).
+  On a version change the snapshot pulls offers with
+  updated_at >= its high-water mark and upserts them.
+- Deleted offers are detected by a row count mismatch, writes that do
+  not touch updated_at (rebuild_offer_aggregates) call
+  reset_catalog_snapshots(); both trigger a full reload.
+
+Concurrency (see offers_app.api.versioned): the columns of one snapshot
+version live in a read-only CatalogState that is swapped in as a whole,
+so a search never sees half-replaced columns. Full reloads run in the
+background (OFFER_CATALOG_BACKGROUND_RELOAD).
+"""
+
+CATALOG_RESET_KEY = "offers:catalog-reset"
+
+FILTER_PARAMS = ("creator_id", "min_price", "max_delivery_time")
+SQL_ONLY_PARAMS = ("offer_type", "max_price", "delivery_time_from", "delivery_time_to", "feature")
+ORDERINGS = ("updated_at", "-updated_at", "min_price", "-min_price")
+DEFAULT_ORDERING = "updated_at"
+
+_COLUMNS = ("id", "user_id", "min_price", "min_delivery_time", "updated_at")
+
+
+def catalog_engine_enabled():
+    """True if the engine is switched on and NumPy is available."""
+    return np is not None and getattr(settings, "OFFER_CATALOG_ENGINE", False)
+
+
+def reset_catalog_snapshots():
+    """Forces a full reload of every process' snapshot on next use."""
+    try:
+        cache.incr(CATALOG_RESET_KEY)
+    except ValueError:
+        cache.set(CATALOG_RESET_KEY, 1, timeout=None)
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value):
+    """datetime -> integer microseconds since the epoch (exact)."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value):
+    return _EPOCH + value * _MICROSECOND
+
+
+class CatalogState:
+    """
+    One immutable version of the snapshot columns.
+
+    Rows are sorted by id; the order per ordering column is precomputed
+    here, so queries never sort. The arrays are read-only and a state is
+    never changed after construction; updates create a new one.
+    """
+
+    __slots__ = (
+        "ids", "user_ids", "min_prices", "min_delivery_times", "updated_at", "sorted", "high_water", "reset_token",
+    )
+
+    chunk_size = 10_000
+
+    def __init__(self, ids, user_ids, min_prices, min_delivery_times, updated_at, loaded=True, reset_token=None):
+        columns = (ids, user_ids, min_prices, min_delivery_times, updated_at)
+        for column in columns:
+            column.flags.writeable = False
+        self.ids, self.user_ids, self.min_prices, self.min_delivery_times, self.updated_at = columns
+        self.sorted = {
+            "updated_at": np.lexsort((ids, updated_at)),
+            "min_price": np.lexsort((ids, np.nan_to_num(min_prices, nan=-np.inf))),
+        }
+        # None = never loaded; 0 = loaded, but the catalog was empty
+        self.high_water = (int(updated_at.max()) if len(updated_at) else 0) if loaded else None
+        # reset_catalog_snapshots() counter this state was loaded at
+        self.reset_token = reset_token
+
+    @classmethod
+    def empty(cls):
+        return cls(*cls._arrays([], [], [], [], []), loaded=False)
+
+    @classmethod
+    def load(cls, queryset, reset_token=None):
+        return cls(*cls._read(queryset), reset_token=reset_token)
+
+    @property
+    def loaded(self):
+        return self.high_water is not None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def columns(self):
+        return self.ids, self.user_ids, self.min_prices, self.min_delivery_times, self.updated_at
+
+    def merge(self, queryset):
+        """New state with the rows of `queryset` replaced by id or appended."""
+        changed = self._read(queryset)
+        keep = ~np.isin(self.ids, changed[0])
+        merged = [np.concatenate((column[keep], new)) for column, new in zip(self.columns(), changed)]
+        order = np.argsort(merged[0], kind="stable")
+        return CatalogState(*(column[order] for column in merged), reset_token=self.reset_token)
+
+    @classmethod
+    def _read(cls, queryset):
+        rows = queryset.order_by("id").values_list(*_COLUMNS).iterator(chunk_size=cls.chunk_size)
+        ids, user_ids, prices, days, updated = [], [], [], [], []
+        for pk, user_id, min_price, min_delivery_time, updated_at in rows:
+            ids.append(pk)
+            user_ids.append(user_id)
+            prices.append(float("nan") if min_price is None else float(min_price))
+            days.append(float("nan") if min_delivery_time is None else min_delivery_time)
+            updated.append(_to_micros(updated_at))
+        return cls._arrays(ids, user_ids, prices, days, updated)
+
+    @staticmethod
+    def _arrays(ids, user_ids, prices, days, updated):
+        return (
+            np.array(ids, dtype=np.int64),
+            np.array(user_ids, dtype=np.int64),
+            np.array(prices, dtype=np.float64),
+            np.array(days, dtype=np.float32),
+            np.array(updated, dtype=np.int64),
+        )
+
+
+class OfferCatalogSnapshot(VersionedIndex):
+    """
+    Columnar copy of the offer columns used for filtering / ordering.
+
+    Holds the current CatalogState and keeps it in step with the
+    database; searches run against whichever state is published.
+    """
+
+    background_setting = "OFFER_CATALOG_BACKGROUND_RELOAD"
+    thread_name = "offer-catalog-reload"
+    label = "offer catalog snapshot"
+
+    # Incremental pulls re-read this window before the high-water mark,
+    # covering transactions that committed slightly out of order.
+    overlap = timedelta(seconds=5)
+
+    def empty_state(self):
+        return CatalogState.empty()
+
+    def load_state(self):
+        return CatalogState.load(Offer.objects.all(), reset_token=cache.get(CATALOG_RESET_KEY))
+
+    def update_state(self, state):
+        since = _from_micros(state.high_water) - self.overlap
+        state = state.merge(Offer.objects.filter(updated_at__gte=since))
+        stale = cache.get(CATALOG_RESET_KEY) != state.reset_token or len(state) != Offer.objects.count()
+        return state, stale
+
+    # Querying
+
+    def search(self, creator_id=None, min_price=None, max_delivery_time=None,
+               ordering=DEFAULT_ORDERING, offset=0, limit=10):
+        """
+        Returns (page ids, total matches) for the given filters.
+
+        Ordering matches the SQL path: NULL min_price first ascending,
+        last descending; `id` is the tie-breaker.
+
+        Performance:
+        - Rows are walked in the presorted order of the ordering column,
+          so a request costs one vectorized mask and no sort.
+        - One reference to the published state is taken up front; a
+          concurrent refresh swaps in a new state without affecting it.
+        """
+        state = self._state
+        mask = None
+        if creator_id is not None:
+            mask = state.user_ids == creator_id
+        if min_price is not None:
+            mask = self._and(mask, state.min_prices >= min_price)
+        if max_delivery_time is not None:
+            mask = self._and(mask, state.min_delivery_times <= max_delivery_time)
+
+        positions = state.sorted[ordering.lstrip("-")]
+        if mask is not None:
+            positions = positions[mask[positions]]
+        if ordering.startswith("-"):
+            positions = positions[::-1]
+
+        page = state.ids[positions[offset: offset + limit]]
+        return page.tolist(), int(len(positions))
+
+    @staticmethod
+    def _and(mask, condition):
+        return condition if mask is None else mask & condition
+
+
+class OfferCatalog:
+    """
+    Serves offer list pages from the snapshot.
+
+    plan() decides whether a request can be answered by the engine
+    (only the numeric filters, a supported ordering, page numbers with
+    exact counts); everything else stays on the SQL path.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+
+    @property
+    def snapshot(self):
+        if self._snapshot is None:
+            self._snapshot = OfferCatalogSnapshot()
+        self._snapshot.refresh()
+        return self._snapshot
+
+    def plan(self, request, filter_data):
+        """Returns search kwargs for the engine or None."""
+        if not catalog_engine_enabled():
+            return None
+
+        params = request.query_params
+        if params.get("search") or "cursor" in params or params.get("count", "exact") != "exact":
+            return None
+        # package-level filters and feature terms are not part of the snapshot
+        if any(filter_data.get(name) is not None for name in SQL_ONLY_PARAMS):
+            return None
+
+        ordering = params.get("ordering") or DEFAULT_ORDERING
+        if ordering not in ORDERINGS:
+            return None
+
+        plan = {name: filter_data.get(name) for name in FILTER_PARAMS}
+        plan["ordering"] = ordering
+        return plan
+
+    def search(self, offset, limit, **plan):
+        return self.snapshot.search(offset=offset, limit=limit, **plan)
+
+    def invalidate(self):
+        """Schedules a full reload of the snapshot (see OfferCatalogSnapshot.invalidate)."""
+        if self._snapshot is not None:
+            self._snapshot.invalidate()
+
+    def reset(self):
+        """Drops the snapshot; the next use loads it from scratch."""
+        self._snapshot = None
+
+
+offer_catalog = OfferCatalog()
@@ -0,0 +1,54 @@
+import base64
+import json
+
+from offers_app.models import OfferChange
+
+"""
+Delta sync for offline copies of the catalog (GET /offers/changes/).
+
+Every Offer / OfferDetail write appends an OfferChange row; deleting
+an offer appends a tombstone. The row id is a monotonically increasing
+change sequence (SQLite serializes writers, so ids commit in order).
+
+A client stores the returned token and asks for changes after it:
+- only the latest change per offer is returned (superseded rows are
+  skipped via the (offer_id, id) index), so a refresh costs the number
+  of changed offers, not the size of the catalog or of the log
+- pages are cut by the sequence; `has_more` asks for another round
+- no token = from the start: the whole catalog as one change set
+"""
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+
+
+def encode_token(sequence):
+    return base64.urlsafe_b64encode(json.dumps({"s": sequence}).encode()).decode()
+
+
+def decode_token(token):
+    """Returns the change sequence of `token`; ValueError if it is invalid."""
+    try:
+        sequence = json.loads(base64.urlsafe_b64decode(token.encode()))["s"]
+    except (TypeError, KeyError, ValueError):
+        raise ValueError("Invalid sync token.")
+    if not isinstance(sequence, int) or sequence < 0:
+        raise ValueError("Invalid sync token.")
+    return sequence
+
+
+def changes_since(sequence, limit=DEFAULT_LIMIT):
+    """
+    Returns (changes, next sequence, has_more) for changes after `sequence`.
+
+    One indexed query; `limit + 1` rows tell whether another page exists.
+    """
+    rows = list(
+        OfferChange.objects.filter(id__gt=sequence)
+        .latest_per_offer()
+        .order_by("id")
+        .values("id", "offer_id", "deleted")[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, rows[-1]["id"] if rows else sequence, has_more
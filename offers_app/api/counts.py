@@ -0,0 +1,79 @@
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.exceptions import ValidationError
+
+from offers_app.api.cache import get_catalog_version, normalize_query
+
+
+class OfferCountStrategy:
+    """
+    Decides how the total count of an offer list is obtained.
+
+    Modes (`?count=`):
+    - exact (default): exact count of the filtered set. Counted on the
+      bare base queryset (no joins, prefetches, ordering or annotations)
+      and cached per normalized filter set for a short TTL. The key
+      contains the catalog version, so offer writes invalidate it, and an
+      md5 of the filter set (bounded length, safe for any cache backend).
+    - approximate: last known exact count for the filter set (may be
+      stale or missing) plus a `has_more` flag, never counts.
+    - omit: no count at all, only `has_more`.
+    """
+
+    query_param = "count"
+    modes = ("exact", "approximate", "omit")
+    default_mode = "exact"
+
+    exact_timeout = 30
+    approximate_timeout = 60 * 10
+
+    # Parameters that do not change the set of matching offers.
+    non_filter_params = ("page", "page_size", "ordering", "cursor", "count", "facets", "fields", "omit", "expand")
+
+    def __init__(self, request):
+        self.mode = request.query_params.get(self.query_param) or self.default_mode
+        if self.mode not in self.modes:
+            raise ValidationError({self.query_param: f"Must be one of: {', '.join(self.modes)}."})
+
+        filter_key = normalize_query(request.query_params, ignore=self.non_filter_params)
+        self.filter_key = hashlib.md5(filter_key.encode()).hexdigest()
+
+    @property
+    def exact(self):
+        return self.mode == "exact"
+
+    def exact_count(self, queryset):
+        """Returns the exact count, served from cache where possible."""
+        key = self._cache_key(get_catalog_version())
+        count = cache.get(key)
+        if count is None:
+            count = self.base_queryset(queryset).count()
+            cache.set(key, count, self.exact_timeout)
+            cache.set(self._cache_key("last"), count, self.approximate_timeout)
+        return count
+
+    def approximate_count(self):
+        """Returns the last known count for the filter set or None."""
+        return cache.get(self._cache_key("last"))
+
+    def base_queryset(self, queryset):
+        """Strips everything that does not influence the number of rows."""
+        return queryset.order_by().select_related(None).prefetch_related(None)
+
+    def _cache_key(self, version):
+        return f"offers:count:{version}:{self.filter_key}"
+
+
+class OfferPaginator(Paginator):
+    """Django Paginator that obtains its count from an OfferCountStrategy."""
+
+    def __init__(self, *args, count_strategy, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_strategy = count_strategy
+
+    @cached_property
+    def count(self):
+        return self.count_strategy.exact_count(self.object_list)
@@ -0,0 +1,69 @@
+from django.db.models import Count, Q
+
+"""
+Facet counts for the offer list (`?facets=price,delivery_time`).
+
+Buckets are evaluated on the denormalized Offer columns
+(min_price / min_delivery_time), so all requested facets are computed
+with one aggregate query of conditional COUNTs over the filtered set.
+"""
+
+# (key, lower bound inclusive, upper bound exclusive / None = open)
+PRICE_BUCKETS = [
+    ("0-50", 0, 50),
+    ("50-100", 50, 100),
+    ("100-250", 100, 250),
+    ("250-500", 250, 500),
+    ("500+", 500, None),
+]
+
+# (key, lower bound inclusive, upper bound inclusive / None = open)
+DELIVERY_TIME_BUCKETS = [
+    ("1", 0, 1),
+    ("2-3", 2, 3),
+    ("4-7", 4, 7),
+    ("8-14", 8, 14),
+    ("15+", 15, None),
+]
+
+FACETS = {
+    "price": ("min_price", PRICE_BUCKETS, "lt"),
+    "delivery_time": ("min_delivery_time", DELIVERY_TIME_BUCKETS, "lte"),
+}
+
+
+def parse_facets(value):
+    """Splits `price,delivery_time`; unknown names raise ValueError."""
+    names = [name.strip() for name in (value or "").split(",") if name.strip()]
+    unknown = [name for name in names if name not in FACETS]
+    if unknown:
+        raise ValueError(f"Unknown facet(s): {', '.join(unknown)}. Allowed: {', '.join(FACETS)}.")
+    return list(dict.fromkeys(names))
+
+
+def compute_facets(queryset, names):
+    """
+    Returns bucket counts for the requested facets:
+        {"price": [{"key": "0-50", "from": 0, "to": 50, "count": 3}, ...], ...}
+    """
+    if not names:
+        return {}
+
+    aggregates = {}
+    for name in names:
+        field, buckets, upper_lookup = FACETS[name]
+        for index, (_, lower, upper) in enumerate(buckets):
+            condition = Q(**{f"{field}__gte": lower})
+            if upper is not None:
+                condition &= Q(**{f"{field}__{upper_lookup}": upper})
+            aggregates[f"{name}_{index}"] = Count("pk", filter=condition)
+
+    counts = queryset.order_by().select_related(None).prefetch_related(None).aggregate(**aggregates)
+
+    return {
+        name: [
+            {"key": key, "from": lower, "to": upper, "count": counts[f"{name}_{index}"]}
+            for index, (key, lower, upper) in enumerate(FACETS[name][1])
+        ]
+        for name in names
+    }
@@ -0,0 +1,138 @@
+import json
+import time
+
+from django.db import transaction
+
+from auth_app.models import UserProfile
+from offers_app.api.cache import bump_catalog_version
+from offers_app.api.serializers import OfferImportSerializer
+from offers_app.models import Offer, OfferChange, OfferDetail, OfferFeature
+
+
+class OfferImportError(Exception):
+    """Raised for problems that abort the whole import (e.g. invalid owner)."""
+
+
+class OfferImporter:
+    """
+    Streaming bulk import of offers from JSON Lines.
+
+    Input:
+    - One offer per line in the OfferSerializerPostPatch payload shape
+      (title, image, description, details[3]).
+    - Lines are read one at a time, so memory stays constant
+      regardless of the file size.
+
+    Behavior:
+    - Every record is validated with the regular offer rules
+      (three details: basic, standard, premium).
+    - Valid records are inserted in batches: one transaction per batch
+      with one bulk_create for offers and one for their details.
+    - Invalid lines are reported with their line number and skipped.
+    - Denormalized aggregates, the feature index, the change log and
+      the catalog version are refreshed per batch (bulk_create bypasses
+      signals).
+    """
+
+    default_batch_size = 500
+    max_reported_errors = 100
+
+    def __init__(self, owner, batch_size=None):
+        self.owner = owner
+        self.batch_size = batch_size or self.default_batch_size
+        self._validate_owner()
+
+    def run(self, lines):
+        """
+        Imports all records from an iterable of lines (str or bytes).
+
+        Returns a report:
+        {"created", "failed", "errors": [{"line", "errors"}], "seconds", "rows_per_second"}
+        """
+        started = time.monotonic()
+        report = {"created": 0, "failed": 0, "errors": []}
+        batch = []
+
+        for line_number, line in enumerate(lines, start=1):
+            record, errors = self._parse(line)
+            if record is None and errors is None:
+                continue
+            if errors:
+                self._report_error(report, line_number, errors)
+                continue
+
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                report["created"] += self._flush(batch)
+                batch = []
+
+        if batch:
+            report["created"] += self._flush(batch)
+
+        seconds = time.monotonic() - started
+        report["seconds"] = round(seconds, 3)
+        report["rows_per_second"] = round(report["created"] / seconds, 1) if seconds else None
+        return report
+
+    def _validate_owner(self):
+        try:
+            profile_type = UserProfile.objects.get(user=self.owner).type
+        except UserProfile.DoesNotExist:
+            raise OfferImportError("UserProfile not found.")
+
+        if profile_type != UserProfile.UserType.BUSINESS:
+            raise OfferImportError("Offers can only be imported for business users.")
+
+    def _parse(self, line):
+        """Returns (validated_data, None), (None, errors) or (None, None) for blank lines."""
+        if isinstance(line, bytes):
+            try:
+                line = line.decode("utf-8")
+            except UnicodeDecodeError as exc:
+                return None, {"non_field_errors": [f"Invalid UTF-8: {exc}"]}
+        line = line.strip()
+        if not line:
+            return None, None
+
+        try:
+            payload = json.loads(line)
+        except ValueError as exc:
+            return None, {"non_field_errors": [f"Invalid JSON: {exc}"]}
+
+        serializer = OfferImportSerializer(data=payload, context={"require_full_details": True})
+        if not serializer.is_valid():
+            return None, serializer.errors
+        return serializer.validated_data, None
+
+    def _report_error(self, report, line_number, errors):
+        report["failed"] += 1
+        if len(report["errors"]) < self.max_reported_errors:
+            report["errors"].append({"line": line_number, "errors": errors})
+
+    def _flush(self, batch):
+        """Inserts one batch of validated records in a single transaction."""
+        with transaction.atomic():
+            offers = Offer.objects.bulk_create(
+                [
+                    Offer(
+                        user=self.owner,
+                        title=record["title"],
+                        image=record.get("image") or "",
+                        description=record.get("description", ""),
+                    )
+                    for record in batch
+                ]
+            )
+            details = OfferDetail.objects.bulk_create(
+                [
+                    OfferDetail(offer=offer, **detail)
+                    for offer, record in zip(offers, batch)
+                    for detail in record["details"]
+                ]
+            )
+            OfferFeature.objects.sync(details)
+            Offer.objects.filter(pk__in=[offer.pk for offer in offers]).refresh_aggregates()
+            OfferChange.objects.record([offer.pk for offer in offers])
+
+        bump_catalog_version()
+        return len(offers)
@@ -1,5 +1,18 @@
+import base64
+import json
+from functools import partial
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from offers_app.api.counts import OfferCountStrategy, OfferPaginator
+from offers_app.models import Offer
+
 
 class OfferPagination(PageNumberPagination):
     """
@@ -17,12 +30,52 @@ class OfferPagination(PageNumberPagination):
         "previous": <url|null>,
         "results": [...]
     }
+
+    Counting (`?count=exact|approximate|omit`, see OfferCountStrategy):
+    - exact (default): cached exact `count` as shown above.
+    - approximate: `count` is the last known value (or null),
+      plus a `has_more` flag.
+    - omit: no `count`, only `has_more`.
+
+    Cursor mode (opt-in via `?cursor=`):
+    - Keyset pagination over the active ordering
+      (updated_at or min_price) with `id` as tie-breaker.
+    - Each page is a single index range scan, no COUNT query.
+    - `next` / `previous` contain opaque cursor links,
+      the response has no `count`.
+
+    Catalog engine (see offers_app.api.catalog):
+    - paginate_catalog() pages over ids returned by the in-memory
+      engine; the response format equals the exact count mode.
     """
 
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
 
+    cursor_query_param = "cursor"
+    keyset_fields = ["updated_at", "min_price"]
+    invalid_cursor_message = "Invalid cursor."
+
+    cursor_mode = False
+    count_strategy = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Dispatches to keyset pagination if `?cursor=` is present,
+        otherwise to page numbers with the requested count strategy.
+        """
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if self.cursor_mode:
+            return self._paginate_keyset(queryset, request)
+
+        self.count_strategy = OfferCountStrategy(request)
+        if not self.count_strategy.exact:
+            return self._paginate_without_count(queryset, request)
+
+        self.django_paginator_class = partial(OfferPaginator, count_strategy=self.count_strategy)
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
         """
         Builds the paginated response using the standard response structure.
@@ -32,6 +85,26 @@ class OfferPagination(PageNumberPagination):
           (not only those on the current page).
         - `next` / `previous` contain navigation links or `None`.
         """
+        if self.cursor_mode:
+            return Response(
+                {
+                    "next": self.get_next_link(),
+                    "previous": self.get_previous_link(),
+                    "results": data,
+                }
+            )
+
+        if not self.count_strategy.exact:
+            payload = {
+                "has_more": self.has_more,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+            if self.count_strategy.mode == "approximate":
+                payload = {"count": self.count_strategy.approximate_count(), **payload}
+            return Response(payload)
+
         return Response(
             {
                 "count": self.page.paginator.count,
@@ -40,3 +113,172 @@ class OfferPagination(PageNumberPagination):
                 "results": data,
             }
         )
+
+    def get_next_link(self):
+        if self.cursor_mode:
+            return self._cursor_link(self.next_position, reverse=False)
+        if not self.count_strategy.exact:
+            return self._page_link(self.page_number + 1) if self.has_more else None
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.cursor_mode:
+            return self._cursor_link(self.previous_position, reverse=True)
+        if not self.count_strategy.exact:
+            return self._page_link(self.page_number - 1) if self.page_number > 1 else None
+        return super().get_previous_link()
+
+    # Catalog engine
+
+    def paginate_catalog(self, search, request):
+        """
+        Resolves the requested page through `search(offset, limit)`,
+        which returns (page ids, total matches). Returns the page ids.
+        """
+        self.request = request
+        self.cursor_mode = False
+        self.count_strategy = OfferCountStrategy(request)
+
+        page_size = self.get_page_size(request)
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            number = 0
+        if number < 1:
+            raise NotFound(self.invalid_page_message)
+
+        ids, total = search((number - 1) * page_size, page_size)
+        try:
+            # A range stands in for the result set: counting and slicing it is free.
+            self.page = Paginator(range(total), page_size).page(number)
+        except InvalidPage:
+            raise NotFound(self.invalid_page_message)
+        return ids
+
+    # Page numbers without count
+
+    def _paginate_without_count(self, queryset, request):
+        """
+        Slices the requested page without validating it against a count.
+
+        One extra row is loaded to determine `has_more`.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            self.page_number = 0
+        if self.page_number < 1:
+            raise NotFound(self.invalid_page_message)
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset: offset + page_size + 1])
+        self.has_more = len(rows) > page_size
+        return rows[:page_size]
+
+    def _page_link(self, page_number):
+        url = self.request.build_absolute_uri()
+        if page_number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, page_number)
+
+    # Keyset pagination
+
+    def _paginate_keyset(self, queryset, request):
+        """
+        Fetches one page after (or before) the cursor position.
+
+        One extra row is loaded to find out whether another page exists.
+        """
+        self.request = request
+        self.base_url = remove_query_param(request.build_absolute_uri(), "page")
+        self.field, descending = self._resolve_ordering(queryset)
+        position = self._decode_cursor(request.query_params.get(self.cursor_query_param))
+        page_size = self.get_page_size(request)
+
+        reverse = bool(position and position["reverse"])
+        scan_descending = descending != reverse
+
+        queryset = queryset.order_by(*self._order_by(scan_descending))
+        if position:
+            queryset = queryset.filter(
+                self._after(position["value"], position["id"], scan_descending)
+            )
+
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self.next_position = rows[-1] if rows and has_next else None
+        self.previous_position = rows[0] if rows and has_previous else None
+        return rows
+
+    def _resolve_ordering(self, queryset):
+        """Returns (field, descending) of the active ordering."""
+        ordering = [o for o in queryset.query.order_by if isinstance(o, str)]
+        primary = ordering[0] if ordering else self.keyset_fields[0]
+        field = primary.lstrip("-")
+
+        if field not in self.keyset_fields:
+            raise ValidationError(
+                {"ordering": f"Cursor pagination supports ordering by: {', '.join(self.keyset_fields)}."}
+            )
+        return field, primary.startswith("-")
+
+    def _order_by(self, descending):
+        """Ordering with explicit NULL placement and `id` as tie-breaker."""
+        if descending:
+            return [F(self.field).desc(nulls_last=True), F("id").desc()]
+        return [F(self.field).asc(nulls_first=True), F("id").asc()]
+
+    def _after(self, value, pk, descending):
+        """Condition selecting all rows positioned after (value, pk)."""
+        field = self.field
+        if descending:
+            if value is None:
+                return Q(**{f"{field}__isnull": True, "id__lt": pk})
+            return (
+                Q(**{f"{field}__lt": value})
+                | Q(**{field: value, "id__lt": pk})
+                | Q(**{f"{field}__isnull": True})
+            )
+
+        if value is None:
+            return Q(**{f"{field}__isnull": True, "id__gt": pk}) | Q(**{f"{field}__isnull": False})
+        return Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk})
+
+    def _cursor_link(self, row, reverse):
+        """Encodes the position of `row` as an opaque cursor link."""
+        if row is None:
+            return None
+        value = getattr(row, self.field)
+        if value is not None:
+            value = value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+        payload = {
+            "v": value,
+            "id": row.pk,
+            "r": int(reverse),
+        }
+        token = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def _decode_cursor(self, token):
+        """Decodes an opaque cursor; an empty cursor starts at the first page."""
+        if not token:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+            value = payload["v"]
+            if value is not None:
+                value = Offer._meta.get_field(self.field).to_python(value)
+            return {"value": value, "id": int(payload["id"]), "reverse": bool(payload["r"])}
+        except (TypeError, ValueError, KeyError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
@@ -1,32 +1,34 @@
 from rest_framework.permissions import BasePermission
 from rest_framework.permissions import SAFE_METHODS
 from auth_app.models import UserProfile
+from core.loaders import get_profile
 
 
 class OfferPermission(BasePermission):
 
-    def _profile_type(self, user):
-        try:
-            return UserProfile.objects.get(user=user).type
-        except UserProfile.DoesNotExist:
-            return None
+    def _profile_type(self, request):
+        profile = get_profile(request, request.user)
+        return profile.type if profile else None
 
     def has_permission(self, request, view):
-        if view.action == "list":
+        if view.action in ["list", "suggest", "changes"]:
             return True
 
-        if view.action == "create":
+        if view.action in ["create", "bulk_patch"]:
             return (
                 request.user.is_authenticated and
-                self._profile_type(request.user) == UserProfile.UserType.BUSINESS
+                self._profile_type(request) == UserProfile.UserType.BUSINESS
             )
 
-        if view.action == "retrieve":
+        if view.action in ["retrieve", "similar"]:
             return request.user.is_authenticated
 
         if view.action in ["update", "partial_update", "destroy"]:
             return request.user.is_authenticated
 
+        if view.action in ["cache_stats", "bulk_import"]:
+            return request.user.is_authenticated and request.user.is_staff
+
         return False
 
     def has_object_permission(self, request, view, obj):
@@ -0,0 +1,207 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from offers_app.api.cache import bump_popularity_generation
+from offers_app.models import Offer, OfferDetail, OfferPopularity
+
+"""
+Write-behind popularity counters.
+
+Reads must not write: an UPDATE per GET /offers/<id>/ would queue every
+request behind SQLite's single write lock. Instead each worker counts
+views in memory and flushes them to OfferPopularity in one batched
+upsert per interval:
+
+    INSERT ... ON CONFLICT (offer_id) DO UPDATE SET views = views + excluded.views
+
+The upsert adds to the stored values, so the buffers of several worker
+processes are summed in the table rather than overwriting each other.
+
+A per-process flusher thread (started with the first count) writes the
+buffer every interval, also when no further request arrives. A flush is
+due early once too many ids are pending; the request that notices it
+only wakes the thread, so no read pays for the upsert. A last flush
+runs at interpreter shutdown. A failed flush is logged and puts
+the counts back into the buffer. Each successful flush bumps the
+popularity generation (list cache keys / ETags of popularity pages).
+
+OFFER_POPULARITY_BACKGROUND_FLUSH = False flushes inline instead
+(deterministic, used by the tests).
+"""
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 10
+DEFAULT_MAX_PENDING = 1000
+
+
+class PopularityBuffer:
+    """In-process view counters, flushed to OfferPopularity in batches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = Counter()
+        self._detail_opens = Counter()
+        self._pending_since = None
+        self._wakeup = threading.Event()
+        self._flusher = None
+
+    @property
+    def background(self):
+        return getattr(settings, "OFFER_POPULARITY_BACKGROUND_FLUSH", True)
+
+    @property
+    def flush_interval(self):
+        return getattr(settings, "OFFER_POPULARITY_FLUSH_INTERVAL", DEFAULT_FLUSH_INTERVAL)
+
+    @property
+    def max_pending(self):
+        return getattr(settings, "OFFER_POPULARITY_MAX_PENDING", DEFAULT_MAX_PENDING)
+
+    def record_view(self, offer_id):
+        """Counts one GET /offers/<id>/."""
+        self._record(self._views, int(offer_id))
+
+    def record_detail_open(self, detail_id):
+        """Counts one GET /offerdetails/<id>/ (resolved to its offer on flush)."""
+        self._record(self._detail_opens, int(detail_id))
+
+    def _record(self, counter, key):
+        with self._lock:
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            counter[key] += 1
+            due = (
+                time.monotonic() - self._pending_since >= self.flush_interval
+                or len(self._views) + len(self._detail_opens) >= self.max_pending
+            )
+        if self.background:
+            self._start_flusher()
+            if due:
+                self._wakeup.set()
+        elif due:
+            self._flush_logged()
+
+    def _flush_logged(self):
+        try:
+            self.flush()
+        except DatabaseError:
+            logger.exception("Could not flush offer popularity counters, retrying later.")
+
+    def _start_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(
+                    target=self._run_flusher, name="offer-popularity-flush", daemon=True
+                )
+                self._flusher.start()
+
+    def _run_flusher(self):
+        while True:
+            self._flush_tick()
+
+    def _flush_tick(self):
+        """Waits until woken or one interval passed, then flushes what is pending."""
+        self._wakeup.wait(timeout=self.flush_interval)
+        self._wakeup.clear()
+        if not self.background or self._pending_since is None:
+            return
+        try:
+            self._flush_logged()
+        finally:
+            # the thread's own connection, not the request's
+            connection.close()
+
+    def pending(self):
+        """Buffered (views, detail opens) per id, for inspection and tests."""
+        with self._lock:
+            return dict(self._views), dict(self._detail_opens)
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
+            self._detail_opens.clear()
+            self._pending_since = None
+
+    def flush(self):
+        """
+        Writes the buffered counts with one upsert; returns the number
+        of offers written. The buffer is swapped out under the lock, so
+        requests keep counting while the flush runs.
+        """
+        with self._lock:
+            views, detail_opens = self._views, self._detail_opens
+            self._views, self._detail_opens = Counter(), Counter()
+            pending_since, self._pending_since = self._pending_since, None
+        if not views and not detail_opens:
+            return 0
+
+        try:
+            written = write_counters(views, detail_opens)
+        except DatabaseError:
+            with self._lock:
+                self._views.update(views)
+                self._detail_opens.update(detail_opens)
+                self._pending_since = pending_since
+            raise
+        if written:
+            bump_popularity_generation()
+        return written
+
+
+def write_counters(views, detail_opens):
+    """
+    Adds {offer_id: views} and {detail_id: opens} to OfferPopularity.
+
+    Queries: one lookup of the detail -> offer ids, one existence check
+    (offers deleted since the view are skipped) and one executemany upsert.
+    """
+    rows = {offer_id: [count, 0] for offer_id, count in views.items()}
+    detail_offers = dict(OfferDetail.objects.filter(pk__in=list(detail_opens)).values_list("id", "offer_id"))
+    for detail_id, count in detail_opens.items():
+        if detail_id in detail_offers:
+            rows.setdefault(detail_offers[detail_id], [0, 0])[1] += count
+
+    existing = set(Offer.objects.filter(pk__in=list(rows)).values_list("id", flat=True))
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    params = [
+        (offer_id, offer_views, opens, offer_views + opens, now)
+        for offer_id, (offer_views, opens) in sorted(rows.items())
+        if offer_id in existing
+    ]
+    if not params:
+        return 0
+
+    table = connection.ops.quote_name(OfferPopularity._meta.db_table)
+    sql = (
+        f"INSERT INTO {table} (offer_id, views, detail_opens, score, updated_at) "
+        f"VALUES (%s, %s, %s, %s, %s) "
+        f"ON CONFLICT (offer_id) DO UPDATE SET "
+        f"views = {table}.views + excluded.views, "
+        f"detail_opens = {table}.detail_opens + excluded.detail_opens, "
+        f"score = {table}.score + excluded.score, "
+        f"updated_at = excluded.updated_at"
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+    return len(params)
+
+
+popularity_buffer = PopularityBuffer()
+
+
+@atexit.register
+def _flush_on_shutdown():
+    try:
+        popularity_buffer.flush()
+    except Exception:
+        logger.exception("Could not flush offer popularity counters on shutdown.")
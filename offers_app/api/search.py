@@ -0,0 +1,184 @@
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+"""
+Full-text search for offers backed by an SQLite FTS5 index.
+
+- offers_app_offer_fts is an external-content FTS5 table over
+  Offer.title / Offer.description.
+- SQLite triggers keep it in sync on every INSERT/UPDATE/DELETE of an
+  offer, including bulk operations that bypass Django signals.
+- On databases without FTS5 the regular SearchFilter (LIKE) is used.
+
+Note:
+- SQLite drops triggers when Django remakes the offer table during a
+  migration. A post_migrate handler (restore_offer_search_triggers)
+  re-creates missing triggers and rebuilds the index; manually:
+  `python manage.py rebuild_offer_search_index`.
+- Migration 0005 carries its own copy of this SQL; keep both in step.
+"""
+
+FTS_TABLE = "offers_app_offer_fts"
+OFFER_TABLE = "offers_app_offer"
+
+# bm25 column weights: a title hit counts ten times a description hit.
+TITLE_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+FTS_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title,
+        description,
+        content='{OFFER_TABLE}',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {OFFER_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {OFFER_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON {OFFER_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+FTS_TRIGGERS = (f"{FTS_TABLE}_ai", f"{FTS_TABLE}_ad", f"{FTS_TABLE}_au")
+
+FTS_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_availability = {}
+
+
+def fts_supported(connection):
+    """Returns True if the database engine is SQLite compiled with FTS5."""
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def install_fts(connection):
+    """
+    Creates the FTS5 table and sync triggers and (re)builds the index
+    from the offer table. Returns False if FTS5 is not available.
+    """
+    if not fts_supported(connection):
+        return False
+
+    with connection.cursor() as cursor:
+        for statement in FTS_SCHEMA:
+            cursor.execute(statement)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    _availability.clear()
+    return True
+
+
+def uninstall_fts(connection):
+    """Removes the FTS5 table and its triggers (if present)."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for statement in FTS_DROP:
+            cursor.execute(statement)
+    _availability.clear()
+
+
+def missing_fts_triggers(connection):
+    """Names of sync triggers absent although the FTS5 table exists."""
+    if connection.vendor != "sqlite" or FTS_TABLE not in connection.introspection.table_names():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = %s", [OFFER_TABLE])
+        present = {row[0] for row in cursor.fetchall()}
+    return [name for name in FTS_TRIGGERS if name not in present]
+
+
+def fts_available(connection):
+    """Returns True if the FTS5 index exists on this connection (cached)."""
+    key = (connection.alias, str(connection.settings_dict["NAME"]))
+    if key not in _availability:
+        _availability[key] = (
+            connection.vendor == "sqlite"
+            and FTS_TABLE in connection.introspection.table_names()
+        )
+    return _availability[key]
+
+
+def build_match_expression(term):
+    """
+    Turns free user input into a safe FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix query, all words must match:
+        "logo design" -> '"logo"* "design"*'
+    """
+    tokens = _TOKEN_RE.findall(term or "")
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class OfferSearchFilter(SearchFilter):
+    """
+    SearchFilter using the FTS5 index when available.
+
+    Behavior:
+    - `?search=` is resolved through the FTS5 index (prefix matching).
+    - `?ordering=relevance` sorts the matches by bm25 rank
+      (title hits weigh more than description hits).
+    - Falls back to the standard LIKE based SearchFilter over
+      `search_fields` if FTS5 is not available.
+    """
+
+    relevance_param = "relevance"
+
+    def filter_queryset(self, request, queryset, view):
+        match = build_match_expression(request.query_params.get(self.search_param, ""))
+        if not match or not fts_available(connections[queryset.db]):
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                (match,),
+            )
+        )
+
+        if self._wants_relevance(request):
+            queryset = queryset.annotate(
+                search_rank=RawSQL(
+                    f"SELECT bm25({FTS_TABLE}, %s, %s) FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s AND rowid = {OFFER_TABLE}.id",
+                    (TITLE_WEIGHT, DESCRIPTION_WEIGHT, match),
+                )
+            ).order_by("search_rank", "-updated_at", "id")
+
+        return queryset
+
+    def _wants_relevance(self, request):
+        """True if `?ordering=relevance` was requested."""
+        ordering = request.query_params.get("ordering", "")
+        return self.relevance_param in [o.strip() for o in ordering.split(",")]
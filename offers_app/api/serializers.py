@@ -1,9 +1,18 @@
 
 from django.contrib.auth.models import User
+from django.db import models, transaction
 
 from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.permissions import SAFE_METHODS
 from auth_app.models import UserProfile
-from offers_app.models import Offer, OfferDetail
+from core.fieldsets import SparseFieldsetMixin, parse_field_names
+from core.hyperlinks import CachedHyperlinkedModelSerializer
+from core.loaders import BatchLoadedRelationsMixin, BatchLoadingListSerializer, get_profile
+from offers_app.api.cache import bump_catalog_version, offer_fragment_cache
+from offers_app.api.changes import DEFAULT_LIMIT, MAX_LIMIT, decode_token
+from offers_app.api.facets import parse_facets
+from offers_app.models import Offer, OfferChange, OfferDetail, OfferFeature, normalize_feature
 
 
 class OfferDetailSerializer(serializers.ModelSerializer):
@@ -28,13 +37,17 @@ class OfferDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class OfferDetailHyperlinkedSerializer(serializers.HyperlinkedModelSerializer):
+class OfferDetailHyperlinkedSerializer(CachedHyperlinkedModelSerializer):
     """
     Lightweight serializer for OfferDetail references.
 
     Usage:
     - Used in offer list responses to reference details via hyperlinks
       instead of embedding full detail data.
+
+    Performance:
+    - The `offerdetail-detail` URL is reversed once per request,
+      every further URL is built by string concatenation.
     """
 
     class Meta:
@@ -42,7 +55,98 @@ class OfferDetailHyperlinkedSerializer(serializers.HyperlinkedModelSerializer):
         fields = ["id", "url"]
 
 
-class OfferSerializer(serializers.ModelSerializer):
+def apply_changes(obj, values, exclude=()):
+    """
+    Sets the given attributes on `obj` and returns the names
+    of the fields whose value actually changed.
+    """
+    changed = []
+    for field, value in values.items():
+        if field in exclude or getattr(obj, field) == value:
+            continue
+        setattr(obj, field, value)
+        changed.append(field)
+    return changed
+
+
+class OfferDetailExpansionMixin:
+    """
+    Inlines the full OfferDetailSerializer representation for
+    `?expand=details` instead of {id, url} references.
+
+    Notes:
+    - Only applies to read requests; without the parameter the
+      response shape is unchanged.
+    - Details come from the view's prefetch_related("details"),
+      so expanding costs no additional query per offer.
+    """
+
+    expand_query_param = "expand"
+    expandable_fields = ("details",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return
+
+        expand = parse_field_names(request.query_params.get(self.expand_query_param))
+        unknown = sorted(set(expand) - set(self.expandable_fields))
+        if unknown:
+            raise serializers.ValidationError(
+                {self.expand_query_param: [f"Cannot expand: {', '.join(unknown)}."]}
+            )
+
+        if "details" in expand:
+            self.fields["details"] = OfferDetailSerializer(many=True, read_only=True)
+
+
+class OfferAggregateMixin:
+    """
+    Provides min_price / min_delivery_time for offer read serializers.
+
+    Performance:
+    - Reads the denormalized columns on Offer, so no query
+      is issued per row.
+    """
+
+    def get_min_price(self, obj):
+        """Returns the minimum price across all OfferDetails."""
+        return obj.min_price
+
+    def get_min_delivery_time(self, obj):
+        """Returns the minimum delivery time across all OfferDetails."""
+        return obj.min_delivery_time
+
+
+class OfferFragmentListSerializer(BatchLoadingListSerializer):
+    """
+    Assembles offer list pages from per-offer fragments (OfferFragmentCache).
+
+    Performance:
+    - One cache round trip for the versions, one for the fragments.
+    - Only the misses are serialized (and their owners batch loaded),
+      so after a write only the changed offer is rendered again.
+    """
+
+    def to_representation(self, data):
+        request = self.context.get("request")
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        offers = list(iterable)
+        if request is None or not offers:
+            return super().to_representation(offers)
+
+        keys = offer_fragment_cache.keys(request, offers, with_owner="user_details" in self.child.fields)
+        fragments = offer_fragment_cache.get_many(keys.values())
+        missing = [offer for offer in offers if keys[offer.pk] not in fragments]
+        if missing:
+            rendered = {keys[offer.pk]: item for offer, item in zip(missing, super().to_representation(missing))}
+            offer_fragment_cache.set_many(rendered)
+            fragments.update(rendered)
+        return [fragments[keys[offer.pk]] for offer in offers]
+
+
+class OfferSerializer(SparseFieldsetMixin, OfferDetailExpansionMixin, BatchLoadedRelationsMixin, OfferAggregateMixin, serializers.ModelSerializer):
     """
     Serializer for the offer list view.
 
@@ -51,8 +155,20 @@ class OfferSerializer(serializers.ModelSerializer):
     - Hyperlinks to offer details
     - Aggregations across details (min_price, min_delivery_time)
     - Selected user data (user_details) for UI display
+
+    Supports sparse fieldsets (`?fields=` / `?omit=`, see core.fieldsets)
+    and inline packages (`?expand=details`).
+    The owners of a page are loaded with one query (see core.loaders),
+    list pages are assembled from cached per-offer fragments.
     """
 
+    sparse_field_sources = {
+        "min_price": ("min_price",),
+        "min_delivery_time": ("min_delivery_time",),
+        "user_details": ("user",),
+    }
+    batch_loaded_relations = {"user": ("users", ("user_details",))}
+
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     details = OfferDetailHyperlinkedSerializer(many=True)
 
@@ -75,16 +191,7 @@ class OfferSerializer(serializers.ModelSerializer):
             "min_delivery_time",
             "user_details",
         ]
-
-    def get_min_price(self, obj):
-        """Calculates the minimum price across all OfferDetails."""
-        prices = obj.details.values_list("price", flat=True)
-        return min(prices) if prices else None
-
-    def get_min_delivery_time(self, obj):
-        """Calculates the minimum delivery time across all OfferDetails."""
-        delivery_time = obj.details.values_list("delivery_time_in_days", flat=True)
-        return min(delivery_time) if delivery_time else None
+        list_serializer_class = OfferFragmentListSerializer
 
     def get_user_details(self, obj):
         """
@@ -93,6 +200,8 @@ class OfferSerializer(serializers.ModelSerializer):
         Note:
         - For full profile data, using UserProfile would often be preferable.
           Here, only basic User fields are returned.
+        - `user` is resolved by the request's batch loader
+          (one query per page).
         """
         user = obj.user
         return {
@@ -138,13 +247,13 @@ class OfferSerializerPostPatch(serializers.ModelSerializer):
         """
         Validates the details list.
 
-        On POST:
+        On POST (or with `require_full_details` in the context, e.g. imports):
         - Exactly 3 details must be provided.
         - offer_type must contain exactly: basic, standard, premium (one each).
         """
         request = self.context.get("request")
 
-        if request and request.method == "POST":
+        if self.context.get("require_full_details") or (request and request.method == "POST"):
             if len(value) != 3:
                 raise serializers.ValidationError("Exactly 3 OfferDetails must be provided.")
 
@@ -164,10 +273,9 @@ class OfferSerializerPostPatch(serializers.ModelSerializer):
         - Validation is intentionally based on UserProfile,
           not on user.is_staff or similar flags.
         """
-        user = self.context["request"].user
-        try:
-            profile = UserProfile.objects.get(user=user)
-        except UserProfile.DoesNotExist:
+        request = self.context["request"]
+        profile = get_profile(request, request.user)
+        if profile is None:
             raise serializers.ValidationError("UserProfile not found.")
 
         if profile.type != UserProfile.UserType.BUSINESS:
@@ -181,13 +289,21 @@ class OfferSerializerPostPatch(serializers.ModelSerializer):
 
         Performance:
         - OfferDetails are created using bulk_create.
+        - bulk_create bypasses signals, so the denormalized
+          aggregates, the feature index, the change log and the
+          catalog version are refreshed explicitly.
         """
         details_data = validated_data.pop("details")
         offer = Offer.objects.create(**validated_data)
 
-        OfferDetail.objects.bulk_create(
+        details = OfferDetail.objects.bulk_create(
             [OfferDetail(offer=offer, **d) for d in details_data]
         )
+        OfferFeature.objects.sync(details)
+        offer.refresh_aggregates()
+        # after the details exist, so a sync in between sees the offer again
+        OfferChange.objects.record([offer.pk])
+        bump_catalog_version()
         return offer
 
     def update(self, instance, validated_data):
@@ -212,7 +328,18 @@ class OfferSerializerPostPatch(serializers.ModelSerializer):
         Expectations:
         - Each detail object in the payload must include offer_type.
         - The existing detail with the matching offer_type is updated.
+
+        Performance:
+        - All details of the offer are loaded at once (prefetched by the
+          view, otherwise one query) and written with a single
+          bulk_update touching only the changed fields.
+        - bulk_update bypasses signals, so aggregates, the feature
+          index (only if features changed), the change log and the
+          catalog version are refreshed explicitly.
         """
+        existing = {detail.offer_type: detail for detail in instance.details.all()}
+        changed, changed_fields = [], set()
+
         for d in details:
             offer_type = d.get("offer_type")
             if not offer_type:
@@ -220,27 +347,135 @@ class OfferSerializerPostPatch(serializers.ModelSerializer):
                     {"details": "offer_type is required for updating a detail."}
                 )
 
-            try:
-                detail_obj = instance.details.get(offer_type=offer_type)
-            except OfferDetail.DoesNotExist:
+            detail_obj = existing.get(offer_type)
+            if detail_obj is None:
                 raise serializers.ValidationError(
                     {"details": f"No OfferDetail with offer_type='{offer_type}' found for this offer."}
                 )
 
-            for field, value in d.items():
-                if field != "offer_type":
-                    setattr(detail_obj, field, value)
+            fields = apply_changes(detail_obj, d, exclude=["offer_type"])
+            if fields:
+                changed.append(detail_obj)
+                changed_fields.update(fields)
 
-            detail_obj.save()
+        if changed:
+            OfferDetail.objects.bulk_update(changed, sorted(changed_fields))
+            if "features" in changed_fields:
+                OfferFeature.objects.sync(changed)
+            instance.refresh_aggregates()
+            OfferChange.objects.record([instance.pk])
+            bump_catalog_version()
 
 
-class OfferSingleSerializer(serializers.ModelSerializer):
+class OfferImportSerializer(OfferSerializerPostPatch):
+    """
+    Validates a single record of a bulk offer import.
+
+    - Same payload shape and rules as OfferSerializerPostPatch (POST).
+    - Without `user`: the owner is validated once by the importer
+      instead of once per record.
+    """
+
+    user = None
+
+    class Meta(OfferSerializerPostPatch.Meta):
+        fields = ["title", "image", "description", "details"]
+
+
+class OfferBulkDetailPatchSerializer(serializers.Serializer):
+    """Price / delivery change for one package of an offer."""
+
+    offer_type = serializers.ChoiceField(choices=OfferDetail.OfferType.choices)
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    delivery_time_in_days = serializers.IntegerField(min_value=1, required=False)
+
+
+class OfferBulkPatchItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    details = OfferBulkDetailPatchSerializer(many=True, allow_empty=False)
+
+
+class OfferBulkPatchSerializer(serializers.Serializer):
+    """
+    Input of PATCH /offers/bulk/.
+
+    Example:
+    {"offers": [{"id": 1, "details": [{"offer_type": "basic", "price": 90}]}]}
+    """
+
+    offers = OfferBulkPatchItemSerializer(many=True, allow_empty=False, max_length=500)
+
+    def validate_offers(self, value):
+        ids = [item["id"] for item in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each offer may only appear once.")
+        return value
+
+    @transaction.atomic
+    def apply(self, user):
+        """
+        Applies all changes in one transaction.
+
+        Queries:
+        - 1 ownership check for all offers
+        - 1 load of all affected details
+        - 1 bulk_update (changed fields only) + 1 aggregate refresh
+
+        Raises PermissionDenied if any offer is missing or not owned by `user`.
+        """
+        items = self.validated_data["offers"]
+        ids = [item["id"] for item in items]
+
+        owned = set(Offer.objects.filter(pk__in=ids, user=user).values_list("pk", flat=True))
+        foreign = sorted(set(ids) - owned)
+        if foreign:
+            raise PermissionDenied(f"Offers not found or not owned: {foreign}")
+
+        details = {
+            (detail.offer_id, detail.offer_type): detail
+            for detail in OfferDetail.objects.filter(offer_id__in=ids)
+        }
+        changed, changed_fields = {}, set()
+
+        for item in items:
+            for d in item["details"]:
+                detail_obj = details.get((item["id"], d["offer_type"]))
+                if detail_obj is None:
+                    raise serializers.ValidationError(
+                        {"offers": f"Offer {item['id']} has no '{d['offer_type']}' detail."}
+                    )
+                fields = apply_changes(detail_obj, d, exclude=["offer_type"])
+                if fields:
+                    changed[detail_obj.pk] = detail_obj
+                    changed_fields.update(fields)
+
+        if changed:
+            OfferDetail.objects.bulk_update(changed.values(), sorted(changed_fields))
+            if "features" in changed_fields:
+                OfferFeature.objects.sync(changed.values())
+            touched = {detail.offer_id for detail in changed.values()}
+            Offer.objects.filter(pk__in=touched).refresh_aggregates(touch=True)
+            OfferChange.objects.record(sorted(touched))
+            bump_catalog_version()
+
+        return {"offers": len(ids), "details_updated": len(changed)}
+
+
+class OfferImportRequestSerializer(serializers.Serializer):
+    """Input of the staff-only bulk import endpoint (multipart upload)."""
+
+    file = serializers.FileField()
+    user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
+    batch_size = serializers.IntegerField(required=False, min_value=1, max_value=5000)
+
+
+class OfferSingleSerializer(OfferDetailExpansionMixin, OfferAggregateMixin, serializers.ModelSerializer):
     """
     Serializer for retrieving a single Offer.
 
     Includes:
     - Core offer data
-    - Hyperlinks to OfferDetails
+    - Hyperlinks to OfferDetails (full packages with `?expand=details`)
     - Aggregated values (min_price, min_delivery_time)
     """
 
@@ -264,18 +499,107 @@ class OfferSingleSerializer(serializers.ModelSerializer):
             "updated_at"
         ]
 
-    def get_min_price(self, obj):
-        """Calculates the minimum price across all OfferDetails."""
-        prices = obj.details.values_list("price", flat=True)
-        return min(prices) if prices else None
 
-    def get_min_delivery_time(self, obj):
-        """Calculates the minimum delivery time across all OfferDetails."""
-        delivery_time = obj.details.values_list("delivery_time_in_days", flat=True)
-        return min(delivery_time) if delivery_time else None
+class OfferSimilarSerializer(OfferAggregateMixin, serializers.ModelSerializer):
+    """
+    Compact offer card for the similar offers list.
+
+    Only reads Offer columns, so the whole list is hydrated with one query.
+    `score` is the cosine similarity stored in the index.
+    """
+
+    min_price = serializers.SerializerMethodField()
+    min_delivery_time = serializers.SerializerMethodField()
+    score = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Offer
+        fields = ["id", "title", "image", "min_price", "min_delivery_time", "score"]
+
+    def get_score(self, obj):
+        return round(self.context["scores"][obj.pk], 4)
+
+
+class OfferSuggestSerializer(serializers.Serializer):
+    """Validates `?q=` (typed text) and `?limit=` for title autocomplete."""
+
+    q = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(required=False, default=10, min_value=1, max_value=20)
+
+
+class OfferChangesSerializer(serializers.Serializer):
+    """Validates `?since=<token>` (blank: from the start) and `?limit=` for delta sync."""
+
+    since = serializers.CharField(required=False, allow_blank=True)
+    limit = serializers.IntegerField(required=False, default=DEFAULT_LIMIT, min_value=1, max_value=MAX_LIMIT)
+
+    def validate_since(self, value):
+        if not value:
+            return 0
+        try:
+            return decode_token(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+
+
+class OfferDetailBatchSerializer(serializers.Serializer):
+    """
+    Validates `?ids=1,2,3` for the offer detail batch endpoint.
+
+    - ids are de-duplicated (order preserved)
+    - at most `max_ids` distinct ids per request
+    """
+
+    max_ids = 300
+
+    ids = serializers.CharField()
+
+    def validate_ids(self, value):
+        try:
+            ids = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+        except ValueError:
+            raise serializers.ValidationError("ids must be a comma separated list of integers.")
+
+        if not ids:
+            raise serializers.ValidationError("At least one id is required.")
+        if len(ids) > self.max_ids:
+            raise serializers.ValidationError(f"At most {self.max_ids} ids per request.")
+        return ids
+
 
 class OfferFilterSerializer(serializers.Serializer):
+    creator_id = serializers.IntegerField(required=False)
     max_delivery_time = serializers.IntegerField(required=False, min_value=0)
     min_price = serializers.IntegerField(required=False, min_value=0)
+    offer_type = serializers.ChoiceField(required=False, choices=OfferDetail.OfferType.choices)
+    max_price = serializers.IntegerField(required=False, min_value=0)
+    delivery_time_from = serializers.IntegerField(required=False, min_value=0)
+    delivery_time_to = serializers.IntegerField(required=False, min_value=0)
+    feature = serializers.CharField(required=False, allow_blank=True, max_length=255)
     search = serializers.CharField(required=False, allow_blank=True)
-    page_size = serializers.IntegerField(required=False, min_value=1)
\ No newline at end of file
+    page_size = serializers.IntegerField(required=False, min_value=1)
+    facets = serializers.CharField(required=False, allow_blank=True)
+
+    def validate_feature(self, value):
+        """Normalized like the OfferFeature terms; blank means no filter."""
+        return normalize_feature(value) or None
+
+    def validate_facets(self, value):
+        """Parses `price,delivery_time` into a list of facet names."""
+        try:
+            return parse_facets(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+
+    def validate(self, attrs):
+        """
+        `min_delivery_time` reads like the offer's min_delivery_time field
+        but would be a package-level filter; rejected instead of being
+        ignored (which would return the unfiltered catalog).
+        """
+        if "min_delivery_time" in self.initial_data:
+            raise serializers.ValidationError({
+                "min_delivery_time": "Not a filter; use delivery_time_from / delivery_time_to "
+                                     "(package delivery time in days, together with offer_type / max_price)."
+            })
+        return attrs
\ No newline at end of file
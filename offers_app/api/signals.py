@@ -0,0 +1,104 @@
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from offers_app.api.cache import bump_catalog_version, offer_fragment_cache
+from offers_app.api.search import install_fts, missing_fts_triggers
+from offers_app.models import Offer, OfferChange, OfferDetail, OfferFeature
+
+# User fields rendered in the offer list (OfferSerializer.user_details)
+OWNER_FRAGMENT_FIELDS = {"first_name", "last_name", "username"}
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def refresh_offer_aggregates(sender, instance, **kwargs):
+    """
+    Keeps the denormalized aggregates on Offer in sync
+    whenever a single OfferDetail is saved or deleted.
+
+    Note:
+    - bulk_create / bulk_update / queryset.update() bypass signals;
+      those paths call Offer.refresh_aggregates() explicitly.
+    - Skipped when the offer itself is being deleted (cascade).
+    """
+    origin = kwargs.get("origin")
+    if isinstance(origin, Offer) or getattr(origin, "model", None) is Offer:
+        return
+
+    instance.offer.refresh_aggregates()
+
+
+@receiver(post_save, sender=OfferDetail)
+def sync_offer_features(sender, instance, **kwargs):
+    """
+    Keeps the OfferFeature rows of a single saved OfferDetail in sync
+    (deletes cascade; bulk paths call OfferFeature.objects.sync()).
+    """
+    OfferFeature.objects.sync([instance])
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def invalidate_catalog_cache(sender, instance, **kwargs):
+    """
+    Bumps the catalog version on every Offer / OfferDetail write,
+    invalidating cached counts and pages of the offer list.
+    """
+    bump_catalog_version()
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def record_offer_change(sender, instance, **kwargs):
+    """
+    Appends to the delta sync log (OfferChange): a deleted offer leaves
+    a tombstone, any other write marks the offer as changed.
+
+    Note:
+    - Details deleted along with their offer are covered by its tombstone.
+    - Bulk paths call OfferChange.objects.record() explicitly.
+    """
+    if sender is Offer:
+        OfferChange.objects.record([instance.pk], deleted=kwargs["signal"] is post_delete)
+        return
+
+    origin = kwargs.get("origin")
+    if isinstance(origin, Offer) or getattr(origin, "model", None) is Offer:
+        return
+    OfferChange.objects.record([instance.offer_id])
+
+
+@receiver(post_save, sender=User)
+def invalidate_owner_fragments(sender, instance, created, update_fields=None, **kwargs):
+    """
+    A renamed user changes `user_details` of all their offers
+    without touching Offer.updated_at; drops those fragments and,
+    if the user owns offers, bumps the catalog version so cached list
+    pages and list ETags change too.
+    Saves of other fields only (e.g. last_login) are ignored.
+    """
+    if created or (update_fields is not None and not OWNER_FRAGMENT_FIELDS & set(update_fields)):
+        return
+    offer_fragment_cache.bump_owner(instance.pk)
+    if Offer.objects.filter(user_id=instance.pk).exists():
+        bump_catalog_version()
+
+
+@receiver(post_migrate)
+def restore_offer_search_triggers(sender, using="default", **kwargs):
+    """
+    SQLite drops the FTS sync triggers when a migration remakes the
+    offer table; re-creates them and rebuilds the search index.
+    No-op if the triggers are intact or there is no FTS5 table.
+    """
+    if sender.name != "offers_app":
+        return
+    connection = connections[using]
+    if missing_fts_triggers(connection):
+        install_fts(connection)
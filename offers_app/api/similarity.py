@@ -0,0 +1,366 @@
+import bisect
+import heapq
+import math
+import mmap
+import os
+import re
+import struct
+import tempfile
+import threading
+from array import array
+from collections import Counter, defaultdict
+
+from django.conf import settings
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+"""
+Precomputed "similar offers" index.
+
+Build (offline, see `python manage.py build_offer_similarity_index`):
+- Every offer becomes an L2-normalized TF-IDF vector over its title
+  (boosted) and description.
+- Cosine similarities are accumulated through an inverted index, very
+  common terms are skipped, and the top-k neighbours per offer are kept.
+- With NumPy the scores are computed for blocks of offers at once (one
+  sparse x sparse product per block, summed with bincount) and the top-k
+  are picked with argpartition; without it a pure Python loop is used.
+
+Storage (native byte order, memory-mapped read-only by every worker):
+
+    header    magic "OSIM", format, k, count, built_at (microseconds)
+    ids       uint32 x count            sorted offer ids
+    neighbours uint32 x count x k       0 = empty slot
+    scores    float32 x count x k
+
+A lookup is a binary search over `ids` plus one slice of the
+neighbour / score sections; nothing is parsed or loaded up front.
+"""
+
+MAGIC = b"OSIM"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("=4sIIIq")
+
+DEFAULT_K = 10
+TITLE_BOOST = 2.0
+# Terms in more than this share of all offers carry no signal
+# (small catalogs keep terms up to the absolute cap).
+MAX_DOCUMENT_FREQUENCY = 0.2
+MIN_DOCUMENT_FREQUENCY_CAP = 10
+
+_TOKEN_RE = re.compile(r"\w\w+", re.UNICODE)
+
+
+def index_path():
+    return settings.OFFER_SIMILARITY_INDEX
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+# Building
+
+def build_vectors(documents):
+    """
+    documents: {offer_id: (title, description)}
+    Returns {offer_id: {term: weight}} (L2-normalized TF-IDF).
+    """
+    term_counts = {}
+    document_frequency = Counter()
+    for offer_id, (title, description) in documents.items():
+        counts = Counter()
+        for token in tokenize(title):
+            counts[token] += TITLE_BOOST
+        for token in tokenize(description):
+            counts[token] += 1
+        term_counts[offer_id] = counts
+        document_frequency.update(counts.keys())
+
+    total = len(documents)
+    max_df = max(MIN_DOCUMENT_FREQUENCY_CAP, int(total * MAX_DOCUMENT_FREQUENCY))
+    idf = {
+        term: math.log((1 + total) / (1 + df)) + 1
+        for term, df in document_frequency.items()
+        if df <= max_df
+    }
+
+    vectors = {}
+    for offer_id, counts in term_counts.items():
+        vector = {term: (1 + math.log(count)) * idf[term] for term, count in counts.items() if term in idf}
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors[offer_id] = {term: weight / norm for term, weight in vector.items()} if norm else {}
+    return vectors
+
+
+# Score cells (block rows x offers) accumulated per block: 4M float64 = 32 MB.
+BLOCK_CELLS = 4_000_000
+
+
+def nearest_neighbours(vectors, offer_ids, k=DEFAULT_K):
+    """
+    Returns {offer_id: [(neighbour_id, score), ...]} for `offer_ids`,
+    best first (ties: lower id first), computed through an inverted
+    index (only offers sharing a term are ever compared).
+    """
+    if np is not None:
+        return _nearest_neighbours_blocked(vectors, offer_ids, k)
+    return _nearest_neighbours_python(vectors, offer_ids, k)
+
+
+def _nearest_neighbours_blocked(vectors, offer_ids, k):
+    """
+    NumPy variant: the vectors become CSR (rows = offers) and CSC (rows =
+    terms) arrays; each block of query rows is multiplied with the CSC
+    postings into a dense (block x offers) score matrix, so the work per
+    block is a handful of array operations instead of a Python loop per
+    posting entry.
+    """
+    ids = np.array(sorted(vectors), dtype=np.int64)
+    count = len(ids)
+    queries = [offer_id for offer_id in offer_ids if offer_id in vectors]
+    if not count or not queries:
+        return {offer_id: [] for offer_id in offer_ids}
+
+    terms = {}
+    rows, columns, weights = [], [], []
+    for row, offer_id in enumerate(ids.tolist()):
+        for term, weight in vectors[offer_id].items():
+            rows.append(row)
+            columns.append(terms.setdefault(term, len(terms)))
+            weights.append(weight)
+    rows = np.array(rows, dtype=np.int64)
+    columns = np.array(columns, dtype=np.int64)
+    weights = np.array(weights, dtype=np.float64)
+
+    # CSR: the terms of one offer
+    row_ptr = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=count), out=row_ptr[1:])
+    # CSC: the offers of one term (postings)
+    order = np.argsort(columns, kind="stable")
+    term_ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(columns, minlength=len(terms)), out=term_ptr[1:])
+    posting_rows, posting_weights = rows[order], weights[order]
+
+    result = {offer_id: [] for offer_id in offer_ids}
+    query_rows = np.searchsorted(ids, queries)
+    block_size = max(1, BLOCK_CELLS // count)
+    for start in range(0, len(query_rows), block_size):
+        block = query_rows[start:start + block_size]
+        scores = _block_scores(block, count, row_ptr, columns, weights, term_ptr, posting_rows, posting_weights)
+        scores[np.arange(len(block)), block] = 0.0  # not its own neighbour
+
+        top, top_scores = _top_k(scores, ids, k)
+        for row, neighbours, neighbour_scores in zip(block.tolist(), top.tolist(), top_scores.tolist()):
+            result[int(ids[row])] = [
+                (neighbour, score) for neighbour, score in zip(neighbours, neighbour_scores) if score > 0
+            ]
+    return result
+
+
+def _block_scores(block, count, row_ptr, columns, weights, term_ptr, posting_rows, posting_weights):
+    """Dense cosine scores of the offers in `block` against all offers."""
+    # nonzeros (local row, term, weight) of the block rows
+    lengths = row_ptr[block + 1] - row_ptr[block]
+    entries = _ranges(row_ptr[block], lengths)
+    local_rows = np.repeat(np.arange(len(block)), lengths)
+    entry_terms, entry_weights = columns[entries], weights[entries]
+
+    # expand every nonzero into the postings of its term
+    posting_lengths = term_ptr[entry_terms + 1] - term_ptr[entry_terms]
+    postings = _ranges(term_ptr[entry_terms], posting_lengths)
+    cells = np.repeat(local_rows, posting_lengths) * count + posting_rows[postings]
+    products = np.repeat(entry_weights, posting_lengths) * posting_weights[postings]
+    return np.bincount(cells, weights=products, minlength=len(block) * count).reshape(len(block), count)
+
+
+def _ranges(starts, lengths):
+    """Concatenated aranges [start, start + length) as one index array."""
+    total = int(lengths.sum())
+    if not total:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total)
+
+
+def _top_k(scores, ids, k):
+    """
+    (neighbour ids, scores) of the k best columns per row, best first,
+    lower id first on equal scores. argpartition selects the k columns
+    in linear time; only those k are sorted.
+    """
+    if scores.shape[1] > k:
+        columns = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        columns = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    top_scores = np.take_along_axis(scores, columns, axis=1)
+    order = np.lexsort((ids[columns], -top_scores), axis=-1)
+    columns = np.take_along_axis(columns, order, axis=1)
+    return ids[columns], np.take_along_axis(top_scores, order, axis=1)
+
+
+def _nearest_neighbours_python(vectors, offer_ids, k):
+    postings = defaultdict(list)
+    for offer_id, vector in vectors.items():
+        for term, weight in vector.items():
+            postings[term].append((offer_id, weight))
+
+    result = {}
+    for offer_id in offer_ids:
+        scores = defaultdict(float)
+        for term, weight in vectors.get(offer_id, {}).items():
+            for other_id, other_weight in postings[term]:
+                scores[other_id] += weight * other_weight
+        scores.pop(offer_id, None)
+        result[offer_id] = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+    return result
+
+
+def merge_neighbours(current, changed, removed, k=DEFAULT_K):
+    """
+    Incremental update of an existing neighbour table.
+
+    - current: {offer_id: [(neighbour_id, score)]} read from the index
+    - changed: freshly computed rows of new / modified offers
+    - removed: ids of deleted offers
+
+    Unchanged offers drop neighbours that were removed or changed and
+    take the changed offers' (symmetric) scores as new candidates.
+    """
+    stale = set(changed) | set(removed)
+    candidates = defaultdict(list)
+    for offer_id, neighbours in changed.items():
+        for neighbour_id, score in neighbours:
+            candidates[neighbour_id].append((offer_id, score))
+
+    merged = {}
+    for offer_id, neighbours in current.items():
+        if offer_id in stale:
+            continue
+        rows = [(n, s) for n, s in neighbours if n not in stale] + candidates.get(offer_id, [])
+        merged[offer_id] = heapq.nlargest(k, rows, key=lambda item: (item[1], -item[0]))
+
+    merged.update(changed)
+    return merged
+
+
+def write_index(path, table, k=DEFAULT_K, built_at=0):
+    """
+    Writes {offer_id: [(neighbour_id, score)]} atomically to `path`.
+
+    The file is replaced via os.replace, so workers that still map the
+    old file keep a consistent view until they reopen it.
+    """
+    ids = array("I", sorted(table))
+    neighbours = array("I", [0]) * (len(ids) * k)
+    scores = array("f", [0.0]) * (len(ids) * k)
+    for row, offer_id in enumerate(ids):
+        for slot, (neighbour_id, score) in enumerate(table[offer_id][:k]):
+            neighbours[row * k + slot] = neighbour_id
+            scores[row * k + slot] = score
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(HEADER.pack(MAGIC, FORMAT_VERSION, k, len(ids), built_at))
+        ids.tofile(handle)
+        neighbours.tofile(handle)
+        scores.tofile(handle)
+    os.replace(tmp_path, path)
+
+
+# Reading
+
+class SimilarityIndex:
+    """
+    Read-only, memory-mapped view of an index file.
+
+    close() unmaps the file; lookups on a closed index return None
+    (a lock keeps close() from running in the middle of a lookup).
+    """
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self.closed = False
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.k, self.count, self.built_at = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not an offer similarity index.")
+
+        view = self._view = memoryview(self._mmap)
+        offset = HEADER.size
+        ids_end = offset + 4 * self.count
+        neighbours_end = ids_end + 4 * self.count * self.k
+        self.ids = view[offset:ids_end].cast("I")
+        self.neighbours = view[ids_end:neighbours_end].cast("I")
+        self.scores = view[neighbours_end:neighbours_end + 4 * self.count * self.k].cast("f")
+
+    def __contains__(self, offer_id):
+        return self.lookup(offer_id) is not None
+
+    def lookup(self, offer_id):
+        """[(neighbour_id, score), ...] best first, or None if not indexed (or closed)."""
+        with self._lock:
+            if self.closed:
+                return None
+            row = self._row(offer_id)
+            if row is None:
+                return None
+            start = row * self.k
+            return [
+                (neighbour_id, score)
+                for neighbour_id, score in zip(
+                    self.neighbours[start:start + self.k], self.scores[start:start + self.k]
+                )
+                if neighbour_id
+            ]
+
+    def close(self):
+        """Releases the memory views and unmaps the file."""
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            for view in (self.ids, self.neighbours, self.scores, self._view):
+                view.release()
+            self._mmap.close()
+
+    def table(self):
+        """Full neighbour table (used for incremental rebuilds)."""
+        return {offer_id: self.lookup(offer_id) for offer_id in self.ids}
+
+    def _row(self, offer_id):
+        if not 0 < offer_id < 2 ** 32:
+            return None
+        row = bisect.bisect_left(self.ids, offer_id)
+        return row if row < self.count and self.ids[row] == offer_id else None
+
+
+_open_indexes = {}
+
+
+def get_similarity_index(path=None):
+    """
+    Returns the per-process SimilarityIndex for `path` or None if the
+    file does not exist. A rebuilt file (new mtime) is mapped again and
+    the previous mapping is closed.
+    """
+    path = str(path or index_path())
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    cached = _open_indexes.get(path)
+    if cached is None or cached[0] != mtime:
+        previous = cached
+        cached = (mtime, SimilarityIndex(path))
+        _open_indexes[path] = cached
+        if previous is not None:
+            previous[1].close()
+    return cached[1]
@@ -0,0 +1,195 @@
+import bisect
+import heapq
+import re
+import unicodedata
+from datetime import timedelta
+from itertools import islice
+
+from django.db.models import PositiveBigIntegerField, Value
+from django.db.models.functions import Coalesce
+
+from offers_app.api.versioned import VersionedIndex
+from offers_app.models import Offer
+
+"""
+Prefix autocomplete for offer titles (GET /offers/suggest/?q=).
+
+In-process index, one per worker:
+- tokens:   sorted list of normalized title tokens (range queries via bisect)
+- postings: token -> offer ids, best first (popularity desc, id desc)
+
+A query resolves the range of tokens starting with the typed prefix and
+merges their postings lazily until N distinct offers are found. Wide
+ranges (very short prefixes) are answered once and then cached until
+the index changes, so every request stays within a few milliseconds.
+
+Popularity signal: the offer's own OfferPopularity.score (views + detail
+opens, see offers_app.api.popularity), read whenever the offer is pulled
+and on the periodic full rebuild; newer offers win ties through their id.
+
+Freshness follows the catalog version like the catalog engine: changed
+offers are pulled incrementally from an updated_at high-water mark,
+deletions (count mismatch) and the rebuild interval trigger a full load.
+
+Concurrency (see offers_app.api.versioned): a published SuggestState is
+never changed; updates copy the maps, rebuild only the changed postings
+and swap the new state in. Full rebuilds run in the background
+(OFFER_SUGGEST_BACKGROUND_RELOAD).
+"""
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize(text):
+    """Lowercase, accents stripped: 'Café Logo' -> 'cafe logo'."""
+    decomposed = unicodedata.normalize("NFKD", (text or "").lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(normalize(text))
+
+
+class SuggestState:
+    """Sorted token table over offer titles with ranked prefix lookups."""
+
+    # Prefix ranges wider than this many tokens are cached per prefix.
+    wide_range = 256
+    cached_results = 100
+
+    def __init__(self, tokens=(), postings=None, titles=None, scores=None, offer_tokens=None,
+                 high_water=None, loaded=False):
+        self.tokens = tokens
+        self.postings = postings or {}
+        self.titles = titles or {}
+        self.scores = scores or {}
+        self.offer_tokens = offer_tokens or {}
+        self.high_water = high_water
+        self.loaded = loaded
+        # filled lazily by queries on this state only
+        self._wide_cache = {}
+
+    def __len__(self):
+        return len(self.titles)
+
+    def updated(self, rows):
+        """
+        Returns a new state with the offers of `rows`
+        ((id, title, updated_at, score) tuples) upserted.
+
+        Only the postings of tokens an offer gained or lost are rebuilt;
+        all other postings are shared with this state.
+        """
+        postings, titles = dict(self.postings), dict(self.titles)
+        scores, offer_tokens = dict(self.scores), dict(self.offer_tokens)
+        high_water = self.high_water
+        removed, added = {}, {}
+        for pk, title, updated_at, score in rows:
+            for token in offer_tokens.get(pk, ()):
+                removed.setdefault(token, set()).add(pk)
+            tokens = frozenset(tokenize(title))
+            titles[pk], scores[pk], offer_tokens[pk] = title, score, tokens
+            for token in tokens:
+                added.setdefault(token, []).append(pk)
+            if high_water is None or updated_at > high_water:
+                high_water = updated_at
+
+        def rank(pk):
+            return -scores[pk], -pk
+
+        vocabulary_changed = False
+        for token in removed.keys() | added.keys():
+            dropped = removed.get(token, ())
+            ids = [pk for pk in postings.get(token, ()) if pk not in dropped] + added.get(token, [])
+            vocabulary_changed |= bool(ids) != (token in postings)
+            if ids:
+                postings[token] = tuple(sorted(ids, key=rank))
+            else:
+                postings.pop(token, None)
+
+        tokens = sorted(postings) if vocabulary_changed else self.tokens
+        return SuggestState(tokens, postings, titles, scores, offer_tokens, high_water, loaded=True)
+
+    def _rank(self, pk):
+        return -self.scores[pk], -pk
+
+    # Querying
+
+    def suggest(self, query, limit=10):
+        """Returns [(offer id, title)] for titles matching `query`, best first."""
+        words = tokenize(query)
+        if not words:
+            return []
+        *complete, prefix = words
+
+        if complete:
+            ids = self._with_words(complete, prefix, limit)
+        else:
+            ids = islice(self._ranked(prefix), limit)
+        return [(pk, self.titles[pk]) for pk in ids]
+
+    def _with_words(self, complete, prefix, limit):
+        """Multi-word queries: offers having every complete word, then the prefix."""
+        candidates = set.intersection(*(set(self.postings.get(word, ())) for word in complete))
+        hits = (
+            pk for pk in candidates
+            if any(token.startswith(prefix) for token in self.offer_tokens[pk])
+        )
+        return heapq.nsmallest(limit, hits, key=self._rank)
+
+    def _ranked(self, prefix):
+        """Offer ids having a token that starts with `prefix`, best first."""
+        start = bisect.bisect_left(self.tokens, prefix)
+        end = bisect.bisect_left(self.tokens, prefix + "\uffff", start)
+
+        if end - start > self.wide_range:
+            if prefix not in self._wide_cache:
+                self._wide_cache[prefix] = list(islice(self._merge(self.tokens[start:end]), self.cached_results))
+            return self._wide_cache[prefix]
+        return self._merge(self.tokens[start:end])
+
+    def _merge(self, tokens):
+        seen = set()
+        for pk in heapq.merge(*(self.postings[token] for token in tokens), key=self._rank):
+            if pk not in seen:
+                seen.add(pk)
+                yield pk
+
+
+class OfferSuggestIndex(VersionedIndex):
+    """Keeps the published SuggestState in step with the catalog."""
+
+    background_setting = "OFFER_SUGGEST_BACKGROUND_RELOAD"
+    thread_name = "offer-suggest-reload"
+    label = "offer suggest index"
+    rebuild_interval = 60 * 10
+    overlap = timedelta(seconds=5)
+
+    def empty_state(self):
+        return SuggestState()
+
+    def load_state(self):
+        return SuggestState().updated(self._rows(Offer.objects.all()))
+
+    def update_state(self, state):
+        state = state.updated(self._rows(self._changed_since(state.high_water)))
+        return state, len(state) != Offer.objects.count()
+
+    def _changed_since(self, high_water):
+        if high_water is None:
+            return Offer.objects.all()
+        return Offer.objects.filter(updated_at__gte=high_water - self.overlap)
+
+    @staticmethod
+    def _rows(queryset):
+        score = Coalesce("popularity__score", Value(0), output_field=PositiveBigIntegerField())
+        return queryset.values_list("id", "title", "updated_at", score).iterator()
+
+    # Querying
+
+    def suggest(self, query, limit=10):
+        """Returns [(offer id, title)] for titles matching `query`, best first."""
+        return self._state.suggest(query, limit)
+
+
+offer_suggest_index = OfferSuggestIndex()
@@ -1,17 +1,19 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
-from offers_app.api.views import OfferViewSet, OfferdetailSingleView
+from offers_app.api.views import OfferViewSet, OfferdetailBatchView, OfferdetailSingleView
 
 """
 Routing configuration for offer-related endpoints.
 
 - /offers/ → Full CRUD functionality provided by the OfferViewSet (via router)
 - /offerdetails/<pk>/ → Retrieve a single OfferDetail instance
+- /offerdetails/?ids=1,2,3 → Retrieve many OfferDetails in one request
 """
 router = DefaultRouter()
 router.register("offers", OfferViewSet, basename="offers")
 
 urlpatterns = [
     path("", include(router.urls)),
+    path("offerdetails/", OfferdetailBatchView.as_view(), name="offerdetail-batch"),
     path("offerdetails/<int:pk>/", OfferdetailSingleView.as_view(), name="offerdetail-detail"),
 ]
\ No newline at end of file
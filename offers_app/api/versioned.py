@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from offers_app.api.cache import get_catalog_version
+
+"""
+Base for in-process indexes that follow the catalog version
+(catalog engine, title autocomplete).
+
+- One version of an index is a state object that is never changed once
+  published. Updates build the next state off to the side and publish
+  it with a single attribute assignment, so a reader that took one
+  reference to the state never sees a half-applied update.
+- refresh() is cheap while the catalog version is unchanged; otherwise
+  the subclass pulls the changes incrementally.
+- Full reloads (other than the very first load) run in a background
+  thread, at most one at a time; requests keep using the current state
+  until the new one is swapped in. A settings flag per index turns this
+  off (reload inline, used by the tests).
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class VersionedIndex:
+    """
+    Keeps a published state in step with the catalog version.
+
+    Subclasses implement:
+    - empty_state(): the unloaded state (`loaded` is False)
+    - load_state(): a fully loaded state
+    - update_state(state): (new state, stale) with the changes since
+      `state` applied; stale=True schedules a full reload
+    """
+
+    # settings flag: full reloads in a background thread (default True)
+    background_setting = None
+    thread_name = "offer-index-reload"
+    label = "offer index"
+    # seconds after which a full reload is scheduled; None = never
+    rebuild_interval = None
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drops the state; the next refresh() loads it from scratch."""
+        self._state = self.empty_state()
+        self._reloading = False
+        self.version = None
+        self.loaded_at = 0.0
+
+    def __len__(self):
+        return len(self._state)
+
+    @property
+    def background_reload(self):
+        return getattr(settings, self.background_setting, True)
+
+    def refresh(self):
+        """Brings the state up to date (cheap if the catalog is unchanged)."""
+        version = get_catalog_version()
+        expired = self._expired()
+        if version == self.version and not expired:
+            return
+
+        stale = expired
+        with self._lock:
+            if not self._state.loaded:
+                # first use: nothing to serve from yet
+                self._state = self.load_state()
+                self.loaded_at = time.monotonic()
+                stale = False
+            elif version != self.version:
+                self._state, changed_stale = self.update_state(self._state)
+                stale = stale or changed_stale
+            self.version = version
+        if stale:
+            self.invalidate()
+
+    def invalidate(self):
+        """
+        Schedules a full reload. Runs in a background thread (at most
+        one at a time); readers keep using the current state meanwhile.
+        """
+        if not self.background_reload:
+            self._reload()
+            return
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload_in_background, name=self.thread_name, daemon=True).start()
+
+    def _expired(self):
+        return (
+            self.rebuild_interval is not None
+            and not self._reloading
+            and time.monotonic() - self.loaded_at > self.rebuild_interval
+        )
+
+    def _reload(self):
+        # read before loading: writes during the load bump the version
+        # again and are picked up by the next incremental refresh
+        version = get_catalog_version()
+        state = self.load_state()
+        with self._lock:
+            self._state = state
+            self.version = version
+            self.loaded_at = time.monotonic()
+
+    def _reload_in_background(self):
+        try:
+            self._reload()
+        except Exception:
+            logger.exception("Could not reload the %s.", self.label)
+        finally:
+            self._reloading = False
+            # the thread's own connection, not a request's
+            connection.close()
+
+    def empty_state(self):
+        raise NotImplementedError
+
+    def load_state(self):
+        raise NotImplementedError
+
+    def update_state(self, state):
+        raise NotImplementedError
@@ -1,64 +1,279 @@
+from functools import partial
+
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from core.conditional import ConditionalGetMixin, make_etag
+from core.fieldsets import SparseFieldsetViewMixin
+from django.db.models import Max
+from offers_app.api.cache import list_version, normalize_query, offer_list_cache
+from offers_app.api.catalog import offer_catalog
+from offers_app.api.changes import changes_since, encode_token
+from offers_app.api.facets import compute_facets
+from offers_app.api.filters import OfferFilterPlanner, OfferOrderingFilter
+from offers_app.api.importer import OfferImporter, OfferImportError
 from offers_app.api.pagination import OfferPagination
 from offers_app.api.permissions import OfferPermission
+from offers_app.api.popularity import popularity_buffer
+from offers_app.api.search import OfferSearchFilter
+from offers_app.api.similarity import get_similarity_index
+from offers_app.api.suggest import offer_suggest_index
 from offers_app.models import Offer, OfferDetail
-from offers_app.api.serializers import OfferDetailSerializer, OfferFilterSerializer, OfferSerializer, OfferSerializerPostPatch, OfferSingleSerializer
+from offers_app.api.serializers import OfferBulkPatchSerializer, OfferDetailBatchSerializer, OfferDetailSerializer, OfferFilterSerializer, OfferImportRequestSerializer, OfferChangesSerializer, OfferSerializer, OfferSerializerPostPatch, OfferSimilarSerializer, OfferSingleSerializer, OfferSuggestSerializer
 from rest_framework.generics import RetrieveAPIView,RetrieveUpdateDestroyAPIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Min, Max
-from rest_framework.filters import OrderingFilter, SearchFilter
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
+from django.shortcuts import get_object_or_404
+
+def _validator(model, pk, field):
+    """
+    Loads a single validator value (e.g. updated_at) of `model` row `pk`
+    with one query. Returns None for missing rows or malformed ids
+    (filter() already raises for those); the regular retrieve path then
+    produces the 404.
+    """
+    try:
+        return model.objects.filter(pk=pk).values_list(field, flat=True).first()
+    except (TypeError, ValueError):
+        return None
+
 
-class OfferViewSet(ModelViewSet):
+class OfferViewSet(SparseFieldsetViewMixin, ConditionalGetMixin, ModelViewSet):
     """
     ViewSet for Offers (CRUD).
 
     Features:
     - Authentication required (IsAuthenticated)
     - Pagination via OfferPagination
-    - Search by title/description
-    - Ordering (e.g., updated_at, min_price)
+    - Versioned response cache for list pages (GET /offers/cache-stats/)
+    - Conditional GET (ETag / Last-Modified) for list and retrieve
+    - Full-text search by title/description (FTS5, see OfferSearchFilter)
+    - Ordering (e.g., updated_at, min_price, relevance when searching,
+      popularity from write-behind view counters)
     - Query parameter filters:
         - creator_id: offers created by a specific user
         - min_price: minimum package price >= X
         - max_delivery_time: minimum delivery time <= X
+        - feature: a package lists this feature (case-insensitive, via OfferFeature)
+        - offer_type / max_price / delivery_time_from / delivery_time_to: one
+          package of this type costs <= X and takes between Y and Z days
+          (all on the same package)
+    - Facet counts per price / delivery time band (`?facets=`)
+    - Sparse fieldsets on the list (`?fields=` / `?omit=`)
+    - Similar offers from a precomputed index (GET /offers/<id>/similar/)
+    - Title autocomplete from an in-memory prefix index (GET /offers/suggest/?q=)
+    - Optional in-memory catalog engine for filter/sort (OFFER_CATALOG_ENGINE)
+    - Inline packages on list and retrieve (`?expand=details`)
+    - Delta sync with tombstones (GET /offers/changes/?since=<token>)
     """
 
     queryset = Offer.objects.all()
     permission_classes = [OfferPermission]
 
     pagination_class = OfferPagination
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OfferOrderingFilter, OfferSearchFilter]
 
     search_fields = ["title", "description"]
 
     ordering_fields = ["updated_at", "min_price"]
     ordering = ["updated_at"]
 
+    # Keyset cursors are built from these columns.
+    sparse_required_fields = ("updated_at", "min_price")
+
     def list(self, request, *args, **kwargs):
-        filter_serializer = OfferFilterSerializer(data=request.query_params)
-        filter_serializer.is_valid(raise_exception=True)
-        filters = filter_serializer.validated_data
-        queryset = self.get_queryset()
-
-        if "max_delivery_time" in filters:
-            queryset = queryset.filter(
-                details__delivery_time_in_days__lte=filters["max_delivery_time"]
-            )
+        """
+        Validates the query parameters (400 on invalid values);
+        filtering itself happens in get_queryset() (OfferFilterPlanner)
+        and OfferSearchFilter.
+
+        Pages are served from the versioned response cache (OfferListCache).
+        """
+        facets = self.filter_data.get("facets")
 
-        if "min_price" in filters:
-            queryset = queryset.filter(
-                details__price__gte=filters["min_price"]
+        render = partial(
+            offer_list_cache.get_or_render,
+            request,
+            partial(self._render_list, request, facets, *args, **kwargs),
+        )
+        return self.conditional_get(request, render, etag=self._list_etag(request))
+
+    def _render_list(self, request, facets, *args, **kwargs):
+        """Builds the list page and adds facet counts if requested (`?facets=`)."""
+        response = self._catalog_list(request) or super().list(request, *args, **kwargs)
+        if facets:
+            response.data["facets"] = compute_facets(
+                self.filter_queryset(self.get_queryset()), facets
             )
+        return response
+
+    def _catalog_list(self, request):
+        """
+        Serves the page from the in-memory catalog engine if enabled and
+        applicable (see OfferCatalog.plan); returns None otherwise.
+
+        The engine only selects the page ids, the ORM hydrates those rows.
+        The SQL filters are applied again, so a stale snapshot can make a
+        page shorter but never wrong; a background reload is scheduled then.
+        """
+        plan = offer_catalog.plan(request, self.filter_data)
+        if plan is None:
+            return None
+
+        ids = self.paginator.paginate_catalog(
+            lambda offset, limit: offer_catalog.search(offset, limit, **plan), request
+        )
+        rows = self.filter_queryset(self.get_queryset()).filter(pk__in=ids).order_by().in_bulk()
+        page = [rows[pk] for pk in ids if pk in rows]
+        if len(page) != len(ids):
+            offer_catalog.invalidate()
 
-        if "search" in filters:
-            queryset = queryset.filter(title__icontains=filters["search"])
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Returns a single offer; answers 304 if the client's
+        ETag / Last-Modified (derived from updated_at) still match.
 
-        self.queryset = queryset
+        The view is counted in the in-process popularity buffer
+        (no write on the request path, see offers_app.api.popularity).
+        """
+        updated_at = _validator(Offer, kwargs["pk"], "updated_at")
+        if updated_at is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        popularity_buffer.record_view(kwargs["pk"])
+        return self.conditional_get(
+            request,
+            partial(super().retrieve, request, *args, **kwargs),
+            etag=make_etag("offer", kwargs["pk"], updated_at, request.scheme, request.get_host()),
+            last_modified=updated_at,
+        )
+
+    def _list_etag(self, request):
+        """
+        ETag for list pages: catalog-wide max(updated_at) (an index lookup,
+        no COUNT), the catalog version (also changes on deletes; plus the
+        popularity generation for `?ordering=popularity`), scheme and host
+        (absolute detail URLs) and the query string.
+        """
+        last_update = Offer.objects.aggregate(last_update=Max("updated_at"))["last_update"]
+        return make_etag(
+            "offers",
+            last_update,
+            list_version(request.query_params),
+            request.scheme,
+            request.get_host(),
+            normalize_query(request.query_params),
+        )
+
+    @action(detail=False, methods=["patch"], url_path="bulk")
+    def bulk_patch(self, request):
+        """
+        Applies price / delivery changes to many owned offers in one transaction.
+
+        Payload: {"offers": [{"id": 1, "details": [{"offer_type": "basic", "price": 90}]}]}
+        """
+        serializer = OfferBulkPatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(serializer.apply(request.user), status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["post"], url_path="import", parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        """
+        Streams a JSONL upload (`file`) into offers owned by `user` (staff only).
+
+        Returns the import report (created, failed, per-line errors, rows/sec).
+        """
+        serializer = OfferImportRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            importer = OfferImporter(data["user"], batch_size=data.get("batch_size"))
+        except OfferImportError as exc:
+            raise ValidationError({"user": str(exc)})
+
+        return Response(importer.run(data["file"]), status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=["get"], url_path="similar")
+    def similar(self, request, pk=None):
+        """
+        Related offers from the precomputed similarity index
+        (build_offer_similarity_index), best match first.
 
-        return super().list(request, *args, **kwargs)
+        One index lookup (memory-mapped, no query) and one hydration
+        query; offers missing from the index yield an empty list.
+        """
+        try:
+            offer_id = int(pk)
+        except ValueError:
+            raise NotFound()
+
+        index = get_similarity_index()
+        neighbours = index.lookup(offer_id) if index is not None else None
+        if neighbours is None:
+            get_object_or_404(Offer.objects.only("id"), pk=pk)
+            neighbours = []
+
+        scores = dict(neighbours)
+        offers = Offer.objects.only(*OfferSimilarSerializer.Meta.fields[:-1]).in_bulk(scores)
+        results = [offers[offer_id] for offer_id, _ in neighbours if offer_id in offers]
+
+        serializer = OfferSimilarSerializer(results, many=True, context={"scores": scores})
+        return Response(serializer.data)
+
+    @action(detail=False, methods=["get"], url_path="suggest")
+    def suggest(self, request):
+        """
+        Title autocomplete for the search box, most popular first.
+
+        Served from the per-process prefix index (offers_app.api.suggest);
+        no query runs unless the catalog version changed.
+        """
+        serializer = OfferSuggestSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        offer_suggest_index.refresh()
+        matches = offer_suggest_index.suggest(serializer.validated_data["q"], serializer.validated_data["limit"])
+        return Response([{"id": offer_id, "title": title} for offer_id, title in matches])
+
+    @action(detail=False, methods=["get"], url_path="changes")
+    def changes(self, request):
+        """
+        Offers created, updated or deleted after `?since=<token>`
+        (see offers_app.api.changes), in change sequence order.
+
+        Response: {token, has_more, updated: [list representation], deleted: [ids]};
+        the returned token is passed as `since` on the next call.
+        Queries: one for the change log, one hydration (+ details prefetch).
+        """
+        params = OfferChangesSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        rows, sequence, has_more = changes_since(
+            params.validated_data.get("since", 0), params.validated_data["limit"]
+        )
+
+        updated_ids = [row["offer_id"] for row in rows if not row["deleted"]]
+        offers = self.get_queryset().in_bulk(updated_ids)
+        # an offer deleted meanwhile is skipped, its tombstone follows later
+        serializer = self.get_serializer([offers[pk] for pk in updated_ids if pk in offers], many=True)
+        return Response({
+            "token": encode_token(sequence),
+            "has_more": has_more,
+            "updated": serializer.data,
+            "deleted": [row["offer_id"] for row in rows if row["deleted"]],
+        })
+
+    @action(detail=False, methods=["get"], url_path="cache-stats")
+    def cache_stats(self, request):
+        """Hit/miss counters of the offer list cache (staff only)."""
+        return Response(offer_list_cache.stats())
     
     def get_serializer_class(self):
         """
@@ -75,41 +290,84 @@ class OfferViewSet(ModelViewSet):
 
     def get_queryset(self):
         """
-        Adds aggregation annotations for filtering/ordering
-        and applies query parameter filters.
-        """
-        queryset = super().get_queryset()
+        Applies the query parameter filters (see OfferFilterPlanner).
 
-        creator_id = self.request.query_params.get("creator_id")
-        min_price = self.request.query_params.get("min_price")
-        max_delivery_time = self.request.query_params.get("max_delivery_time")
+        Performance:
+        - All filters are planned into one query: min_price /
+          min_delivery_time are denormalized columns on Offer, so
+          filtering and ordering are served by indexes (no join, no GROUP BY).
+        - `details` are prefetched and the owners are batch loaded by
+          OfferSerializer, so the read serializers run in a fixed number
+          of queries per page.
+        """
+        queryset = super().get_queryset().prefetch_related("details")
+        if self.action != "list":
+            return queryset
+        return OfferFilterPlanner(self.filter_data).apply(queryset)
 
-        queryset = queryset.annotate(
-            min_price=Min("details__price"),
-            min_delivery_time=Min("details__delivery_time_in_days"),
-        )
+    @property
+    def filter_data(self):
+        """Validated list query parameters (400 on invalid values)."""
+        if not hasattr(self, "_filter_data"):
+            filter_serializer = OfferFilterSerializer(data=self.request.query_params)
+            filter_serializer.is_valid(raise_exception=True)
+            self._filter_data = filter_serializer.validated_data
+        return self._filter_data
 
-        return self._apply_filters(queryset, creator_id, min_price, max_delivery_time)
 
-    def _apply_filters(self, queryset, creator_id, min_price, max_delivery_time):
-        """Applies optional query parameter filters."""
-        if creator_id:
-            queryset = queryset.filter(user=creator_id)
+class OfferdetailSingleView(ConditionalGetMixin, RetrieveAPIView):
+    """
+    Returns a single OfferDetail by its ID.
+    Primarily referenced via hyperlinks from OfferSerializer.
 
-        if min_price:
-            queryset = queryset.filter(min_price__gte=min_price)
+    OfferDetail has no timestamp of its own; detail writes bump the
+    parent offer's updated_at, which therefore serves as validator.
+    """
+    queryset = OfferDetail.objects.all()
+    serializer_class = OfferDetailSerializer
+    permission_classes = [IsAuthenticated]
 
-        if max_delivery_time:
-            queryset = queryset.filter(min_delivery_time__lte=max_delivery_time)
+    def get(self, request, *args, **kwargs):
+        updated_at = _validator(OfferDetail, kwargs["pk"], "offer__updated_at")
+        if updated_at is None:
+            return self.retrieve(request, *args, **kwargs)
 
-        return queryset
+        popularity_buffer.record_detail_open(kwargs["pk"])
+        return self.conditional_get(
+            request,
+            partial(self.retrieve, request, *args, **kwargs),
+            etag=make_etag("offerdetail", kwargs["pk"], updated_at),
+            last_modified=updated_at,
+        )
 
 
-class OfferdetailSingleView(RetrieveAPIView):
+class OfferdetailBatchView(APIView):
     """
-    Returns a single OfferDetail by its ID.
-    Primarily referenced via hyperlinks from OfferSerializer.
+    Returns many OfferDetails at once: GET /offerdetails/?ids=1,2,3
+
+    Offer responses only reference details via {id, url}; this endpoint
+    replaces one request per package with a single round trip.
+
+    Response:
+    - Object keyed by id with the OfferDetailSerializer shape,
+      unknown ids map to null.
+    - Same access rules as OfferdetailSingleView (IsAuthenticated).
+
+    Performance:
+    - One `id IN (...)` query, capped at OfferDetailBatchSerializer.max_ids.
     """
-    queryset = OfferDetail.objects.all()
-    serializer_class = OfferDetailSerializer
+
     permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = OfferDetailBatchSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        ids = params.validated_data["ids"]
+
+        details = OfferDetail.objects.in_bulk(ids)
+        return Response(
+            {
+                str(pk): OfferDetailSerializer(details[pk]).data if pk in details else None
+                for pk in ids
+            }
+        )
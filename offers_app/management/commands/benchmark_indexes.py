@@ -0,0 +1,215 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Min
+
+from auth_app.models import UserProfile
+from offers_app.api.filters import OfferFilterPlanner
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Orders
+from reviews_app.models import Review
+
+# Indexes added for the hot filter / ordering paths (index pack).
+BENCHMARKED_INDEXES = [
+    (Offer, "offer_user_updated_idx"),
+    (OfferDetail, "offerdetail_offer_price_idx"),
+    (OfferDetail, "offerdetail_offer_days_idx"),
+    (OfferDetail, "offerdetail_type_price_idx"),
+    (Orders, "orders_business_status_idx"),
+    (Orders, "orders_customer_created_idx"),
+    (Review, "review_business_updated_idx"),
+    (UserProfile, "userprofile_type_idx"),
+]
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the hot endpoint queries with and without the index pack.
+
+    Workflow:
+    1) Seeds a realistic volume (default: 100k offers, 1M orders)
+    2) Drops the benchmarked indexes and times every query
+    3) Recreates the indexes and times them again
+
+    Everything runs inside one transaction that is rolled back,
+    so the database is left unchanged.
+
+    Usage:
+        python manage.py benchmark_indexes
+        python manage.py benchmark_indexes --offers 10000 --orders 100000
+    """
+
+    help = "Measures endpoint query times before/after the index pack."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=2000, help="Business and customer users each.")
+        parser.add_argument("--offers", type=int, default=100_000)
+        parser.add_argument("--orders", type=int, default=1_000_000)
+        parser.add_argument("--reviews", type=int, default=50_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(42)
+        self.batch_size = options["batch_size"]
+
+        with transaction.atomic():
+            started = time.monotonic()
+            self._seed(options)
+            self.stdout.write(f"Seeded in {time.monotonic() - started:.1f}s")
+
+            self._drop_indexes()
+            before = self._measure(options["repeat"])
+            self._create_indexes()
+            after = self._measure(options["repeat"])
+
+            self._report(before, after)
+            transaction.set_rollback(True)
+
+    # Seeding
+
+    def _seed(self, options):
+        businesses = self._create_users("bench_business", options["users"], UserProfile.UserType.BUSINESS)
+        customers = self._create_users("bench_customer", options["users"], UserProfile.UserType.CUSTOMER)
+        self.business_ids = [u.pk for u in businesses]
+        self.customer_ids = [u.pk for u in customers]
+
+        self._seed_offers(options["offers"])
+        self._seed_orders(options["orders"])
+        self._seed_reviews(options["reviews"])
+        connection.cursor().execute("ANALYZE")
+
+    def _create_users(self, prefix, count, user_type):
+        users = User.objects.bulk_create(
+            [User(username=f"{prefix}_{i}", password="!") for i in range(count)],
+            batch_size=self.batch_size,
+        )
+        UserProfile.objects.bulk_create(
+            [UserProfile(user=user, email=f"{user.username}@example.com", type=user_type) for user in users],
+            batch_size=self.batch_size,
+        )
+        return users
+
+    def _seed_offers(self, count):
+        for start in range(0, count, self.batch_size):
+            offers = Offer.objects.bulk_create(
+                [
+                    Offer(user_id=self.rng.choice(self.business_ids), title=f"Offer {i}", description="Benchmark")
+                    for i in range(start, min(start + self.batch_size, count))
+                ]
+            )
+            OfferDetail.objects.bulk_create(
+                [
+                    OfferDetail(
+                        offer=offer,
+                        title=offer_type,
+                        revisions=1,
+                        delivery_time_in_days=self.rng.randint(1, 30),
+                        price=Decimal(self.rng.randint(10, 2000)),
+                        offer_type=offer_type,
+                    )
+                    for offer in offers
+                    for offer_type in ("basic", "standard", "premium")
+                ]
+            )
+        Offer.objects.refresh_aggregates()
+
+    def _seed_orders(self, count):
+        statuses = list(Orders.StatusType.values)
+        for start in range(0, count, self.batch_size):
+            Orders.objects.bulk_create(
+                [
+                    Orders(
+                        customer_user_id=self.rng.choice(self.customer_ids),
+                        business_user_id=self.rng.choice(self.business_ids),
+                        title="Order",
+                        revisions=1,
+                        delivery_time_in_days=5,
+                        price=Decimal("100.00"),
+                        offer_type="basic",
+                        status=self.rng.choice(statuses),
+                    )
+                    for _ in range(start, min(start + self.batch_size, count))
+                ]
+            )
+
+    def _seed_reviews(self, count):
+        pairs = {
+            (self.rng.choice(self.customer_ids), self.rng.choice(self.business_ids))
+            for _ in range(count)
+        }
+        Review.objects.bulk_create(
+            [
+                Review(reviewer_id=reviewer, business_user_id=business, rating=self.rng.randint(1, 5), description="-")
+                for reviewer, business in pairs
+            ],
+            batch_size=self.batch_size,
+        )
+
+    # Measuring
+
+    def _scenarios(self):
+        business = self.business_ids[len(self.business_ids) // 2]
+        customer = self.customer_ids[len(self.customer_ids) // 2]
+        offer = Offer.objects.filter(user_id=business).values_list("pk", flat=True).first()
+
+        return [
+            ("GET /offers/?creator_id= (newest first)",
+             lambda: list(Offer.objects.filter(user_id=business).order_by("-updated_at")[:10])),
+            ("OfferDetail cheapest package of an offer",
+             lambda: OfferDetail.objects.filter(offer_id=offer).order_by("price").first()),
+            ("OfferDetail fastest delivery of an offer",
+             lambda: OfferDetail.objects.filter(offer_id=offer).aggregate(Min("delivery_time_in_days"))),
+            ("GET /offers/ package type + price + days",
+             lambda: self._page_and_count(
+                 OfferFilterPlanner({"offer_type": "standard", "max_price": 100, "delivery_time_to": 5})
+                 .apply(Offer.objects.all())
+             )),
+            ("GET /order-count/<id>/",
+             lambda: Orders.objects.filter(business_user_id=business, status=Orders.StatusType.IN_PROGRESS).count()),
+            ("Orders of a customer (newest first)",
+             lambda: list(Orders.objects.filter(customer_user_id=customer).order_by("-created_at")[:20])),
+            ("GET /reviews/?business_user_id=",
+             lambda: list(Review.objects.filter(business_user_id=business).order_by("-updated_at"))),
+            ("GET /profiles/business/ (count)",
+             lambda: UserProfile.objects.filter(type=UserProfile.UserType.BUSINESS).count()),
+        ]
+
+    def _page_and_count(self, queryset):
+        return list(queryset.order_by("updated_at", "id")[:10]), queryset.count()
+
+    def _measure(self, repeat):
+        """Returns {label: best time in ms} over `repeat` runs."""
+        results = {}
+        for label, query in self._scenarios():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                query()
+                timings.append(time.perf_counter() - started)
+            results[label] = min(timings) * 1000
+        return results
+
+    def _drop_indexes(self):
+        with connection.cursor() as cursor:
+            for _, name in BENCHMARKED_INDEXES:
+                cursor.execute(f"DROP INDEX IF EXISTS {connection.ops.quote_name(name)}")
+
+    def _create_indexes(self):
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model, name in BENCHMARKED_INDEXES:
+                index = next(i for i in model._meta.indexes if i.name == name)
+                cursor.execute(str(index.create_sql(model, editor)))
+            cursor.execute("ANALYZE")
+
+    def _report(self, before, after):
+        self.stdout.write(f"{'query':<45} {'before':>10} {'after':>10} {'speedup':>8}")
+        for label, before_ms in before.items():
+            after_ms = after[label]
+            speedup = before_ms / after_ms if after_ms else float("inf")
+            self.stdout.write(f"{label:<45} {before_ms:>8.2f}ms {after_ms:>8.2f}ms {speedup:>7.1f}x")
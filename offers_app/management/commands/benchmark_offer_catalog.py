@@ -0,0 +1,124 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from offers_app.api.catalog import OfferCatalogSnapshot, np
+from offers_app.models import Offer
+
+SCENARIOS = [
+    ("newest first", {"ordering": "-updated_at"}),
+    ("cheapest first", {"ordering": "min_price"}),
+    ("min_price >= 500, cheapest", {"min_price": 500, "ordering": "min_price"}),
+    ("delivery <= 3, newest", {"max_delivery_time": 3, "ordering": "-updated_at"}),
+    ("creator + min_price", {"creator_id": None, "min_price": 100, "ordering": "-min_price"}),
+]
+
+
+class Command(BaseCommand):
+    """
+    Compares the in-memory catalog engine with the SQL path.
+
+    Workflow:
+    1) Seeds `--offers` offers (default 1M) with aggregate columns set
+    2) Builds the snapshot (full load time is reported)
+    3) Times page id selection + total count per scenario for both paths
+
+    Everything runs inside one transaction that is rolled back.
+
+    Usage:
+        python manage.py benchmark_offer_catalog
+        python manage.py benchmark_offer_catalog --offers 100000 --page 50
+    """
+
+    help = "Benchmarks the NumPy catalog engine against the SQL list path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--offers", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--page", type=int, default=1)
+        parser.add_argument("--page-size", type=int, default=10)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        if np is None:
+            raise CommandError("numpy is required for the catalog engine.")
+
+        with transaction.atomic():
+            started = time.monotonic()
+            user_ids = self._seed(options)
+            self.stdout.write(f"Seeded {options['offers']} offers in {time.monotonic() - started:.1f}s")
+
+            snapshot = OfferCatalogSnapshot()
+            started = time.monotonic()
+            snapshot.refresh()
+            self.stdout.write(f"Snapshot loaded in {time.monotonic() - started:.1f}s")
+
+            offset = (options["page"] - 1) * options["page_size"]
+            limit = options["page_size"]
+
+            self.stdout.write(f"{'scenario':<30} {'sql':>10} {'engine':>10} {'speedup':>8}")
+            for label, params in SCENARIOS:
+                params = {**params}
+                if "creator_id" in params:
+                    params["creator_id"] = user_ids[0]
+
+                sql_ms = self._best(options["repeat"], lambda: self._sql_page(params, offset, limit))
+                engine_ms = self._best(
+                    options["repeat"], lambda: snapshot.search(offset=offset, limit=limit, **params)
+                )
+                self.stdout.write(
+                    f"{label:<30} {sql_ms:>8.2f}ms {engine_ms:>8.2f}ms {sql_ms / engine_ms:>7.1f}x"
+                )
+
+            transaction.set_rollback(True)
+
+    def _seed(self, options):
+        rng = random.Random(42)
+        users = User.objects.bulk_create(
+            [User(username=f"bench_catalog_{i}", password="!") for i in range(options["users"])]
+        )
+        user_ids = [user.pk for user in users]
+
+        count, batch_size = options["offers"], options["batch_size"]
+        for start in range(0, count, batch_size):
+            Offer.objects.bulk_create(
+                [
+                    Offer(
+                        user_id=rng.choice(user_ids),
+                        title=f"Offer {i}",
+                        description="Benchmark",
+                        min_price=Decimal(rng.randint(10, 2000)),
+                        max_price=Decimal(2000),
+                        min_delivery_time=rng.randint(1, 30),
+                    )
+                    for i in range(start, min(start + batch_size, count))
+                ]
+            )
+        return user_ids
+
+    def _sql_page(self, params, offset, limit):
+        """Page ids + total count as the SQL list path computes them."""
+        queryset = Offer.objects.all()
+        if params.get("creator_id"):
+            queryset = queryset.filter(user_id=params["creator_id"])
+        if params.get("min_price") is not None:
+            queryset = queryset.filter(min_price__gte=params["min_price"])
+        if params.get("max_delivery_time") is not None:
+            queryset = queryset.filter(min_delivery_time__lte=params["max_delivery_time"])
+
+        queryset = queryset.order_by(params["ordering"], "id")
+        ids = list(queryset.values_list("id", flat=True)[offset: offset + limit])
+        return ids, queryset.count()
+
+    def _best(self, repeat, run):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return min(timings) * 1000
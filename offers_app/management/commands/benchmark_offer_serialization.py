@@ -0,0 +1,96 @@
+import timeit
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.loaders import BatchLoadingListSerializer
+from offers_app.api.serializers import OfferSerializer
+from offers_app.models import Offer, OfferDetail
+
+
+class PlainOfferDetailHyperlinkedSerializer(serializers.HyperlinkedModelSerializer):
+    """Baseline: DRF's default hyperlinking (one reverse() per detail)."""
+
+    class Meta:
+        model = OfferDetail
+        fields = ["id", "url"]
+
+
+class UncachedOfferSerializer(OfferSerializer):
+    """OfferSerializer without the per-offer fragment cache."""
+
+    class Meta(OfferSerializer.Meta):
+        list_serializer_class = BatchLoadingListSerializer
+
+
+class PlainOfferSerializer(UncachedOfferSerializer):
+    details = PlainOfferDetailHyperlinkedSerializer(many=True)
+
+
+class Command(BaseCommand):
+    """
+    Micro-benchmark for offer list serialization.
+
+    Serializes in-memory offers (no database access) with the default
+    DRF hyperlinks ("before"), the request-scoped URL templates ("after")
+    and from warm per-offer fragments ("cached") and reports the time
+    per 100 offers.
+
+    Usage:
+        python manage.py benchmark_offer_serialization --offers 100 --repeat 50
+    """
+
+    help = "Measures OfferSerializer time per 100 offers, before/after URL templates and fragments."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--offers", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        offers = self._build_offers(options["offers"])
+        per_100 = 100 / len(offers)
+
+        variants = (
+            ("before", PlainOfferSerializer),
+            ("after", UncachedOfferSerializer),
+            ("cached", OfferSerializer),
+        )
+        for label, serializer_class in variants:
+            seconds = min(
+                timeit.repeat(
+                    lambda: self._serialize(serializer_class, offers),
+                    number=1,
+                    repeat=options["repeat"],
+                )
+            )
+            self.stdout.write(f"{label:>6}: {seconds * per_100 * 1000:.2f} ms per 100 offers")
+
+    def _serialize(self, serializer_class, offers):
+        # A fresh request per run, like a real list response.
+        request = Request(APIRequestFactory().get("/api/offers/", HTTP_HOST="localhost"))
+        return serializer_class(offers, many=True, context={"request": request}).data
+
+    def _build_offers(self, count):
+        """Creates unsaved offers with three prefetched details each."""
+        user = User(id=1, username="bench", first_name="Bench", last_name="Mark")
+        now = timezone.now()
+        offers = []
+        for i in range(1, count + 1):
+            offer = Offer(
+                id=i, user=user, title=f"Offer {i}", description="Benchmark",
+                created_at=now, updated_at=now,
+                min_price=Decimal("50.00"), min_delivery_time=3,
+            )
+            offer._prefetched_objects_cache = {
+                "details": [
+                    OfferDetail(id=i * 3 + n, offer=offer, offer_type=offer_type)
+                    for n, offer_type in enumerate(("basic", "standard", "premium"))
+                ]
+            }
+            offers.append(offer)
+        return offers
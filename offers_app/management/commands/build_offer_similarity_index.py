@@ -0,0 +1,86 @@
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from offers_app.api.similarity import (
+    DEFAULT_K,
+    SimilarityIndex,
+    build_vectors,
+    index_path,
+    merge_neighbours,
+    nearest_neighbours,
+    write_index,
+)
+from offers_app.models import Offer
+
+# Re-read offers modified shortly before the last build (late commits).
+OVERLAP = timedelta(minutes=1)
+
+
+class Command(BaseCommand):
+    """
+    Builds the "similar offers" index (see offers_app.api.similarity).
+
+    Modes:
+    - incremental (default if an index exists): only offers changed since
+      the last build get new neighbour lists, deleted offers are dropped
+      and the changed offers enter the other lists as candidates.
+    - --full: recomputes every neighbour list (also picks up IDF drift).
+
+    Usage:
+        python manage.py build_offer_similarity_index
+        python manage.py build_offer_similarity_index --full --k 20
+    """
+
+    help = "Builds or updates the memory-mapped similar offers index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Rebuild all neighbour lists.")
+        parser.add_argument("--k", type=int, default=DEFAULT_K, help="Neighbours per offer.")
+        parser.add_argument("--path", default=None, help="Index file (default: OFFER_SIMILARITY_INDEX).")
+
+    def handle(self, *args, **options):
+        path = str(options["path"] or index_path())
+        k = options["k"]
+        started = time.monotonic()
+        built_at = timezone.now()
+
+        documents = {
+            pk: (title, description)
+            for pk, title, description in Offer.objects.values_list("id", "title", "description").iterator()
+        }
+        vectors = build_vectors(documents)
+
+        current = self._current_index(path, k, options["full"])
+        if current is None:
+            table = nearest_neighbours(vectors, documents, k)
+            mode = "full"
+        else:
+            since = datetime.fromtimestamp(current.built_at / 1_000_000, tz=dt_timezone.utc) - OVERLAP
+            existing = current.table()
+            current.close()
+            changed_ids = set(Offer.objects.filter(updated_at__gte=since).values_list("id", flat=True))
+            changed_ids |= set(documents) - set(existing)
+            removed = set(existing) - set(documents)
+
+            changed = nearest_neighbours(vectors, changed_ids, k)
+            table = merge_neighbours(existing, changed, removed, k)
+            mode = f"incremental ({len(changed_ids)} changed, {len(removed)} removed)"
+
+        write_index(path, table, k, built_at=int(built_at.timestamp() * 1_000_000))
+        self.stdout.write(self.style.SUCCESS(
+            f"Similarity index for {len(table)} offer(s) written to {path}: "
+            f"{mode}, {time.monotonic() - started:.1f}s."
+        ))
+
+    def _current_index(self, path, k, full):
+        """The existing index if it can be updated incrementally."""
+        if full:
+            return None
+        try:
+            index = SimilarityIndex(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return index if index.k == k else None
@@ -0,0 +1,51 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from offers_app.api.importer import OfferImporter, OfferImportError
+
+
+class Command(BaseCommand):
+    """
+    Streams offers from a JSON Lines file into the database.
+
+    Each line is one offer in the POST /api/offers/ payload shape.
+
+    Usage:
+        python manage.py import_offers offers.jsonl --user 5
+        cat offers.jsonl | python manage.py import_offers - --user 5 --batch-size 1000
+    """
+
+    help = "Bulk imports offers (JSON Lines) for a business user."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Path to the JSONL file or '-' for stdin.")
+        parser.add_argument("--user", type=int, required=True, help="ID of the business user owning the offers.")
+        parser.add_argument("--batch-size", type=int, default=OfferImporter.default_batch_size)
+
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(pk=options["user"])
+            importer = OfferImporter(owner, batch_size=options["batch_size"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} does not exist.")
+        except OfferImportError as exc:
+            raise CommandError(str(exc))
+
+        if options["path"] == "-":
+            report = importer.run(sys.stdin.buffer)
+        else:
+            # bytes: the importer decodes per line and reports bad encodings
+            with open(options["path"], "rb") as lines:
+                report = importer.run(lines)
+
+        for error in report["errors"]:
+            self.stderr.write(f"line {error['line']}: {error['errors']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report['created']} offer(s), {report['failed']} failed "
+                f"in {report['seconds']}s ({report['rows_per_second']} rows/s)."
+            )
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.models import OfferChange
+
+
+class Command(BaseCommand):
+    """
+    Compacts the delta sync log (OfferChange).
+
+    Only changes superseded by a later change of the same offer are
+    removed; the latest change per offer (and every tombstone that is
+    the latest) stays, so all issued sync tokens remain valid.
+
+    Usage:
+        python manage.py prune_offer_changes
+    """
+
+    help = "Removes superseded rows from the offer change log."
+
+    def handle(self, *args, **options):
+        deleted, _ = OfferChange.objects.superseded().delete()
+        self.stdout.write(self.style.SUCCESS(f"Removed {deleted} superseded change(s)."))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.api.cache import bump_catalog_version, offer_fragment_cache
+from offers_app.api.catalog import reset_catalog_snapshots
+from offers_app.models import Offer, OfferChange
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the denormalized aggregates on Offer
+    (min_price, max_price, min_delivery_time) from OfferDetail.
+
+    Usage:
+        python manage.py rebuild_offer_aggregates
+        python manage.py rebuild_offer_aggregates --offer 12 --offer 13
+    """
+
+    help = "Recomputes min_price, max_price and min_delivery_time for offers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--offer",
+            action="append",
+            type=int,
+            dest="offer_ids",
+            help="Only rebuild the given offer id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Offer.objects.all()
+        if options["offer_ids"]:
+            queryset = queryset.filter(pk__in=options["offer_ids"])
+
+        changed = list(queryset.stale_aggregates().values_list("pk", flat=True))
+        updated = queryset.refresh_aggregates()
+        if changed:
+            # updated_at is not touched: incremental snapshot refreshes, the
+            # per-offer fragments and delta sync clients would miss it.
+            # Only repaired offers are logged, so sync clients do not
+            # download the whole catalog after every maintenance run.
+            reset_catalog_snapshots()
+            offer_fragment_cache.invalidate()
+            OfferChange.objects.record(changed)
+            bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt aggregates for {updated} offer(s), {len(changed)} changed."
+        ))
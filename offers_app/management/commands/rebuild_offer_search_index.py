@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from offers_app.api.search import install_fts
+
+
+class Command(BaseCommand):
+    """
+    (Re)creates the FTS5 offer search index and its sync triggers,
+    then rebuilds the index from the offer table.
+
+    Usage:
+        python manage.py rebuild_offer_search_index
+    """
+
+    help = "Rebuilds the SQLite FTS5 index used by offer search."
+
+    def handle(self, *args, **options):
+        if not install_fts(connection):
+            self.stdout.write(self.style.WARNING("FTS5 is not available, search uses LIKE fallback."))
+            return
+
+        self.stdout.write(self.style.SUCCESS("Offer search index rebuilt."))
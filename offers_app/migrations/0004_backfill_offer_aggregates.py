@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Max, Min, OuterRef, Subquery
+
+
+def backfill_offer_aggregates(apps, schema_editor):
+    """Fills the denormalized detail aggregates for existing offers."""
+    Offer = apps.get_model("offers_app", "Offer")
+    OfferDetail = apps.get_model("offers_app", "OfferDetail")
+
+    def aggregate(function, field):
+        return Subquery(
+            OfferDetail.objects.filter(offer=OuterRef("pk"))
+            .order_by()
+            .values("offer")
+            .annotate(value=function(field))
+            .values("value")[:1]
+        )
+
+    Offer.objects.update(
+        min_price=aggregate(Min, "price"),
+        max_price=aggregate(Max, "price"),
+        min_delivery_time=aggregate(Min, "delivery_time_in_days"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_offer_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_offer_aggregates, migrations.RunPython.noop),
+    ]
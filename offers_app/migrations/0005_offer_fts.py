@@ -0,0 +1,80 @@
+from django.db import migrations
+
+# The SQL is spelled out here on purpose: a migration must keep creating
+# the same schema even if offers_app.api.search changes later.
+# offers_app.api.signals.restore_offer_search_triggers re-creates the
+# triggers after migrations that remake offers_app_offer (SQLite drops
+# a table's triggers when Django rebuilds it).
+FTS_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS offers_app_offer_fts USING fts5(
+        title,
+        description,
+        content='offers_app_offer',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS offers_app_offer_fts_ai AFTER INSERT ON offers_app_offer BEGIN
+        INSERT INTO offers_app_offer_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS offers_app_offer_fts_ad AFTER DELETE ON offers_app_offer BEGIN
+        INSERT INTO offers_app_offer_fts(offers_app_offer_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS offers_app_offer_fts_au AFTER UPDATE OF title, description ON offers_app_offer BEGIN
+        INSERT INTO offers_app_offer_fts(offers_app_offer_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO offers_app_offer_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO offers_app_offer_fts(offers_app_offer_fts) VALUES ('rebuild')",
+]
+
+FTS_DROP = [
+    "DROP TRIGGER IF EXISTS offers_app_offer_fts_ai",
+    "DROP TRIGGER IF EXISTS offers_app_offer_fts_ad",
+    "DROP TRIGGER IF EXISTS offers_app_offer_fts_au",
+    "DROP TABLE IF EXISTS offers_app_offer_fts",
+]
+
+
+def _fts5_supported(connection):
+    if connection.vendor != "sqlite":
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def create_offer_fts(apps, schema_editor):
+    """Creates the FTS5 search index (no-op on databases without FTS5)."""
+    if not _fts5_supported(schema_editor.connection):
+        return
+    for statement in FTS_SCHEMA:
+        schema_editor.execute(statement)
+
+
+def drop_offer_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for statement in FTS_DROP:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0004_backfill_offer_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_offer_fts, drop_offer_fts),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.10 on 2026-10-18 03:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_offer_features(apps, schema_editor):
+    """Builds the feature index for existing offer details."""
+    OfferDetail = apps.get_model("offers_app", "OfferDetail")
+    OfferFeature = apps.get_model("offers_app", "OfferFeature")
+
+    batch = {}
+    for pk, offer_id, features in OfferDetail.objects.values_list("id", "offer_id", "features").iterator():
+        for feature in features or []:
+            term = " ".join(str(feature).split()).casefold()[:255]
+            if term:
+                batch[pk, term] = OfferFeature(detail_id=pk, offer_id=offer_id, term=term)
+        if len(batch) >= 5000:
+            OfferFeature.objects.bulk_create(batch.values())
+            batch = {}
+    OfferFeature.objects.bulk_create(batch.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0006_index_pack'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferFeature',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=255)),
+                ('detail', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feature_terms', to='offers_app.offerdetail')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='offers_app.offer')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'offer'], name='offerfeature_term_offer_idx')],
+                'constraints': [models.UniqueConstraint(fields=('detail', 'term'), name='unique_feature_term_per_detail')],
+            },
+        ),
+        migrations.RunPython(backfill_offer_features, migrations.RunPython.noop),
+    ]
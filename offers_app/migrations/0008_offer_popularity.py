@@ -0,0 +1,27 @@
+# Generated by Django 5.2.10 on 2026-10-18 03:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0007_offer_features'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferPopularity',
+            fields=[
+                ('offer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='popularity', serialize=False, to='offers_app.offer')),
+                ('views', models.PositiveBigIntegerField(default=0)),
+                ('detail_opens', models.PositiveBigIntegerField(default=0)),
+                ('score', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['score'], name='offerpopularity_score_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-18 03:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0008_offer_popularity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offerdetail',
+            index=models.Index(fields=['offer_type', 'price', 'delivery_time_in_days'], name='offerdetail_type_price_idx'),
+        ),
+    ]
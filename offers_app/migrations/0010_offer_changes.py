@@ -0,0 +1,37 @@
+# Generated by Django 5.2.10 on 2026-10-18 04:00
+
+from django.db import migrations, models
+
+
+def backfill_offer_changes(apps, schema_editor):
+    """One change per existing offer, so `since` = start returns the whole catalog."""
+    Offer = apps.get_model("offers_app", "Offer")
+    OfferChange = apps.get_model("offers_app", "OfferChange")
+
+    offer_ids = Offer.objects.order_by("id").values_list("id", flat=True)
+    OfferChange.objects.bulk_create(
+        (OfferChange(offer_id=offer_id) for offer_id in offer_ids.iterator()), batch_size=5000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0009_offerdetail_type_price_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offer_id', models.BigIntegerField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['offer_id', 'id'], name='offerchange_offer_seq_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_offer_changes, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,64 @@
 from django.db import models
+from django.db.models import Exists, F, Max, Min, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator
+from django.utils import timezone
+
+
+def _detail_aggregate(function, field):
+    """Correlated subquery computing `function(field)` over an offer's details."""
+    return Subquery(
+        OfferDetail.objects.filter(offer=OuterRef("pk"))
+        .order_by()
+        .values("offer")
+        .annotate(value=function(field))
+        .values("value")[:1]
+    )
+
+
+def _detail_aggregates():
+    """Offer aggregate column -> subquery recomputing it from the details."""
+    return {
+        "min_price": _detail_aggregate(Min, "price"),
+        "max_price": _detail_aggregate(Max, "price"),
+        "min_delivery_time": _detail_aggregate(Min, "delivery_time_in_days"),
+    }
+
+
+def normalize_feature(value):
+    """Search term of a package feature: whitespace collapsed, case-folded."""
+    return " ".join(str(value).split()).casefold()[:255]
+
+
+class OfferQuerySet(models.QuerySet):
+
+    def refresh_aggregates(self, touch=False):
+        """
+        Recomputes the denormalized detail aggregates of all offers
+        in this queryset with a single UPDATE statement.
+
+        touch=True also bumps updated_at (the offers were modified).
+        """
+        values = _detail_aggregates()
+        if touch:
+            values["updated_at"] = timezone.now()
+        return self.update(**values)
+
+    def stale_aggregates(self):
+        """
+        Offers whose stored aggregates differ from their details.
+
+        NULL-safe: both sides are coalesced to -1 (no detail / no value),
+        so one query compares all three columns.
+        """
+        aliases, differs = {}, Q()
+        for field, expression in _detail_aggregates().items():
+            output_field = self.model._meta.get_field(field)
+            aliases[f"stored_{field}"] = Coalesce(field, Value(-1), output_field=output_field)
+            aliases[f"fresh_{field}"] = Coalesce(expression, Value(-1), output_field=output_field)
+            differs |= ~Q(**{f"stored_{field}": F(f"fresh_{field}")})
+        return self.alias(**aliases).filter(differs)
 
 
 class Offer(models.Model):
@@ -15,6 +73,10 @@ class Offer(models.Model):
     Note:
     - The three service packages (basic/standard/premium)
       are stored in OfferDetail (related_name='details').
+    - min_price, max_price and min_delivery_time are denormalized
+      from the details so list filtering/ordering can use indexes
+      instead of a GROUP BY over OfferDetail. They are kept in sync
+      via refresh_aggregates() (see offers_app.api.signals).
     """
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -25,10 +87,43 @@ class Offer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)   # creation timestamp
     updated_at = models.DateTimeField(auto_now=True)       # last modification timestamp
 
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True, editable=False)
+    min_delivery_time = models.PositiveIntegerField(null=True, blank=True, editable=False)
+
+    objects = OfferQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["updated_at", "id"], name="offer_updated_id_idx"),
+            models.Index(fields=["min_price", "updated_at", "id"], name="offer_min_price_idx"),
+            models.Index(fields=["min_delivery_time", "updated_at", "id"], name="offer_min_delivery_idx"),
+            models.Index(fields=["min_price", "id"], name="offer_min_price_id_idx"),
+            models.Index(fields=["user", "updated_at"], name="offer_user_updated_idx"),
+        ]
+
     def __str__(self):
         """Improves readability in Django admin and debugging."""
         return f"{self.title} (user={self.user_id})"
 
+    def refresh_aggregates(self):
+        """
+        Recomputes min_price, max_price and min_delivery_time from the details.
+
+        A change to a package is a change to the offer, so updated_at
+        is bumped as well. Uses .update() to avoid re-running save().
+        """
+        values = self.details.aggregate(
+            min_price=Min("price"),
+            max_price=Max("price"),
+            min_delivery_time=Min("delivery_time_in_days"),
+        )
+        values["updated_at"] = timezone.now()
+        Offer.objects.filter(pk=self.pk).update(**values)
+
+        for field, value in values.items():
+            setattr(self, field, value)
+
 
 class OfferDetail(models.Model):
     """
@@ -77,7 +172,135 @@ class OfferDetail(models.Model):
                 name="unique_offer_type_per_offer",
             )
         ]
+        indexes = [
+            models.Index(fields=["offer", "price"], name="offerdetail_offer_price_idx"),
+            models.Index(fields=["offer", "delivery_time_in_days"], name="offerdetail_offer_days_idx"),
+            models.Index(fields=["offer_type", "price", "delivery_time_in_days"], name="offerdetail_type_price_idx"),
+        ]
 
     def __str__(self):
         """Improves readability in Django admin and debugging."""
-        return f"{self.offer_id}::{self.offer_type} ({self.price}€)"
\ No newline at end of file
+        return f"{self.offer_id}::{self.offer_type} ({self.price}€)"
+
+
+class OfferFeatureQuerySet(models.QuerySet):
+
+    def sync(self, details):
+        """
+        Replaces the feature rows of `details` with their current
+        `features` lists (one DELETE + one INSERT for all of them).
+
+        Called wherever details are written; bulk paths call it
+        explicitly since they bypass signals.
+        """
+        details = [detail for detail in details if detail.pk]
+        if not details:
+            return
+        self.filter(detail__in=[detail.pk for detail in details]).delete()
+
+        rows = {}
+        for detail in details:
+            for feature in detail.features or []:
+                term = normalize_feature(feature)
+                if term:
+                    rows[detail.pk, term] = OfferFeature(detail_id=detail.pk, offer_id=detail.offer_id, term=term)
+        self.bulk_create(rows.values())
+
+
+class OfferFeature(models.Model):
+    """
+    Normalized search index over OfferDetail.features.
+
+    One row per (package, feature term); terms are normalized with
+    normalize_feature(). `offer` is denormalized from the package so
+    the `?feature=` filter resolves offer ids from the (term, offer)
+    index alone, without parsing JSON or joining OfferDetail.
+    """
+
+    detail = models.ForeignKey(OfferDetail, on_delete=models.CASCADE, related_name="feature_terms")
+    offer = models.ForeignKey(Offer, on_delete=models.CASCADE, related_name="+")
+    term = models.CharField(max_length=255)
+
+    objects = OfferFeatureQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["detail", "term"], name="unique_feature_term_per_detail"),
+        ]
+        indexes = [
+            models.Index(fields=["term", "offer"], name="offerfeature_term_offer_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.detail_id}::{self.term}"
+
+
+class OfferPopularity(models.Model):
+    """
+    Popularity counters of an offer (one row per viewed offer).
+
+    Written only in batches by the write-behind buffer in
+    offers_app.api.popularity, never per request. `score` is
+    views + detail_opens and backs `?ordering=popularity`.
+    """
+
+    offer = models.OneToOneField(Offer, on_delete=models.CASCADE, primary_key=True, related_name="popularity")
+    views = models.PositiveBigIntegerField(default=0)
+    detail_opens = models.PositiveBigIntegerField(default=0)
+    score = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["score"], name="offerpopularity_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.offer_id}: {self.views} views, {self.detail_opens} detail opens"
+
+
+class OfferChangeQuerySet(models.QuerySet):
+
+    def record(self, offer_ids, deleted=False):
+        """Appends one change per offer id (one INSERT for all of them)."""
+        return self.bulk_create(
+            [OfferChange(offer_id=offer_id, deleted=deleted) for offer_id in dict.fromkeys(offer_ids)]
+        )
+
+    def latest_per_offer(self):
+        """Changes not superseded by a later change of the same offer."""
+        return self.exclude(self._later_change())
+
+    def superseded(self):
+        return self.filter(self._later_change())
+
+    def _later_change(self):
+        # served by the (offer_id, id) index
+        return Exists(OfferChange.objects.filter(offer_id=OuterRef("offer_id"), id__gt=OuterRef("id")))
+
+
+class OfferChange(models.Model):
+    """
+    Append-only change log of the offer catalog (delta sync).
+
+    Note:
+    - The id is the change sequence handed out as sync token.
+    - offer_id is a plain column, not a foreign key: rows with
+      deleted=True are tombstones that outlive the offer.
+    - Written by offers_app.api.signals for single saves / deletes and
+      explicitly by the bulk write paths.
+    """
+
+    offer_id = models.BigIntegerField()
+    deleted = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = OfferChangeQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["offer_id", "id"], name="offerchange_offer_seq_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} offer={self.offer_id}{' (deleted)' if self.deleted else ''}"
@@ -0,0 +1,77 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import tag
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseBusiness
+from offers_app.models import Offer, OfferChange
+
+
+class TestOfferAggregates(AuthenticatedAPITestCaseBusiness):
+    """
+    Tests for the denormalized aggregates on Offer
+    (min_price, max_price, min_delivery_time).
+    """
+
+    @tag("happy")
+    def test_aggregates_follow_detail_changes(self):
+        self.offer_1.refresh_from_db()
+        self.assertEqual(self.offer_1.min_price, 100)
+        self.assertEqual(self.offer_1.max_price, 400)
+        self.assertEqual(self.offer_1.min_delivery_time, 5)
+
+    @tag("happy")
+    def test_rebuild_command_logs_only_repaired_offers(self):
+        Offer.objects.create(user=self.user_business, title="Ohne Pakete")  # NULL aggregates
+        Offer.objects.filter(pk=self.offer_2.id).update(max_price=1)
+        last_change = OfferChange.objects.order_by("-id").values_list("id", flat=True).first() or 0
+
+        out = StringIO()
+        call_command("rebuild_offer_aggregates", stdout=out)
+
+        self.assertIn("1 changed", out.getvalue())
+        logged = OfferChange.objects.filter(id__gt=last_change).values_list("offer_id", flat=True)
+        self.assertEqual(list(logged), [self.offer_2.id])
+        self.assertFalse(Offer.objects.stale_aggregates().exists())
+
+        url = reverse("offers-detail", kwargs={"pk": self.offer_1.id})
+        payload = {"details": [{"offer_type": "basic", "price": 80, "delivery_time_in_days": 2}]}
+        response = self.client.patch(url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.offer_1.refresh_from_db()
+        self.assertEqual(self.offer_1.min_price, 80)
+        self.assertEqual(self.offer_1.min_delivery_time, 2)
+
+        self.offer_detail_premium_1.delete()
+        self.offer_1.refresh_from_db()
+        self.assertEqual(self.offer_1.max_price, 200)
+
+    @tag("happy")
+    def test_filter_and_order_by_min_price(self):
+        self.offer_detail_basic_2.price = 150
+        self.offer_detail_basic_2.save()
+
+        response = self.client.get(reverse("offers-list"), {"min_price": 120})
+        self.assertEqual([o["id"] for o in response.data["results"]], [self.offer_2.id])
+
+        response = self.client.get(reverse("offers-list"), {"ordering": "-min_price"})
+        self.assertEqual(
+            [o["id"] for o in response.data["results"]],
+            [self.offer_2.id, self.offer_1.id],
+        )
+
+    @tag("happy")
+    def test_rebuild_command_repairs_columns(self):
+        Offer.objects.update(min_price=None, max_price=None, min_delivery_time=None)
+
+        out = StringIO()
+        call_command("rebuild_offer_aggregates", stdout=out)
+
+        self.assertIn("2 offer(s)", out.getvalue())
+        self.offer_1.refresh_from_db()
+        self.assertEqual(self.offer_1.min_price, 100)
+        self.assertEqual(self.offer_1.max_price, 400)
+        self.assertEqual(self.offer_1.min_delivery_time, 5)
@@ -0,0 +1,60 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseBusiness
+from offers_app.models import Offer, OfferDetail
+
+
+class TestOfferDetailUpdates(AuthenticatedAPITestCaseBusiness):
+    """
+    Tests for batched detail updates (PATCH /offers/<id>/)
+    and the multi-offer endpoint (PATCH /offers/bulk/).
+    """
+
+    @tag("happy")
+    def test_patch_writes_details_with_one_bulk_update(self):
+        url = reverse("offers-detail", kwargs={"pk": self.offer_1.id})
+        payload = {"details": [
+            {"offer_type": "basic", "price": 90},
+            {"offer_type": "premium", "price": 450},
+        ]}
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.patch(url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        detail_updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "offers_app_offerdetail"')]
+        self.assertEqual(len(detail_updates), 1)
+        self.assertNotIn('"title"', detail_updates[0]["sql"])
+
+        self.offer_1.refresh_from_db()
+        self.assertEqual(self.offer_1.min_price, 90)
+        self.assertEqual(self.offer_1.max_price, 450)
+
+    @tag("happy")
+    def test_bulk_patch_updates_many_offers(self):
+        payload = {"offers": [
+            {"id": self.offer_1.id, "details": [{"offer_type": "basic", "price": 50}]},
+            {"id": self.offer_2.id, "details": [{"offer_type": "standard", "delivery_time_in_days": 2}]},
+        ]}
+        response = self.client.patch(reverse("offers-bulk-patch"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"offers": 2, "details_updated": 2})
+        self.assertEqual(Offer.objects.get(pk=self.offer_1.id).min_price, 50)
+        self.assertEqual(Offer.objects.get(pk=self.offer_2.id).min_delivery_time, 2)
+
+    @tag("unhappy")
+    def test_bulk_patch_rejects_foreign_offers_atomically(self):
+        other = self._create_user("Fremd", user_type="business")
+        foreign = Offer.objects.create(user=other, title="Fremd")
+        payload = {"offers": [
+            {"id": self.offer_1.id, "details": [{"offer_type": "basic", "price": 1}]},
+            {"id": foreign.id, "details": [{"offer_type": "basic", "price": 1}]},
+        ]}
+        response = self.client.patch(reverse("offers-bulk-patch"), payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(OfferDetail.objects.get(pk=self.offer_detail_basic_1.id).price, 100)
@@ -0,0 +1,113 @@
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.test import override_settings, tag
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api.cache import bump_catalog_version
+from offers_app.api.catalog import np, offer_catalog, reset_catalog_snapshots
+from offers_app.models import Offer, OfferDetail
+
+
+@skipUnless(np is not None, "numpy is not installed")
+@override_settings(OFFER_CATALOG_BACKGROUND_RELOAD=False)
+class TestOfferCatalogEngine(AuthenticatedAPITestCaseCustomer):
+    """
+    Ensures the in-memory catalog engine returns the same pages as the
+    SQL path and picks up writes incrementally.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        offer_catalog.reset()
+        for i, price in enumerate([30, 80, 80, 150, 400]):
+            offer = Offer.objects.create(user=self.user_business, title=f"Engine {i}", description="-")
+            OfferDetail.objects.create(
+                offer=offer, title="basic", revisions=1, delivery_time_in_days=i + 1,
+                price=price, offer_type="basic",
+            )
+        Offer.objects.create(user=self.user_customer, title="No details", description="-")
+
+    def _ids(self, params, engine):
+        # new version: no list cache hit, the snapshot checks for changes
+        bump_catalog_version()
+        with override_settings(OFFER_CATALOG_ENGINE=engine):
+            response = self.client.get(reverse("offers-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["count"], [o["id"] for o in response.data["results"]]
+
+    @tag("happy")
+    def test_engine_matches_sql_path(self):
+        cases = [
+            {},
+            {"ordering": "-updated_at"},
+            {"ordering": "min_price", "page_size": 3},
+            {"ordering": "-min_price", "page_size": 3, "page": 2},
+            {"min_price": 80, "ordering": "min_price"},
+            {"max_delivery_time": 3, "creator_id": self.user_business.id},
+        ]
+        for params in cases:
+            with self.subTest(params=params):
+                self.assertEqual(self._ids(params, engine=True), self._ids(params, engine=False))
+
+    @tag("happy")
+    def test_engine_hydrates_only_the_page(self):
+        count, ids = self._ids({"page_size": 2, "ordering": "-min_price"}, engine=True)
+        self.assertEqual(count, Offer.objects.count())
+        self.assertEqual(len(ids), 2)
+
+    @tag("happy")
+    def test_snapshot_refreshes_incrementally(self):
+        params = {"ordering": "-min_price"}
+        self._ids(params, engine=True)
+
+        offer = Offer.objects.get(title="Engine 0")
+        offer.details.update(price=999)
+        offer.refresh_aggregates()
+        Offer.objects.create(user=self.user_business, title="Engine new", description="-")
+        self.assertEqual(self._ids(params, engine=True), self._ids(params, engine=False))
+        self.assertEqual(len(offer_catalog.snapshot), Offer.objects.count())
+
+        Offer.objects.get(title="Engine 4").delete()
+        self.assertEqual(self._ids(params, engine=True), self._ids(params, engine=False))
+
+    @tag("happy")
+    def test_full_reload_leaves_the_request_path(self):
+        params = {"ordering": "min_price"}
+        self._ids(params, engine=True)
+        snapshot = offer_catalog.snapshot
+        state = snapshot._state
+
+        with (
+            override_settings(OFFER_CATALOG_BACKGROUND_RELOAD=True),
+            mock.patch("offers_app.api.versioned.threading.Thread") as thread,
+            self.assertNumQueries(0),
+        ):
+            snapshot.invalidate()
+            snapshot.invalidate()
+        thread.return_value.start.assert_called_once_with()
+        # requests keep searching the published state until the new one is swapped in
+        self.assertIs(snapshot._state, state)
+        self.assertFalse(state.ids.flags.writeable)
+
+        thread.call_args.kwargs["target"]()
+        self.assertIsNot(snapshot._state, state)
+        self.assertEqual(self._ids(params, engine=True), self._ids(params, engine=False))
+
+    @tag("happy")
+    def test_reset_reloads_writes_without_updated_at(self):
+        params = {"ordering": "min_price"}
+        self._ids(params, engine=True)
+        # what rebuild_offer_aggregates does: no updated_at change
+        Offer.objects.filter(title="Engine 4").update(min_price=1)
+        reset_catalog_snapshots()
+        self.assertEqual(self._ids(params, engine=True), self._ids(params, engine=False))
+
+    @tag("unhappy")
+    def test_invalid_page_is_not_found(self):
+        with override_settings(OFFER_CATALOG_ENGINE=True):
+            response = self.client.get(reverse("offers-list"), {"page": 99})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
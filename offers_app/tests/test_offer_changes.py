@@ -0,0 +1,93 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import tag
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseBusiness
+from offers_app.models import Offer, OfferChange
+
+
+class TestOfferChanges(AuthenticatedAPITestCaseBusiness):
+    """Tests for the delta sync endpoint GET /offers/changes/."""
+
+    def _changes(self, since=None, **params):
+        if since is not None:
+            params["since"] = since
+        response = self.client.get(reverse("offers-changes"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def _sync(self, since=None):
+        """Follows has_more and returns (updated ids, deleted ids, token)."""
+        updated, deleted = [], []
+        while True:
+            data = self._changes(since, limit=1)
+            updated += [o["id"] for o in data["updated"]]
+            deleted += data["deleted"]
+            since = data["token"]
+            if not data["has_more"]:
+                return updated, deleted, since
+
+    @tag("happy")
+    def test_initial_sync_returns_the_catalog(self):
+        data = self._changes()
+        self.assertEqual(sorted(o["id"] for o in data["updated"]), [self.offer_1.id, self.offer_2.id])
+        self.assertEqual(data["deleted"], [])
+        self.assertFalse(data["has_more"])
+        self.assertIn("user_details", data["updated"][0])
+
+    @tag("happy")
+    def test_only_changes_since_the_token_are_returned(self):
+        token = self._changes()["token"]
+        self.assertEqual(self._changes(token)["updated"], [])
+
+        self.offer_detail_basic_2.price = 80
+        self.offer_detail_basic_2.save()
+        created = Offer.objects.create(user=self.user_business, title="Neu")
+        deleted_id = self.offer_1.id
+        self.offer_1.delete()
+
+        updated, deleted, new_token = self._sync(token)
+        self.assertEqual(updated, [self.offer_2.id, created.id])
+        self.assertEqual(deleted, [deleted_id])
+        self.assertEqual(self._changes(new_token)["updated"], [])
+
+    @tag("happy")
+    def test_repeated_changes_are_returned_once(self):
+        token = self._changes()["token"]
+        for title in ("A", "B", "C"):
+            self.offer_2.title = title
+            self.offer_2.save()
+
+        data = self._changes(token)
+        self.assertEqual([o["title"] for o in data["updated"]], ["C"])
+
+    @tag("happy")
+    def test_api_writes_are_logged(self):
+        token = self._changes()["token"]
+        payload = {"details": [{"offer_type": "basic", "price": 90}]}
+        response = self.client.patch(reverse("offers-detail", kwargs={"pk": self.offer_1.id}), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = self._changes(token)
+        self.assertEqual([(o["id"], o["min_price"]) for o in data["updated"]], [(self.offer_1.id, 90)])
+
+    @tag("happy")
+    def test_pruning_keeps_tokens_valid(self):
+        token = self._changes()["token"]
+        self.offer_1.title = "X"
+        self.offer_1.save()
+        deleted_id = self.offer_2.id
+        self.offer_2.delete()
+
+        call_command("prune_offer_changes", stdout=StringIO())
+        self.assertEqual(OfferChange.objects.filter(offer_id=self.offer_1.id).count(), 1)
+        updated, deleted, _ = self._sync(token)
+        self.assertEqual((updated, deleted), ([self.offer_1.id], [deleted_id]))
+
+    @tag("unhappy")
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get(reverse("offers-changes"), {"since": "kaputt"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
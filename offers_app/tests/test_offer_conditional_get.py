@@ -0,0 +1,83 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.models import Offer
+
+
+class TestOfferConditionalGet(AuthenticatedAPITestCaseCustomer):
+    """
+    Tests for ETag / Last-Modified handling on offer endpoints.
+    """
+
+    def _assert_revalidates(self, url):
+        """GET, then revalidate with the returned ETag -> 304."""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        return etag
+
+    @tag("happy")
+    def test_offer_retrieve_not_modified(self):
+        url = reverse("offers-detail", kwargs={"pk": self.offer_1.id})
+        etag = self._assert_revalidates(url)
+
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        # token auth + validator query, no serialization
+        self.assertEqual(len(ctx.captured_queries), 2)
+
+    @tag("happy")
+    def test_offer_etag_differs_per_scheme(self):
+        url = reverse("offers-detail", kwargs={"pk": self.offer_1.id})
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, secure=True, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["details"][0]["url"].startswith("https://"))
+
+    @tag("happy")
+    def test_offer_retrieve_modified_after_detail_change(self):
+        url = reverse("offers-detail", kwargs={"pk": self.offer_1.id})
+        etag = self._assert_revalidates(url)
+
+        self.offer_detail_basic_1.price = 99
+        self.offer_detail_basic_1.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @tag("happy")
+    def test_offer_list_etag_detects_deletes(self):
+        url = reverse("offers-list")
+        etag = self._assert_revalidates(url)
+
+        Offer.objects.filter(pk=self.offer_1.pk).delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @tag("happy")
+    def test_offerdetail_not_modified(self):
+        url = reverse("offerdetail-detail", kwargs={"pk": self.offer_detail_basic_1.id})
+        self._assert_revalidates(url)
+
+    @tag("unhappy")
+    def test_missing_offer_still_404(self):
+        url = reverse("offers-detail", kwargs={"pk": 9999})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    @tag("unhappy")
+    def test_malformed_pk_is_404(self):
+        for name in ("offers-detail", "offerdetail-detail"):
+            url = reverse(name, kwargs={"pk": 1}).replace("/1/", "/abc/")
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
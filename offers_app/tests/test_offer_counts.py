@@ -0,0 +1,88 @@
+import warnings
+
+from django.core.cache import CacheKeyWarning, cache
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.models import Offer
+
+
+class TestOfferCounts(AuthenticatedAPITestCaseCustomer):
+    """
+    Tests for the count strategies (`?count=`) of the offer list.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def _get(self, **params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("offers-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counted = any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries)
+        return response, counted
+
+    @tag("happy")
+    def test_exact_count_is_cached_and_invalidated(self):
+        response, counted = self._get()
+        self.assertEqual(response.data["count"], 2)
+        self.assertTrue(counted)
+
+        response, counted = self._get(ordering="-updated_at")
+        self.assertEqual(response.data["count"], 2)
+        self.assertFalse(counted)
+
+        Offer.objects.create(user=self.user_business, title="Neu")
+        response, counted = self._get()
+        self.assertEqual(response.data["count"], 3)
+        self.assertTrue(counted)
+
+    @tag("happy")
+    def test_count_cache_is_per_filter_set(self):
+        self._get()
+        response, _ = self._get(creator_id=self.user_customer.id)
+        self.assertEqual(response.data["count"], 0)
+
+    @tag("happy")
+    def test_omit_mode_returns_has_more(self):
+        response, counted = self._get(count="omit", page_size=1)
+        self.assertFalse(counted)
+        self.assertNotIn("count", response.data)
+        self.assertTrue(response.data["has_more"])
+        self.assertIsNotNone(response.data["next"])
+
+        response, _ = self._get(count="omit", page_size=1, page=2)
+        self.assertFalse(response.data["has_more"])
+        self.assertIsNone(response.data["next"])
+        self.assertIsNotNone(response.data["previous"])
+
+    @tag("happy")
+    def test_approximate_mode_uses_last_known_count(self):
+        response, _ = self._get(count="approximate", page_size=1)
+        self.assertIsNone(response.data["count"])
+
+        self._get()
+        response, counted = self._get(count="approximate")
+        self.assertFalse(counted)
+        self.assertEqual(response.data["count"], 2)
+
+    @tag("unhappy")
+    def test_long_filter_values_give_valid_cache_keys(self):
+        # raw query values in the key would exceed 250 chars and contain spaces
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", CacheKeyWarning)
+            response, counted = self._get(search="logo design " * 30)
+            self.assertTrue(counted)
+            response, counted = self._get(search="logo design " * 30)
+        self.assertFalse(counted)
+        self.assertEqual(response.data["count"], 0)
+
+    @tag("unhappy")
+    def test_invalid_count_mode(self):
+        response = self.client.get(reverse("offers-list"), {"count": "maybe"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
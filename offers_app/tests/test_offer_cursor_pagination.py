@@ -0,0 +1,63 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.models import Offer
+
+
+class TestOfferCursorPagination(AuthenticatedAPITestCaseCustomer):
+    """
+    Tests for the opt-in keyset pagination (`?cursor=`) of the offer list.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for price in (300, 50, 50):
+            offer = Offer.objects.create(user=self.user_business, title=f"Offer {price}")
+            self._create_offer_detail(offer, price, "basic")
+        Offer.objects.create(user=self.user_business, title="Without details")
+
+    def _walk(self, params, link_key="next"):
+        """Follows the cursor links and returns all collected ids."""
+        response = self.client.get(reverse("offers-list"), {**params, "cursor": ""})
+        ids = []
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            ids += [offer["id"] for offer in response.data["results"]]
+            if not response.data[link_key]:
+                return ids, response
+            response = self.client.get(response.data[link_key])
+
+    @tag("happy")
+    def test_cursor_walks_all_offers_by_updated_at(self):
+        ids, _ = self._walk({"page_size": 2})
+        expected = list(Offer.objects.order_by("updated_at", "id").values_list("id", flat=True))
+        self.assertEqual(ids, expected)
+
+    @tag("happy")
+    def test_cursor_handles_ties_and_nulls_by_min_price(self):
+        for ordering in ("min_price", "-min_price"):
+            ids, last = self._walk({"page_size": 2, "ordering": ordering})
+            self.assertEqual(len(ids), Offer.objects.count())
+            self.assertEqual(len(set(ids)), len(ids))
+
+            previous = self.client.get(last.data["previous"])
+            self.assertEqual(
+                [offer["id"] for offer in previous.data["results"]],
+                ids[-len(last.data["results"]) - 2:-len(last.data["results"])],
+            )
+
+    @tag("happy")
+    def test_cursor_page_runs_no_count_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("offers-list"), {"cursor": ""})
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in ctx.captured_queries))
+
+    @tag("unhappy")
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("offers-list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,55 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api.serializers import OfferDetailBatchSerializer
+from offers_app.models import OfferDetail
+
+
+class TestOfferDetailBatch(AuthenticatedAPITestCaseCustomer):
+    """Tests for GET /offerdetails/?ids=..."""
+
+    url = reverse("offerdetail-batch")
+
+    @tag("happy")
+    def test_returns_details_keyed_by_id(self):
+        ids = list(OfferDetail.objects.values_list("id", flat=True))
+        response = self.client.get(self.url, {"ids": ",".join(map(str, ids))})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {str(pk) for pk in ids})
+        basic = response.data[str(self.offer_detail_basic_1.id)]
+        self.assertEqual(basic["offer_type"], "basic")
+        for key in ["id", "title", "revisions", "delivery_time_in_days", "price", "features", "offer_type"]:
+            self.assertIn(key, basic)
+
+    @tag("happy")
+    def test_single_detail_query(self):
+        ids = ",".join(str(pk) for pk in OfferDetail.objects.values_list("id", flat=True))
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.url, {"ids": ids})
+        detail_queries = [q for q in ctx.captured_queries if 'FROM "offers_app_offerdetail"' in q["sql"]]
+        self.assertEqual(len(detail_queries), 1)
+
+    @tag("happy")
+    def test_unknown_ids_map_to_null(self):
+        response = self.client.get(self.url, {"ids": f"{self.offer_detail_basic_1.id},999999"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["999999"])
+
+    @tag("unhappy")
+    def test_invalid_and_too_many_ids(self):
+        self.assertEqual(self.client.get(self.url, {"ids": "1,abc"}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+
+        too_many = ",".join(str(i) for i in range(1, OfferDetailBatchSerializer.max_ids + 2))
+        self.assertEqual(self.client.get(self.url, {"ids": too_many}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    @tag("unhappy")
+    def test_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.get(self.url, {"ids": str(self.offer_detail_basic_1.id)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
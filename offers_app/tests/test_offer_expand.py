@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+
+DETAIL_KEYS = {"id", "title", "revisions", "delivery_time_in_days", "price", "features", "offer_type"}
+
+
+class TestOfferExpandDetails(AuthenticatedAPITestCaseCustomer):
+    """Tests for `?expand=details` on offer list and retrieve."""
+
+    @tag("happy")
+    def test_list_inlines_details(self):
+        response = self.client.get(reverse("offers-list"), {"expand": "details"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        offer = next(o for o in response.data["results"] if o["id"] == self.offer_1.id)
+        self.assertEqual(len(offer["details"]), 3)
+        for detail in offer["details"]:
+            self.assertEqual(set(detail), DETAIL_KEYS)
+
+    @tag("happy")
+    def test_retrieve_inlines_details(self):
+        url = reverse("offers-detail", kwargs={"pk": self.offer_1.id})
+        response = self.client.get(url, {"expand": "details"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({d["offer_type"] for d in response.data["details"]}, {"basic", "standard", "premium"})
+
+    @tag("happy")
+    def test_default_shape_is_unchanged(self):
+        response = self.client.get(reverse("offers-list"))
+        offer = response.data["results"][0]
+        for detail in offer["details"]:
+            self.assertEqual(set(detail), {"id", "url"})
+
+    @tag("happy")
+    def test_details_come_from_one_prefetch(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("offers-list"), {"expand": "details"})
+        detail_queries = [q for q in ctx.captured_queries if 'FROM "offers_app_offerdetail"' in q["sql"]]
+        self.assertEqual(len(detail_queries), 1)
+
+    @tag("unhappy")
+    def test_unknown_expansion_is_rejected(self):
+        response = self.client.get(reverse("offers-list"), {"expand": "user"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.models import Offer
+
+
+class TestOfferFacets(AuthenticatedAPITestCaseCustomer):
+    """
+    Tests for the `?facets=` parameter of the offer list.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        cheap = Offer.objects.create(user=self.user_business, title="Günstig")
+        self._create_offer_detail(cheap, 20, "basic")
+
+    def _counts(self, facet):
+        return {bucket["key"]: bucket["count"] for bucket in facet}
+
+    @tag("happy")
+    def test_facets_count_buckets(self):
+        response = self.client.get(reverse("offers-list"), {"facets": "price,delivery_time"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        price = self._counts(response.data["facets"]["price"])
+        self.assertEqual(price["0-50"], 1)
+        self.assertEqual(price["100-250"], 2)
+        self.assertEqual(sum(price.values()), 3)
+        self.assertEqual(self._counts(response.data["facets"]["delivery_time"])["4-7"], 3)
+
+    @tag("happy")
+    def test_facets_follow_filters_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("offers-list"), {"facets": "price", "min_price": 50})
+        price = self._counts(response.data["facets"]["price"])
+        self.assertEqual(price["0-50"], 0)
+        self.assertEqual(price["100-250"], 2)
+        self.assertNotIn("delivery_time", response.data["facets"])
+        facet_queries = [q for q in ctx.captured_queries if "price_0" in q["sql"]]
+        self.assertEqual(len(facet_queries), 1)
+
+    @tag("happy")
+    def test_no_facets_by_default(self):
+        response = self.client.get(reverse("offers-list"))
+        self.assertNotIn("facets", response.data)
+
+    @tag("unhappy")
+    def test_unknown_facet(self):
+        response = self.client.get(reverse("offers-list"), {"facets": "color"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
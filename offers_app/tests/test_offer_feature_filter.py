@@ -0,0 +1,79 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseBusiness
+from offers_app.models import Offer, OfferFeature
+
+
+class TestOfferFeatureFilter(AuthenticatedAPITestCaseBusiness):
+    """
+    Tests for the normalized feature index (OfferFeature) and the
+    `?feature=` filter on GET /offers/.
+    """
+
+    def _list_ids(self, params):
+        response = self.client.get(reverse("offers-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(o["id"] for o in response.data["results"])
+
+    def _terms(self, detail):
+        return set(OfferFeature.objects.filter(detail=detail).values_list("term", flat=True))
+
+    @tag("happy")
+    def test_detail_writes_fill_the_index(self):
+        self.assertEqual(self._terms(self.offer_detail_basic_1), {"logo design", "käsekuchen"})
+
+        self.offer_detail_basic_1.features = ["  Source   Files ", "source files"]
+        self.offer_detail_basic_1.save()
+        self.assertEqual(self._terms(self.offer_detail_basic_1), {"source files"})
+
+    @tag("happy")
+    def test_filter_is_case_insensitive_and_combines(self):
+        self.offer_detail_premium_2.features = ["Source files"]
+        self.offer_detail_premium_2.save()
+
+        self.assertEqual(self._list_ids({"feature": "LOGO design"}), sorted([self.offer_1.id, self.offer_2.id]))
+        self.assertEqual(self._list_ids({"feature": "source files"}), [self.offer_2.id])
+        self.assertEqual(self._list_ids({"feature": "source files", "min_price": 150}), [])
+        self.assertEqual(self._list_ids({"feature": "unknown"}), [])
+
+    @tag("happy")
+    def test_filter_uses_the_side_table_in_one_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self._list_ids({"feature": "flyer", "max_delivery_time": 10, "count": "omit"})
+        offer_queries = [
+            q["sql"] for q in ctx.captured_queries if q["sql"].startswith('SELECT "offers_app_offer"."id"')
+        ]
+        self.assertEqual(len(offer_queries), 1)
+        self.assertIn('FROM "offers_app_offerfeature" U0 WHERE U0."term" = ', offer_queries[0])
+        self.assertNotIn('"features"', offer_queries[0])
+
+    @tag("happy")
+    def test_api_create_and_patch_keep_the_index_in_sync(self):
+        details = [
+            {"title": t, "revisions": 1, "delivery_time_in_days": 3, "price": 50 * (i + 1),
+             "features": ["Flyer"] if t == "basic" else [], "offer_type": t}
+            for i, t in enumerate(["basic", "standard", "premium"])
+        ]
+        response = self.client.post(
+            reverse("offers-list"), {"title": "Print", "description": "-", "details": details}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        offer_id = response.data["id"]
+        self.assertEqual(self._list_ids({"feature": "flyer"}), [offer_id])
+
+        payload = {"details": [{"offer_type": "basic", "features": ["Poster"]}]}
+        response = self.client.patch(reverse("offers-detail", kwargs={"pk": offer_id}), payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._list_ids({"feature": "flyer"}), [])
+        self.assertEqual(self._list_ids({"feature": "poster"}), [offer_id])
+
+        Offer.objects.get(pk=offer_id).delete()
+        self.assertFalse(OfferFeature.objects.filter(offer_id=offer_id).exists())
+
+    @tag("unhappy")
+    def test_blank_feature_is_ignored(self):
+        self.assertEqual(self._list_ids({"feature": " "}), sorted(Offer.objects.values_list("id", flat=True)))
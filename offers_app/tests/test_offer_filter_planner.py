@@ -0,0 +1,124 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api.filters import OfferFilterPlanner
+from offers_app.models import Offer, OfferDetail
+
+DETAIL_TABLE = '"offers_app_offerdetail"'
+
+
+class TestOfferFilterPlanner(AuthenticatedAPITestCaseCustomer):
+    """
+    Ensures all list filters end up in one query without redundant
+    joins to OfferDetail, GROUP BY or duplicate rows.
+    """
+
+    def _list_sql(self, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("offers-list"), {**params, "count": "omit"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        offer_queries = [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].startswith('SELECT "offers_app_offer"."id"')
+        ]
+        self.assertEqual(len(offer_queries), 1)
+        return offer_queries[0], response
+
+    @tag("happy")
+    def test_all_filters_in_one_query_without_detail_join(self):
+        sql, response = self._list_sql(
+            {
+                "creator_id": self.user_business.id,
+                "min_price": 50,
+                "max_delivery_time": 10,
+                "search": "Offer",
+            }
+        )
+        self.assertLessEqual(sql.count(f"JOIN {DETAIL_TABLE}"), 1)
+        self.assertNotIn("GROUP BY", sql)
+
+        ids = [o["id"] for o in response.data["results"]]
+        self.assertEqual(len(ids), len(set(ids)))
+
+    @tag("happy")
+    def test_filters_match_aggregates(self):
+        _, response = self._list_sql({"min_price": 100, "max_delivery_time": 5})
+        expected = Offer.objects.filter(min_price__gte=100, min_delivery_time__lte=5)
+        self.assertEqual(
+            sorted(o["id"] for o in response.data["results"]),
+            sorted(expected.values_list("id", flat=True)),
+        )
+
+    @tag("happy")
+    def test_package_conditions_share_one_subquery(self):
+        planner = OfferFilterPlanner({"max_price": 100, "offer_type": "basic"})
+
+        queryset = planner.apply(Offer.objects.all())
+        sql = str(queryset.query)
+
+        self.assertEqual(sql.count(DETAIL_TABLE), 1)
+        self.assertNotIn("JOIN", sql)
+        self.assertEqual(
+            set(queryset.values_list("id", flat=True)),
+            set(
+                Offer.objects.filter(details__price__lte=100, details__offer_type="basic")
+                .values_list("id", flat=True)
+            ),
+        )
+
+    @tag("happy")
+    def test_package_type_range_filters_hold_for_one_package(self):
+        match = Offer.objects.create(user=self.user_business, title="Match")
+        OfferDetail.objects.create(offer=match, title="s", revisions=1, delivery_time_in_days=6,
+                                   price=90, offer_type="standard")
+        # cheap enough, but as basic; standard is too expensive
+        mixed = Offer.objects.create(user=self.user_business, title="Mixed")
+        OfferDetail.objects.create(offer=mixed, title="b", revisions=1, delivery_time_in_days=6,
+                                   price=50, offer_type="basic")
+        OfferDetail.objects.create(offer=mixed, title="s", revisions=1, delivery_time_in_days=6,
+                                   price=150, offer_type="standard")
+
+        params = {"offer_type": "standard", "max_price": 100, "delivery_time_from": 5}
+        sql, response = self._list_sql(params)
+        self.assertEqual([o["id"] for o in response.data["results"]], [match.id])
+        self.assertEqual(sql.count(DETAIL_TABLE), 1)
+        self.assertNotIn("JOIN", sql)
+
+        _, response = self._list_sql({"max_price": 90, "delivery_time_from": 5})
+        self.assertEqual(sorted(o["id"] for o in response.data["results"]), sorted([match.id, mixed.id]))
+
+    @tag("happy")
+    def test_standard_package_under_price_within_days(self):
+        match = Offer.objects.create(user=self.user_business, title="Match")
+        OfferDetail.objects.create(offer=match, title="s", revisions=1, delivery_time_in_days=5,
+                                   price=100, offer_type="standard")
+        # fast basic package, but the standard one is too slow
+        slow = Offer.objects.create(user=self.user_business, title="Slow")
+        OfferDetail.objects.create(offer=slow, title="b", revisions=1, delivery_time_in_days=2,
+                                   price=50, offer_type="basic")
+        OfferDetail.objects.create(offer=slow, title="s", revisions=1, delivery_time_in_days=8,
+                                   price=90, offer_type="standard")
+
+        sql, response = self._list_sql({"offer_type": "standard", "max_price": 100, "delivery_time_to": 5})
+        self.assertEqual([o["id"] for o in response.data["results"]], [match.id])
+        self.assertEqual(sql.count(DETAIL_TABLE), 1)
+
+    @tag("unhappy")
+    def test_min_delivery_time_is_rejected(self):
+        response = self.client.get(reverse("offers-list"), {"min_delivery_time": 3})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("min_delivery_time", response.data)
+
+    @tag("unhappy")
+    def test_unknown_offer_type_is_rejected(self):
+        response = self.client.get(reverse("offers-list"), {"offer_type": "deluxe"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @tag("unhappy")
+    def test_invalid_creator_id_is_rejected(self):
+        response = self.client.get(reverse("offers-list"), {"creator_id": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import tag
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api.cache import bump_catalog_version, offer_fragment_cache
+from offers_app.api.serializers import OfferSerializer
+from offers_app.models import Offer
+
+
+class TestOfferFragmentCache(AuthenticatedAPITestCaseCustomer):
+    """Tests for the per-offer fragment cache behind the offer list."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def _list(self, params=None):
+        # new catalog version: the page cache misses, fragments may hit
+        bump_catalog_version()
+        response = self.client.get(reverse("offers-list"), params or {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {o["id"]: o for o in response.data["results"]}
+
+    @tag("happy")
+    def test_only_changed_offers_are_serialized_again(self):
+        self._list()
+        offer = Offer.objects.get(pk=self.offer_1.id)
+        offer.title = "Neu"
+        offer.save()
+
+        with mock.patch.object(OfferSerializer, "get_user_details", autospec=True,
+                               side_effect=OfferSerializer.get_user_details) as rendered:
+            results = self._list()
+        self.assertEqual([call.args[1].pk for call in rendered.call_args_list], [self.offer_1.id])
+        self.assertEqual(results[self.offer_1.id]["title"], "Neu")
+        self.assertEqual(results[self.offer_2.id]["title"], self.offer_2.title)
+
+    @tag("happy")
+    def test_fragments_are_keyed_by_updated_at(self):
+        self._list()
+        # queryset.update() keeps updated_at: the cached fragment is served
+        Offer.objects.filter(pk=self.offer_1.id).update(title="Unsichtbar")
+        self.assertEqual(self._list()[self.offer_1.id]["title"], self.offer_1.title)
+
+        offer_fragment_cache.invalidate()
+        self.assertEqual(self._list()[self.offer_1.id]["title"], "Unsichtbar")
+
+    @tag("happy")
+    def test_owner_rename_drops_their_fragments(self):
+        self._list()
+        self.user_business.first_name = "Renamed"
+        self.user_business.save()
+        self.assertEqual(self._list()[self.offer_1.id]["user_details"]["first_name"], "Renamed")
+
+    @tag("happy")
+    def test_owner_rename_refreshes_list_pages(self):
+        url = reverse("offers-list")
+        first = self.client.get(url)
+        self.user_business.last_name = "Renamed"
+        self.user_business.save(update_fields=["last_name"])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["user_details"]["last_name"], "Renamed")
+
+    @tag("happy")
+    def test_response_variants_do_not_share_fragments(self):
+        self._list()
+        results = self._list({"fields": "id,title"})
+        self.assertEqual(set(results[self.offer_1.id]), {"id", "title"})
+        results = self._list({"expand": "details"})
+        self.assertIn("price", results[self.offer_1.id]["details"][0])
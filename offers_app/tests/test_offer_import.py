@@ -0,0 +1,115 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import tag
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseBusiness
+from offers_app.api.importer import OfferImporter, OfferImportError
+from offers_app.models import Offer
+
+
+class TestOfferImport(AuthenticatedAPITestCaseBusiness):
+    """
+    Tests for the streaming bulk offer import (command, endpoint, importer).
+    """
+
+    def _record(self, title, basic_price=100):
+        return {
+            "title": title,
+            "image": None,
+            "description": "Importiert",
+            "details": [
+                {"title": "Basic", "revisions": 1, "delivery_time_in_days": 5, "price": basic_price,
+                 "features": ["Logo Design"], "offer_type": "basic"},
+                {"title": "Standard", "revisions": 2, "delivery_time_in_days": 4, "price": 200,
+                 "features": [], "offer_type": "standard"},
+                {"title": "Premium", "revisions": 3, "delivery_time_in_days": 3, "price": 300,
+                 "features": [], "offer_type": "premium"},
+            ],
+        }
+
+    def _lines(self):
+        broken = self._record("Kaputt")
+        broken["details"] = broken["details"][:2]
+        return [
+            json.dumps(self._record("Import 1", basic_price=80)),
+            "",
+            "{not json",
+            json.dumps(broken),
+            json.dumps(self._record("Import 2")),
+            json.dumps(self._record("Import 3")),
+        ]
+
+    @tag("happy")
+    def test_importer_inserts_batches_and_reports_errors(self):
+        report = OfferImporter(self.user_business, batch_size=2).run(iter(self._lines()))
+
+        self.assertEqual(report["created"], 3)
+        self.assertEqual(report["failed"], 2)
+        self.assertEqual([e["line"] for e in report["errors"]], [3, 4])
+
+        offer = Offer.objects.get(title="Import 1")
+        self.assertEqual(offer.details.count(), 3)
+        self.assertEqual(offer.min_price, 80)
+        self.assertEqual(offer.min_delivery_time, 3)
+
+    @tag("unhappy")
+    def test_non_utf8_line_is_reported(self):
+        lines = [line.encode() for line in self._lines()]
+        lines[0] = json.dumps(self._record("Café"), ensure_ascii=False).encode("latin-1")
+        report = OfferImporter(self.user_business).run(iter(lines))
+
+        self.assertEqual(report["created"], 2)
+        self.assertEqual([e["line"] for e in report["errors"]], [1, 3, 4])
+        self.assertIn("Invalid UTF-8", report["errors"][0]["errors"]["non_field_errors"][0])
+
+        path = self._write_file("")
+        with open(path, "wb") as handle:
+            handle.write(b"\n".join(lines))
+        err = StringIO()
+        call_command("import_offers", path, "--user", str(self.user_business.id), stdout=StringIO(), stderr=err)
+        self.assertIn("line 1", err.getvalue())
+
+    @tag("unhappy")
+    def test_importer_requires_business_owner(self):
+        with self.assertRaises(OfferImportError):
+            OfferImporter(self.user_customer)
+
+    @tag("happy")
+    def test_import_command(self):
+        path = self._write_file("\n".join(self._lines()))
+        out, err = StringIO(), StringIO()
+        call_command("import_offers", path, "--user", str(self.user_business.id), stdout=out, stderr=err)
+
+        self.assertIn("Imported 3 offer(s), 2 failed", out.getvalue())
+        self.assertIn("line 3", err.getvalue())
+
+    @tag("happy")
+    def test_import_endpoint_is_staff_only(self):
+        url = reverse("offers-bulk-import")
+        upload = SimpleUploadedFile("offers.jsonl", "\n".join(self._lines()).encode())
+        data = {"file": upload, "user": self.user_business.id}
+
+        response = self.client.post(url, data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        upload.seek(0)
+        response = self.client.post(url, data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 3)
+
+    def _write_file(self, content):
+        """Writes `content` to a temporary JSONL file (removed after the test)."""
+        handle = tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8")
+        handle.write(content)
+        handle.close()
+        self.addCleanup(os.remove, handle.name)
+        return handle.name
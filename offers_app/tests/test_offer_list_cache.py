@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.test import override_settings, tag
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api.cache import offer_list_cache
+
+
+class TestOfferListCache(AuthenticatedAPITestCaseCustomer):
+    """
+    Tests for the versioned response cache of the offer list.
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.url = reverse("offers-list")
+
+    @tag("happy")
+    def test_repeated_request_is_served_from_cache(self):
+        first = self.client.get(self.url, {"page_size": 5, "ordering": "min_price"})
+        second = self.client.get(self.url, {"ordering": "min_price", "page_size": 5})
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(offer_list_cache.stats()["hits"], 1)
+        self.assertEqual(offer_list_cache.stats()["misses"], 1)
+
+    @tag("happy")
+    def test_schemes_do_not_share_pages_or_etags(self):
+        http = self.client.get(self.url)
+        https = self.client.get(self.url, secure=True, HTTP_IF_NONE_MATCH=http["ETag"])
+
+        self.assertEqual(https.status_code, status.HTTP_200_OK)
+        self.assertEqual(https["X-Cache"], "MISS")
+        self.assertNotEqual(https["ETag"], http["ETag"])
+        self.assertTrue(http.data["results"][0]["details"][0]["url"].startswith("http://"))
+        self.assertTrue(https.data["results"][0]["details"][0]["url"].startswith("https://"))
+
+    @tag("happy")
+    def test_detail_write_invalidates_cached_pages(self):
+        self.client.get(self.url)
+        self.offer_detail_basic_1.price = 10
+        self.offer_detail_basic_1.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        prices = {o["id"]: o["min_price"] for o in response.data["results"]}
+        self.assertEqual(prices[self.offer_1.id], 10)
+
+    @tag("happy")
+    @override_settings(CACHES={"default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": "/tmp/coderr-test-cache",
+    }})
+    def test_works_with_file_based_cache(self):
+        cache.clear()
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url)["X-Cache"], "HIT")
+        cache.clear()
+
+    @tag("unhappy")
+    def test_cache_stats_requires_staff(self):
+        response = self.client.get(reverse("offers-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get(reverse("offers-cache-stats"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("hits", response.data)
@@ -0,0 +1,131 @@
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api.popularity import popularity_buffer, write_counters
+from offers_app.models import Offer, OfferPopularity
+
+
+@override_settings(OFFER_POPULARITY_FLUSH_INTERVAL=3600, OFFER_POPULARITY_BACKGROUND_FLUSH=False)
+class TestOfferPopularity(AuthenticatedAPITestCaseCustomer):
+    """Tests for the write-behind view counters and `?ordering=popularity`."""
+
+    def _open(self, offer, times=1):
+        for _ in range(times):
+            response = self.client.get(reverse("offers-detail", kwargs={"pk": offer.id}))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @tag("happy")
+    def test_views_are_buffered_without_writes(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self._open(self.offer_1, times=2)
+        self.assertFalse([q for q in ctx.captured_queries if "offerpopularity" in q["sql"]])
+
+        self.client.get(reverse("offerdetail-detail", kwargs={"pk": self.offer_detail_basic_2.id}))
+        self.assertEqual(
+            popularity_buffer.pending(), ({self.offer_1.id: 2}, {self.offer_detail_basic_2.id: 1})
+        )
+
+    @tag("happy")
+    def test_flush_upserts_and_sums_buffers(self):
+        self._open(self.offer_1, times=2)
+        self.client.get(reverse("offerdetail-detail", kwargs={"pk": self.offer_detail_basic_1.id}))
+        self.assertEqual(popularity_buffer.flush(), 1)
+        self.assertEqual(popularity_buffer.pending(), ({}, {}))
+
+        # a second worker's buffer adds to the stored counters
+        write_counters({self.offer_1.id: 3, self.offer_2.id: 1}, {})
+        counters = OfferPopularity.objects.get(offer=self.offer_1)
+        self.assertEqual((counters.views, counters.detail_opens, counters.score), (5, 1, 6))
+        self.assertEqual(OfferPopularity.objects.get(offer=self.offer_2).score, 1)
+
+    @tag("happy")
+    def test_flush_when_interval_elapsed(self):
+        with override_settings(OFFER_POPULARITY_FLUSH_INTERVAL=0):
+            self._open(self.offer_2)
+        self.assertEqual(OfferPopularity.objects.get(offer=self.offer_2).views, 1)
+
+    @tag("happy")
+    def test_due_flush_leaves_the_request_path(self):
+        with (
+            override_settings(OFFER_POPULARITY_FLUSH_INTERVAL=0, OFFER_POPULARITY_BACKGROUND_FLUSH=True),
+            mock.patch.object(popularity_buffer, "_start_flusher") as start,
+            mock.patch.object(popularity_buffer, "_wakeup") as wakeup,
+            CaptureQueriesContext(connection) as ctx,
+        ):
+            self._open(self.offer_2)
+        start.assert_called_once_with()
+        wakeup.set.assert_called_once_with()
+        self.assertFalse([q for q in ctx.captured_queries if "offerpopularity" in q["sql"]])
+        self.assertEqual(popularity_buffer.pending(), ({self.offer_2.id: 1}, {}))
+
+    @tag("happy")
+    def test_idle_buffer_is_flushed_after_the_interval(self):
+        with override_settings(OFFER_POPULARITY_BACKGROUND_FLUSH=True):
+            with mock.patch.object(popularity_buffer, "_start_flusher"):
+                self._open(self.offer_2)
+            # the flusher's wait times out without a wake-up (no further request)
+            with (
+                mock.patch.object(popularity_buffer._wakeup, "wait", return_value=False) as wait,
+                mock.patch("offers_app.api.popularity.connection.close"),
+            ):
+                popularity_buffer._flush_tick()
+        wait.assert_called_once_with(timeout=3600)
+        self.assertEqual(OfferPopularity.objects.get(offer=self.offer_2).views, 1)
+        self.assertEqual(popularity_buffer.pending(), ({}, {}))
+
+    @tag("happy")
+    def test_flusher_thread_runs_without_further_requests(self):
+        written = threading.Event()
+        with (
+            override_settings(OFFER_POPULARITY_BACKGROUND_FLUSH=True, OFFER_POPULARITY_FLUSH_INTERVAL=0.05),
+            mock.patch("offers_app.api.popularity.write_counters", side_effect=lambda *args: written.set()) as write,
+        ):
+            self._open(self.offer_2)
+            self.assertTrue(written.wait(timeout=5))
+        write.assert_called_once_with({self.offer_2.id: 1}, {})
+
+    @tag("happy")
+    def test_ordering_by_popularity(self):
+        newest = Offer.objects.create(user=self.user_business, title="Ohne Aufrufe")
+        self._open(self.offer_2, times=3)
+        self._open(self.offer_1)
+        popularity_buffer.flush()
+
+        response = self.client.get(reverse("offers-list"), {"ordering": "popularity"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [o["id"] for o in response.data["results"]]
+        self.assertEqual(ids, [self.offer_2.id, self.offer_1.id, newest.id])
+
+    @tag("happy")
+    def test_flush_refreshes_popularity_pages(self):
+        url = reverse("offers-list")
+        first = self.client.get(url, {"ordering": "popularity"})
+        plain = self.client.get(url)
+        self._open(self.offer_2, times=2)
+        popularity_buffer.flush()
+
+        response = self.client.get(url, {"ordering": "popularity"}, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["id"], self.offer_2.id)
+        # other orderings keep their ETag
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=plain["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @tag("unhappy")
+    def test_deleted_offers_are_skipped(self):
+        self._open(self.offer_1)
+        Offer.objects.filter(pk=self.offer_1.id).delete()
+        self.assertEqual(popularity_buffer.flush(), 0)
+        self.assertFalse(OfferPopularity.objects.exists())
+
+    @tag("unhappy")
+    def test_popularity_is_not_a_cursor_ordering(self):
+        response = self.client.get(reverse("offers-list"), {"ordering": "popularity", "cursor": ""})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,78 @@
+from unittest import mock
+
+from django.apps import apps
+from django.db import connection
+from django.test import tag
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api import search
+from offers_app.api.signals import restore_offer_search_triggers
+from offers_app.models import Offer
+
+
+class TestOfferSearch(AuthenticatedAPITestCaseCustomer):
+    """
+    Tests for the FTS5 backed `?search=` parameter on the offer list.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.offer_logo = Offer.objects.create(
+            user=self.user_business,
+            title="Logo Design",
+            description="Modernes Logo inklusive Grafik-Dateien",
+        )
+        self.offer_web = Offer.objects.create(
+            user=self.user_business,
+            title="Webseite",
+            description="Landingpage mit Logo",
+        )
+
+    def _search_ids(self, **params):
+        response = self.client.get(reverse("offers-list"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [offer["id"] for offer in response.data["results"]]
+
+    @tag("happy")
+    def test_search_uses_fts_index(self):
+        self.assertTrue(search.fts_available(connection))
+        self.assertCountEqual(
+            self._search_ids(search="graf"),
+            [self.offer_1.id, self.offer_2.id, self.offer_logo.id],
+        )
+
+    @tag("happy")
+    def test_search_follows_offer_writes(self):
+        self.offer_web.title = "Onlineshop"
+        self.offer_web.save()
+        self.assertEqual(self._search_ids(search="online"), [self.offer_web.id])
+
+        self.offer_web.delete()
+        self.assertEqual(self._search_ids(search="online"), [])
+
+    @tag("happy")
+    def test_search_relevance_ordering(self):
+        ids = self._search_ids(search="logo", ordering="relevance")
+        self.assertEqual(ids, [self.offer_logo.id, self.offer_web.id])
+
+    @tag("happy")
+    def test_search_falls_back_without_fts(self):
+        with mock.patch.object(search, "fts_available", return_value=False):
+            ids = self._search_ids(search="Landingpage")
+        self.assertEqual(ids, [self.offer_web.id])
+
+    @tag("unhappy")
+    def test_dropped_triggers_are_restored_after_migrate(self):
+        # what SQLite does when a migration remakes offers_app_offer
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {search.FTS_TABLE}_au")
+        self.assertEqual(search.missing_fts_triggers(connection), [f"{search.FTS_TABLE}_au"])
+
+        restore_offer_search_triggers(sender=apps.get_app_config("offers_app"), using=connection.alias)
+        self.assertEqual(search.missing_fts_triggers(connection), [])
+        self.offer_web.title = "Onlineshop"
+        self.offer_web.save()
+        self.assertEqual(self._search_ids(search="online"), [self.offer_web.id])
+
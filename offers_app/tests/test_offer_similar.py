@@ -0,0 +1,124 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api import similarity
+from offers_app.api.similarity import SimilarityIndex, get_similarity_index
+from offers_app.models import Offer
+
+
+class TestSimilarOffers(AuthenticatedAPITestCaseCustomer):
+    """Tests for the similarity index and GET /offers/<id>/similar/."""
+
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, "similar.idx")
+        self.settings_override = override_settings(OFFER_SIMILARITY_INDEX=self.path)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.logo = self._offer("Logo design", "Vector logo design for startups")
+        self.logo_2 = self._offer("Minimal logo", "Minimal vector logo and brand colors")
+        self.website = self._offer("Website build", "Responsive website with a CMS")
+
+    def _offer(self, title, description):
+        return Offer.objects.create(user=self.user_business, title=title, description=description)
+
+    def _build(self, *args):
+        call_command("build_offer_similarity_index", *args, stdout=StringIO())
+
+    def _similar(self, offer):
+        return self.client.get(reverse("offers-similar", kwargs={"pk": offer.id}))
+
+    @tag("happy")
+    def test_returns_most_similar_first(self):
+        self._build()
+        response = self._similar(self.logo)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["id"], self.logo_2.id)
+        self.assertNotIn(self.logo.id, [o["id"] for o in response.data])
+        self.assertEqual(set(response.data[0]), {"id", "title", "image", "min_price", "min_delivery_time", "score"})
+
+    @tag("happy")
+    def test_single_hydration_query(self):
+        self._build()
+        with CaptureQueriesContext(connection) as ctx:
+            self._similar(self.logo)
+        offer_queries = [q for q in ctx.captured_queries if 'FROM "offers_app_offer"' in q["sql"]]
+        self.assertEqual(len(offer_queries), 1)
+
+    @tag("happy")
+    def test_incremental_update(self):
+        self._build()
+        new_logo = self._offer("Logo refresh", "Vector logo redesign")
+        removed_id = self.logo_2.id
+        self.logo_2.delete()
+        self._build()
+
+        index = SimilarityIndex(self.path)
+        self.assertIn(new_logo.id, index)
+        self.assertNotIn(removed_id, index)
+        neighbours = [n for n, _ in index.lookup(self.logo.id)]
+        self.assertIn(new_logo.id, neighbours)
+        self.assertNotIn(removed_id, neighbours)
+
+    @tag("happy")
+    def test_rebuilt_file_closes_the_previous_mapping(self):
+        self._build()
+        old = get_similarity_index()
+        self.assertIsNotNone(old.lookup(self.logo.id))
+
+        self._build("--full")
+        os.utime(self.path, ns=(0, os.stat(self.path).st_mtime_ns + 1))  # coarse mtime clocks
+        new = get_similarity_index()
+        self.assertIsNot(new, old)
+        self.assertTrue(old.closed)
+        self.assertIsNone(old.lookup(self.logo.id))
+        self.assertIsNotNone(new.lookup(self.logo.id))
+
+    @tag("happy")
+    def test_missing_index_returns_empty_list(self):
+        response = self._similar(self.logo)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+
+    @tag("unhappy")
+    def test_unknown_offer_is_not_found(self):
+        self._build()
+        response = self.client.get(reverse("offers-similar", kwargs={"pk": 999999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @tag("happy")
+    @skipUnless(similarity.np is not None, "numpy is not installed")
+    def test_blocked_build_matches_python_build(self):
+        self._offer("Logo animation", "Animated vector logo")
+        self._offer("Empty", "")
+        documents = {
+            pk: (title, description)
+            for pk, title, description in Offer.objects.values_list("id", "title", "description")
+        }
+        vectors = similarity.build_vectors(documents)
+
+        expected = similarity._nearest_neighbours_python(vectors, documents, k=2)
+        # one offer per block exercises the block boundaries
+        with mock.patch.object(similarity, "BLOCK_CELLS", 1):
+            blocked = similarity._nearest_neighbours_blocked(vectors, documents, k=2)
+        self.assertEqual(blocked.keys(), expected.keys())
+        for offer_id, neighbours in expected.items():
+            self.assertEqual([n for n, _ in blocked[offer_id]], [n for n, _ in neighbours])
+            for (_, score), (_, expected_score) in zip(blocked[offer_id], neighbours):
+                self.assertAlmostEqual(score, expected_score)
+
@@ -0,0 +1,58 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+
+
+class TestOfferSparseFields(AuthenticatedAPITestCaseCustomer):
+    """
+    Ensures `?fields=` / `?omit=` trim both the offer list payload
+    and the SQL behind it.
+    """
+
+    def _get(self, params):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("offers-list"), params)
+        return response, [q["sql"] for q in ctx.captured_queries]
+
+    @tag("happy")
+    def test_fields_limits_payload(self):
+        response, _ = self._get({"fields": "id,title,image,min_price"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for offer in response.data["results"]:
+            self.assertEqual(set(offer), {"id", "title", "image", "min_price"})
+
+    @tag("happy")
+    def test_fields_limits_sql(self):
+        _, queries = self._get({"fields": "id,title,min_price"})
+        offer_sql = next(q for q in queries if 'FROM "offers_app_offer"' in q and '"offers_app_offer"."title"' in q)
+
+        self.assertNotIn('"offers_app_offer"."description"', offer_sql)
+        self.assertNotIn('"auth_user"', offer_sql)
+        self.assertFalse(any('FROM "offers_app_offerdetail"' in q for q in queries))
+
+    @tag("happy")
+    def test_omit_keeps_remaining_relations(self):
+        response, queries = self._get({"omit": "description,details"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        offer = response.data["results"][0]
+        self.assertNotIn("description", offer)
+        self.assertNotIn("details", offer)
+        self.assertIn("username", offer["user_details"])
+        self.assertFalse(any('FROM "offers_app_offerdetail"' in q for q in queries))
+
+    @tag("happy")
+    def test_cursor_pagination_with_sparse_fields(self):
+        response, _ = self._get({"fields": "id", "cursor": "", "page_size": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data["next"])
+
+    @tag("unhappy")
+    def test_unknown_field_is_rejected(self):
+        response, _ = self._get({"fields": "id,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
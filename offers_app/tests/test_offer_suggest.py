@@ -0,0 +1,104 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import override_settings, tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api.cache import bump_catalog_version
+from offers_app.api.suggest import offer_suggest_index
+from offers_app.models import Offer, OfferPopularity
+
+
+@override_settings(OFFER_SUGGEST_BACKGROUND_RELOAD=False)
+class TestOfferSuggest(AuthenticatedAPITestCaseCustomer):
+    """Tests for the title autocomplete endpoint GET /offers/suggest/."""
+
+    def setUp(self):
+        super().setUp()
+        offer_suggest_index.reset()
+        self.addCleanup(offer_suggest_index.reset)
+
+        self.logo = self._offer(self.user_business, "Logo design")
+        self.popular_logo = self._offer(self.user_business, "Minimal logo package")
+        self.website = self._offer(self.user_business, "Website build")
+        OfferPopularity.objects.create(offer=self.popular_logo, views=2, detail_opens=1, score=3)
+
+    def _offer(self, user, title):
+        return Offer.objects.create(user=user, title=title, description="-")
+
+    def _suggest(self, q, **params):
+        response = self.client.get(reverse("offers-suggest"), {"q": q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["title"] for item in response.data]
+
+    @tag("happy")
+    def test_prefix_match_ranked_by_popularity(self):
+        # same seller, ranked by the offer's own score
+        self.assertEqual(self._suggest("lo"), ["Minimal logo package", "Logo design"])
+        self.assertEqual(self._suggest("lo", limit=1), ["Minimal logo package"])
+        self.assertEqual(self._suggest("web"), ["Website build"])
+
+    @tag("happy")
+    def test_multi_word_query_and_accents(self):
+        self._offer(self.user_business, "Café logo")
+        self.assertEqual(self._suggest("logo des"), ["Logo design"])
+        self.assertEqual(self._suggest("CAFE"), ["Café logo"])
+        self.assertEqual(self._suggest("café lo"), ["Café logo"])
+
+    @tag("happy")
+    def test_unchanged_catalog_runs_no_query(self):
+        self._suggest("lo")
+        with CaptureQueriesContext(connection) as queries:
+            self._suggest("min")
+        # only authentication remains, the offers table is not touched
+        self.assertFalse([q for q in queries.captured_queries if "offers_app_offer" in q["sql"]])
+
+    @tag("happy")
+    def test_index_follows_writes(self):
+        self._suggest("lo")
+
+        self.website.title = "Landing page"
+        self.website.save()
+        self._offer(self.user_business, "Logo animation")
+        bump_catalog_version()
+        self.assertEqual(self._suggest("web"), [])
+        self.assertEqual(self._suggest("lan"), ["Landing page"])
+        self.assertIn("Logo animation", self._suggest("logo"))
+
+        self.logo.delete()
+        bump_catalog_version()
+        self.assertNotIn("Logo design", self._suggest("logo"))
+
+    @tag("happy")
+    def test_full_rebuild_leaves_the_request_path(self):
+        self._suggest("lo")
+        state = offer_suggest_index._state
+        before = state.suggest("lo")
+
+        self.logo.delete()
+        bump_catalog_version()
+        with (
+            override_settings(OFFER_SUGGEST_BACKGROUND_RELOAD=True),
+            mock.patch("offers_app.api.versioned.threading.Thread") as thread,
+        ):
+            # count mismatch: served from an incrementally updated state, rebuild scheduled
+            self.assertIn("Logo design", self._suggest("lo"))
+        thread.return_value.start.assert_called_once_with()
+
+        thread.call_args.kwargs["target"]()
+        self.assertEqual(self._suggest("lo"), ["Minimal logo package"])
+        # published states are never changed in place
+        self.assertEqual(state.suggest("lo"), before)
+
+    @tag("unhappy")
+    def test_missing_query_is_rejected(self):
+        response = self.client.get(reverse("offers-suggest"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @tag("unhappy")
+    def test_limit_out_of_range_is_rejected(self):
+        response = self.client.get(reverse("offers-suggest"), {"q": "lo", "limit": 50})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
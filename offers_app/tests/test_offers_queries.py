@@ -0,0 +1,116 @@
+from django.db import connection
+from django.test import tag
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from general_app.tests.base import AuthenticatedAPITestCaseCustomer
+from offers_app.api.cache import bump_catalog_version, offer_fragment_cache
+from offers_app.models import Offer, OfferDetail
+
+
+class TestOfferListQueryCount(AuthenticatedAPITestCaseCustomer):
+    """
+    Ensures the offer list/retrieve endpoints run in a constant number
+    of queries, independent of the number of offers on the page.
+    """
+
+    def _seed_offers(self, total):
+        """Tops the catalog up to `total` offers with three details each."""
+        missing = total - Offer.objects.count()
+        offers = Offer.objects.bulk_create(
+            [
+                Offer(user=self.user_business, title=f"Offer {i}", description="Seed")
+                for i in range(missing)
+            ]
+        )
+        OfferDetail.objects.bulk_create(
+            [
+                OfferDetail(
+                    offer=offer,
+                    title="Seed",
+                    revisions=1,
+                    delivery_time_in_days=days,
+                    price=price,
+                    offer_type=offer_type,
+                )
+                for offer in offers
+                for offer_type, price, days in (
+                    ("basic", 50, 7),
+                    ("standard", 100, 5),
+                    ("premium", 200, 3),
+                )
+            ]
+        )
+        Offer.objects.filter(pk__in=[o.pk for o in offers]).refresh_aggregates()
+        bump_catalog_version()
+
+    def _count_list_queries(self):
+        url = reverse("offers-list")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, {"page_size": 100})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response
+
+    @tag("happy")
+    def test_list_query_count_is_flat(self):
+        self._seed_offers(10)
+        small_count, small_response = self._count_list_queries()
+        self.assertEqual(len(small_response.data["results"]), 10)
+
+        self._seed_offers(100)
+        large_count, large_response = self._count_list_queries()
+        self.assertEqual(len(large_response.data["results"]), 100)
+
+        self.assertEqual(small_count, large_count)
+
+    @tag("happy")
+    def test_list_loads_owners_with_one_query(self):
+        self._seed_offers(20)
+        _, response = self._count_list_queries()
+
+        # cold fragments: every offer on the page is serialized
+        offer_fragment_cache.invalidate()
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse("offers-list"), {"page_size": 100, "ordering": "-updated_at"})
+        user_queries = [q["sql"] for q in ctx.captured_queries if 'FROM "auth_user"' in q["sql"]]
+        # token auth joins auth_user, the page owners come from one IN query
+        self.assertEqual(len([q for q in user_queries if " IN (" in q]), 1)
+        self.assertFalse(any('JOIN "auth_user"' in q and '"offers_app_offer"' in q for q in user_queries))
+
+        offer = next(o for o in response.data["results"] if o["id"] == self.offer_1.id)
+        self.assertEqual(offer["user_details"]["username"], self.user_business.username)
+
+    @tag("happy")
+    def test_list_uses_stored_aggregates(self):
+        response = self.client.get(reverse("offers-list"))
+        offer = next(o for o in response.data["results"] if o["id"] == self.offer_1.id)
+        self.assertEqual(offer["min_price"], 100)
+        self.assertEqual(offer["min_delivery_time"], 5)
+        self.assertEqual(len(offer["details"]), 3)
+
+        # the denormalized columns are read as stored, not recomputed from the details
+        Offer.objects.filter(pk=self.offer_1.id).update(min_price=77)
+        offer_fragment_cache.invalidate()
+        bump_catalog_version()
+        response = self.client.get(reverse("offers-list"))
+        offer = next(o for o in response.data["results"] if o["id"] == self.offer_1.id)
+        self.assertEqual(offer["min_price"], 77)
+
+    @tag("happy")
+    def test_retrieve_query_count(self):
+        url = reverse("offers-detail", kwargs={"pk": self.offer_1.id})
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["min_price"], 100)
+        # token auth + ETag validator + offer + details prefetch
+        self.assertLessEqual(len(ctx.captured_queries), 4)
+
+    @tag("happy")
+    def test_detail_urls_match_reverse(self):
+        response = self.client.get(reverse("offers-list"))
+        offer = next(o for o in response.data["results"] if o["id"] == self.offer_1.id)
+        for detail in offer["details"]:
+            expected = "http://testserver" + reverse("offerdetail-detail", kwargs={"pk": detail["id"]})
+            self.assertEqual(detail["url"], expected)
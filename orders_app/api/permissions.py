@@ -3,6 +3,7 @@ from rest_framework.permissions import BasePermission
 from rest_framework.exceptions import PermissionDenied
 
 from auth_app.models import UserProfile
+from core.loaders import get_profile
 
 
 class OrdersPermission(BasePermission):
@@ -21,18 +22,17 @@ class OrdersPermission(BasePermission):
         - Restricted to staff or superuser only.
     """
 
-    def _profile_type(self, user):
+    def _profile_type(self, request):
         """
-        Returns the UserProfile type of the given user.
+        Returns the UserProfile type of the requesting user
+        (via the request's batch loader, see core.loaders).
 
         Returns:
         - UserProfile.UserType value
         - None if no profile exists
         """
-        try:
-            return UserProfile.objects.get(user=user).type
-        except UserProfile.DoesNotExist:
-            return None
+        profile = get_profile(request, request.user)
+        return profile.type if profile else None
 
     def has_permission(self, request, view):
         """
@@ -46,7 +46,7 @@ class OrdersPermission(BasePermission):
         if not user or not user.is_authenticated:
             return False
 
-        profile_type = self._profile_type(user)
+        profile_type = self._profile_type(request)
 
         if view.action == "destroy":
             return user.is_staff or user.is_superuser
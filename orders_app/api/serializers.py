@@ -4,10 +4,11 @@ from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.exceptions import PermissionDenied
 from auth_app.models import UserProfile
+from core.fieldsets import SparseFieldsetMixin
 from offers_app.models import Offer, OfferDetail
 from orders_app.models import Orders
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Read serializer for Orders.
 
@@ -17,6 +18,7 @@ class OrderSerializer(serializers.ModelSerializer):
     - All fields are read-only because Orders represent a snapshot
       of OfferDetail data and must not be modified by the client
       (exception: status via OrderUpdateSerializer).
+    - Supports sparse fieldsets (`?fields=` / `?omit=`) on reads.
     """
 
     customer_user = serializers.PrimaryKeyRelatedField(read_only=True)
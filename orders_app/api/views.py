@@ -3,6 +3,7 @@ from rest_framework.viewsets import ModelViewSet
 from django.db.models import Q
 from auth_app.api.signals import User
 from auth_app.models import UserProfile
+from core.fieldsets import SparseFieldsetViewMixin
 from orders_app.api.permissions import OrdersPermission
 from orders_app.api.serializers import OrderCountSerializer, OrderCreateSerializer, OrderSerializer, OrderUpdateSerializer
 from orders_app.models import Orders
@@ -13,7 +14,7 @@ from rest_framework.views import APIView
 from rest_framework import generics
 from django.shortcuts import get_object_or_404
 
-class OrdersViewSet(ModelViewSet):
+class OrdersViewSet(SparseFieldsetViewMixin, ModelViewSet):
     """
     ViewSet for Orders (CRUD operations).
 
@@ -28,6 +29,7 @@ class OrdersViewSet(ModelViewSet):
     - create → OrderCreateSerializer (input: offer_detail_id)
     - update / partial_update → OrderUpdateSerializer (status only)
     - default → OrderSerializer (read / response representation)
+      with sparse fieldsets (`?fields=` / `?omit=`)
     """
 
     queryset = Orders.objects.all()
@@ -24,3 +24,9 @@ class Orders(models.Model):
     status = models.CharField(max_length=15, choices=StatusType)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["business_user", "status"], name="orders_business_status_idx"),
+            models.Index(fields=["customer_user", "created_at"], name="orders_customer_created_idx"),
+        ]
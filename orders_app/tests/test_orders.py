@@ -76,3 +76,11 @@ class TestOrdersCustomer(AuthenticatedAPITestCaseCustomer):
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
 
+
+    def test_customer_list_orders_with_sparse_fields(self):
+        url = reverse("orders-list")
+        response = self.client.get(url, {"fields": "id,status"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for order in response.data:
+            self.assertEqual(set(order), {"id", "status"})
@@ -11,6 +11,6 @@ class ProfilePermission(BasePermission):
 
         # PATCH/PUT/DELETE nur Besitzer
         if request.method == "PATCH":
-            return obj.user == request.user
+            return obj.user_id == request.user.id
         
     
@@ -1,8 +1,24 @@
 from rest_framework.serializers import ModelSerializer, CharField, PrimaryKeyRelatedField
 from auth_app.models import UserProfile
+from core.fieldsets import SparseFieldsetMixin
+from core.loaders import BatchLoadedRelationsMixin, BatchLoadingListSerializer
 
 
-class ProfileSerializer(ModelSerializer):
+class ProfileSerializer(SparseFieldsetMixin, BatchLoadedRelationsMixin, ModelSerializer):
+    """
+    Serializer for UserProfile including selected User fields.
+
+    Reads support sparse fieldsets (`?fields=` / `?omit=`).
+    The users behind a profile list are loaded with one query.
+    """
+
+    sparse_field_sources = {
+        "username": ("user",),
+        "first_name": ("user",),
+        "last_name": ("user",),
+    }
+    batch_loaded_relations = {"user": ("users", ("username", "first_name", "last_name"))}
+
     user = PrimaryKeyRelatedField(read_only=True)
     username = CharField(source="user.username", read_only=True)
     first_name = CharField(source="user.first_name", required=False, allow_blank=True)
@@ -23,7 +39,9 @@ class ProfileSerializer(ModelSerializer):
             "type",
             "email",
             "created_at",
-        ]    
+        ]
+        list_serializer_class = BatchLoadingListSerializer
+
     
     def update(self, instance, validated_data):
         """
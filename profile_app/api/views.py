@@ -1,14 +1,18 @@
+from functools import partial
+
 from rest_framework.generics import RetrieveUpdateAPIView, ListAPIView
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
 from auth_app.models import UserProfile
+from core.conditional import ConditionalGetMixin, make_etag
+from core.fieldsets import FIELDS_PARAM, OMIT_PARAM, SparseFieldsetViewMixin
 from profile_app.api.permissions import ProfilePermission
 from profile_app.api.serializers import ProfileSerializer
 
 
 
 
-class ProfileDetailView(RetrieveUpdateAPIView):
+class ProfileDetailView(SparseFieldsetViewMixin, ConditionalGetMixin, RetrieveUpdateAPIView):
     """
     Detail and update endpoint for a single UserProfile.
 
@@ -20,6 +24,8 @@ class ProfileDetailView(RetrieveUpdateAPIView):
     Access:
     - Lookup via pk (Primary Key)
     - Uses ProfileSerializer
+    - Conditional GET via a content-hash ETag
+    - Sparse fieldsets (`?fields=` / `?omit=`)
     """
 
     queryset = UserProfile.objects.all()
@@ -28,17 +34,56 @@ class ProfileDetailView(RetrieveUpdateAPIView):
     lookup_field = "pk"
 
     def get(self, request, *args, **kwargs):
-        print(request)
-        return self.retrieve(request, *args, **kwargs)
+        """
+        Returns the profile; answers 304 if the client's ETag still matches.
 
+        UserProfile has no updated_at, so the ETag is a hash over the
+        serialized columns, loaded with a single values() query.
+        """
+        content = self._profile_content(kwargs["pk"])
+        if content is None:
+            return self.retrieve(request, *args, **kwargs)
+
+        return self.conditional_get(
+            request,
+            partial(self.retrieve, request, *args, **kwargs),
+            etag=make_etag(
+                "profile",
+                content,
+                request.query_params.get(FIELDS_PARAM),
+                request.query_params.get(OMIT_PARAM),
+            ),
+        )
 
-class CustomerListView(ListAPIView):
+    def _profile_content(self, pk):
+        """Raw values behind ProfileSerializer, or None if not found."""
+        columns = [
+            "user",
+            "user__username",
+            "user__first_name",
+            "user__last_name",
+            "file",
+            "location",
+            "tel",
+            "description",
+            "working_hours",
+            "type",
+            "email",
+            "created_at",
+        ]
+        try:
+            return UserProfile.objects.filter(pk=pk).values(*columns).first()
+        except (TypeError, ValueError):
+            return None
+
+
+class CustomerListView(SparseFieldsetViewMixin, ListAPIView):
     """
     Lists all profiles of type CUSTOMER.
 
     Notes:
     - Pagination is disabled (pagination_class = None)
-    - Uses ProfileSerializer
+    - Uses ProfileSerializer (supports `?fields=` / `?omit=`)
     """
 
     pagination_class = None
@@ -53,13 +98,13 @@ class CustomerListView(ListAPIView):
         )
 
 
-class BusinessListView(ListAPIView):
+class BusinessListView(SparseFieldsetViewMixin, ListAPIView):
     """
     Lists all profiles of type BUSINESS.
 
     Notes:
     - Pagination is disabled (pagination_class = None)
-    - Uses ProfileSerializer
+    - Uses ProfileSerializer (supports `?fields=` / `?omit=`)
     """
 
     pagination_class = None
@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import tag
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
@@ -67,6 +69,21 @@ class TestSingleProfileHappy(AuthenticatedAPITestCaseCustomer):
         response = self.client.delete(self.url)
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
+    @tag('happy')
+    def test_get_single_profile_conditional(self):
+        """
+        A matching If-None-Match returns 304, a profile change a new ETag.
+        """
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.client.patch(self.url, {"location": "Hamburg"}, format="json")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
 
 
 class TestUserListByTypeHappy(AuthenticatedAPITestCaseCustomer):
@@ -96,3 +113,25 @@ class TestUserListByTypeHappy(AuthenticatedAPITestCaseCustomer):
         for profile in response.data:
             self.assertEqual(profile["type"], UserProfile.UserType.CUSTOMER)
 
+
+    def test_get_business_list_with_sparse_fields(self):
+        url = reverse("business-user-list")
+        response = self.client.get(url, {"fields": "user,username,type"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for profile in response.data:
+            self.assertEqual(set(profile), {"user", "username", "type"})
+
+    def test_business_list_query_count_is_flat(self):
+        url = reverse("business-user-list")
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        small_count = len(ctx.captured_queries)
+
+        for i in range(5):
+            self._create_user(f"Business{i}", UserProfile.UserType.BUSINESS)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(len(ctx.captured_queries), small_count)
+        self.assertTrue(all(profile["username"] for profile in response.data))
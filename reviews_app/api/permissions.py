@@ -3,6 +3,7 @@ from rest_framework.permissions import BasePermission
 from rest_framework.exceptions import PermissionDenied
 
 from auth_app.models import UserProfile
+from core.loaders import get_profile
 from reviews_app.models import Review
 
 
@@ -16,11 +17,9 @@ class ReviewPermission(BasePermission):
 
     message = "Keine Berechtigung für diese Aktion."
 
-    def _is_customer(self, user) -> bool:
-        try:
-            return UserProfile.objects.get(user=user).type == UserProfile.UserType.CUSTOMER
-        except UserProfile.DoesNotExist:
-            return False
+    def _is_customer(self, request) -> bool:
+        profile = get_profile(request, request.user)
+        return profile is not None and profile.type == UserProfile.UserType.CUSTOMER
 
     def has_permission(self, request, view):
         user = request.user
@@ -31,10 +30,10 @@ class ReviewPermission(BasePermission):
             return True
 
         if view.action == "create":
-            return self._is_customer(user)
+            return self._is_customer(request)
 
         if view.action in ["update", "partial_update", "destroy"]:
-            return self._is_customer(user)
+            return self._is_customer(request)
 
         return False
 
@@ -1,10 +1,11 @@
 
 from rest_framework.serializers import ModelSerializer, ValidationError, PrimaryKeyRelatedField
 
+from core.fieldsets import SparseFieldsetMixin
 from reviews_app.models import Review
 
 
-class ReviewListSerializer(ModelSerializer):
+class ReviewListSerializer(SparseFieldsetMixin, ModelSerializer):
     """
     Serializer for Reviews (suitable for list and create operations).
     
@@ -14,7 +15,9 @@ class ReviewListSerializer(ModelSerializer):
     
     Validation:
     - On creation (instance is None), the serializer checks whether the current user
-      has already reviewed the same business_user (one review per reviewer-business pair).    """
+      has already reviewed the same business_user (one review per reviewer-business pair).
+
+    Reads support sparse fieldsets (`?fields=` / `?omit=`).    """
 
     reviewer = PrimaryKeyRelatedField(read_only=True)
 
@@ -1,3 +1,4 @@
+from core.fieldsets import SparseFieldsetViewMixin
 from reviews_app.api.filter import ReviewFilter
 from reviews_app.api.permissions import ReviewPermission
 from reviews_app.api.serializers import ReviewListSerializer
@@ -7,7 +8,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.filters import OrderingFilter
 
-class ReviewViewSet(ModelViewSet):
+class ReviewViewSet(SparseFieldsetViewMixin, ModelViewSet):
     """
     ViewSet for Reviews (CRUD).
     
@@ -23,6 +24,7 @@ class ReviewViewSet(ModelViewSet):
         - updated_at
         - rating
       Default: newest first (-updated_at)
+    - Sparse fieldsets (`?fields=` / `?omit=`)
     
     Create behavior:
     - reviewer is set server-side from request.user
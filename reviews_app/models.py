@@ -46,6 +46,9 @@ class Review(models.Model):
                 name="unique_review_per_reviewer_business",
             )
         ]
+        indexes = [
+            models.Index(fields=["business_user", "-updated_at"], name="review_business_updated_idx"),
+        ]
 
     def __str__(self):
         return f"Review {self.id}: {self.reviewer_id} -> {self.business_user_id} ({self.rating})"
\ No newline at end of file
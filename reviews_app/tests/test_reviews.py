@@ -97,6 +97,17 @@ class TestReviewsCustomer(AuthenticatedAPITestCaseCustomer):
         self.assertEqual(response.data.get("rating"), 5)
         self.assertEqual(response.data.get("description"), "Noch besser als erwartet!")
 
+    @tag("happy")
+    def test_list_reviews_omit_fields(self):
+        url = reverse("reviews-list")
+        response = self.client.get(url, {"omit": "description,created_at"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        for review in response.data:
+            self.assertNotIn("description", review)
+            self.assertNotIn("created_at", review)
+            self.assertIn("rating", review)
+
 
 class TestReviewsBusiness(AuthenticatedAPITestCaseBusiness):
     """